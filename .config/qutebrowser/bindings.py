@@ -0,0 +1,47 @@
+# spec 3fe0601128939951c56f36f81c0e2b5e6d7e88b3
+# compiled from bindings.toml by compile_config.py, do not edit
+
+_bindings = c.bindings.commands
+for _mode, _commands in {
+    'normal': {
+        ',p': 'spawn --userscript password_fill',
+        ',g': 'spawn --userscript userscript_run AddToPocket.py',
+        ';G': 'hint --rapid links userscript userscript_run AddToPocket.py',
+        ',v': 'spawn umpv {url}',
+        'V': 'hint links spawn umpv {hint-url}',
+        ';V': 'hint --rapid links spawn umpv {hint-url}',
+        ',c': 'spawn google-chrome {url}',
+        ',b': 'set-cmd-text -s :spawn --userscript userscript_run SearchBookmarks.py',
+        ',f': 'set-cmd-text -s :spawn --userscript userscript_run SearchPages.py',
+        ',m': 'spawn --userscript SaveMarkdown.py --incremental',
+        ',P': 'spawn --userscript SaveMarkdown.py --pages',
+        ';M': 'hint --rapid links userscript userscript_run ArchivePages.py',
+        ',M': 'spawn --userscript userscript_run ArchivePages.py --tabs',
+        ',a': 'spawn --userscript SaveMarkdown.py --archive',
+        ',A': 'spawn --userscript SaveText.sh --archive',
+        ',s': 'spawn --userscript userscript_run qutebrowser_viewsource',
+        ',S': 'spawn --userscript userscript_run qutebrowser_viewsource --raw',
+        ',t': 'spawn --userscript SaveText.sh',
+        't': 'set-cmd-text -s :open -t ',
+        'J': 'tab-next',
+        'gt': 'tab-next',
+        '<ctrl-pgdown>': 'tab-next',
+        'K': 'tab-prev',
+        'gT': 'tab-prev',
+        '<ctrl-pgup>': 'tab-prev',
+        '<ctrl-shift-pgdown>': 'tab-move +',
+        '<ctrl-shift-pgup>': 'tab-move -',
+        '<alt-left>': 'back',
+        '<alt-right>': 'forward',
+        '<alt-home>': 'home',
+    },
+    'insert': {
+        '<ctrl-w>': 'set editor.command "[\'gvim\', \'-f\', \'{file}\', \'-c\', \'normal {line}G{column0}l\', \'-c\', \'set filetype=tiddlywiki\']" ;; later 30 open-editor ;; later 500 set editor.command "[\'gvim\', \'-f\', \'{file}\', \'-c\', \'normal {line}G{column0}l\']"',
+    },
+    'command': {
+        '<ctrl-tab>': 'completion-item-focus next-category',
+        '<ctrl-shift-tab>': 'completion-item-focus prev-category',
+    },
+}.items():
+    _bindings.setdefault(_mode, {}).update(_commands)
+del _bindings, _mode, _commands
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" compile the declarative binding spec into qutebrowser config
+
+Key bindings and settings are declared in bindings.toml, next to
+config.py, rather than as a series of 'config.bind' and
+'config.unbind' calls. This compiler checks the spec and turns it
+into a minimal config file: one update of 'c.bindings.commands',
+holding every binding of every mode, and one assignment per
+setting.
+
+config.py needs only:
+
+    import compile_config
+    try:
+        config.source(compile_config.compiled())
+    except (OSError, compile_config.SpecError):
+        config.source(compile_config.COMPILED_FILE)
+        raise
+
+'compiled' returns the path of the compiled file, which is cached
+in $XDG_CACHE_HOME/qutebrowser/config under the hash of the spec,
+so the spec is parsed and checked only when it has changed; on
+every other start the cost is reading and hashing the spec.
+Parsing needs 'tomllib' (python 3.11) or the 'tomli' module.
+
+Each time the spec compiles, the output is also written to
+bindings.py, next to it, under a first line holding the hash of the
+spec. bindings.py is committed with the spec, so on a first start
+'compiled' returns it unparsed while the spec is unchanged, and
+config.py sources it when the spec fails to compile (no toml parser,
+or an error in an edit), keeping the last bindings that compiled.
+
+Run as a script, the compiler checks the spec, and writes the
+compiled config to a file or standard output:
+
+    compile_config.py [--spec FILE] [--check] [--output FILE]
+
+and converts a legacy keys.conf binding list into a spec:
+
+    compile_config.py --migrate keys.conf [--output bindings.toml]
+
+With keys.conf, qutebrowser ran a chain that starts a longer one
+only if no further key came within its ambiguous key timeout; it
+now runs it at once, hiding the longer chains. The migrated spec
+keeps the longer chains, and has the shorter one commented out,
+with a warning for each.
+
+Checks made:
+
+* every mode name is a qutebrowser mode
+* a key chain is bound in a mode only once, after normalising
+  its special keys, so '<Ctrl-PgUp>' and '<control+pgup>' are the
+  same key
+* no bound chain is the start of another bound chain in the same
+  mode, since qutebrowser runs the shorter one as soon as it is
+  typed (qutebrowser's own default bindings are not checked)
+* a key chain is not both bound and unbound in the same mode
+* setting names are quoted dotted option names
+"""
+
+# import statements    {{{1
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+
+# constants    {{{1
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+SPEC_FILE = os.path.join(CONFIG_DIR, 'bindings.toml')
+COMPILED_FILE = os.path.join(CONFIG_DIR, 'bindings.py')
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser', 'config')
+# changes whenever the compiled output changes form
+COMPILER_VERSION = '1'
+MODES = ('normal', 'insert', 'hint', 'passthrough', 'command', 'prompt',
+         'yesno', 'caret', 'register')
+_MODIFIERS = {'ctrl': 'ctrl', 'control': 'ctrl', 'alt': 'alt',
+              'mod1': 'alt', 'meta': 'meta', 'mod4': 'meta',
+              'windows': 'meta', 'shift': 'shift'}
+_MODIFIER_ORDER = ('ctrl', 'alt', 'meta', 'shift')
+_KEY_RE = re.compile(r'<[^<>]+>|.')
+
+
+class SpecError(ValueError):    # {{{1
+
+    """ binding spec cannot be compiled, with one problem per line """
+
+
+def normalise_key(key):    # {{{1
+
+    """ canonical form of a single key, e.g., '<Control+PgUp>'
+
+    special keys are lowercased, since shift must be given as a
+    modifier, with modifier aliases resolved and modifiers in a fixed
+    order: '<ctrl-pgup>'; simple keys are case sensitive and returned
+    as they are
+    """
+
+    if len(key) < 3 or not (key.startswith('<') and key.endswith('>')):
+        return key
+    parts = re.split(r'[-+](?=.)', key[1:-1])
+    modifiers = set()
+    for part in parts[:-1]:
+        if part.lower() not in _MODIFIERS:
+            raise SpecError('Unknown modifier {0!r} in {1}'.format(part, key))
+        modifiers.add(_MODIFIERS[part.lower()])
+    return '<' + '-'.join([mod for mod in _MODIFIER_ORDER if mod in modifiers]
+                          + [parts[-1].lower()]) + '>'
+
+
+def split_chain(chain):    # {{{1
+
+    """ tuple of the normalised keys of a key chain """
+
+    keys = tuple(normalise_key(key) for key in _KEY_RE.findall(chain.strip()))
+    if not keys:
+        raise SpecError('Empty key chain')
+    return keys
+
+
+def _modes(name):    # {{{1
+
+    """ modes of a table name, e.g., 'command,prompt' or '!normal' """
+
+    excluded = name.startswith('!')
+    modes = [mode.strip() for mode in name.lstrip('!').split(',')]
+    for mode in modes:
+        if mode not in MODES:
+            raise SpecError('Unknown mode {0!r}'.format(mode))
+    if excluded:
+        return [mode for mode in MODES if mode not in modes]
+    return modes
+
+
+def _command(value, where):    # {{{1
+
+    """ command string of a binding value """
+
+    if isinstance(value, list) and value and all(
+            isinstance(part, str) for part in value):
+        return ' ;; '.join(part.strip() for part in value)
+    if isinstance(value, str) and value.strip():
+        return value
+    raise SpecError('{0}: command must be a string or list of strings'
+                    .format(where))
+
+
+def build(spec):    # {{{1
+
+    """ (commands by mode, settings) of a parsed spec
+
+    raises SpecError listing every conflict or malformed entry
+    """
+
+    errors = []
+    unknown = set(spec) - {'bindings', 'unbind', 'settings'}
+    if unknown:
+        errors.append('Unknown tables: ' + ', '.join(sorted(unknown)))
+    commands = {}
+    for table, bindings in spec.get('bindings', {}).items():
+        try:
+            if not isinstance(bindings, dict):
+                raise SpecError('bindings.{0} must be a table'.format(table))
+            modes = _modes(table)
+        except SpecError as error:
+            errors.append(str(error))
+            continue
+        for mode in modes:
+            bound = commands.setdefault(mode, {})
+            for chain, value in bindings.items():
+                try:
+                    keys = split_chain(chain)
+                    command = _command(value, '{0} {1}'.format(mode, chain))
+                except SpecError as error:
+                    errors.append(str(error))
+                    continue
+                if bound.get(keys, command) != command:
+                    errors.append('{0} {1} is bound to both {2!r} and {3!r}'
+                                  .format(mode, chain, bound[keys], command))
+                bound[keys] = command
+    for table, chains in spec.get('unbind', {}).items():
+        try:
+            if not isinstance(chains, list):
+                raise SpecError('unbind.{0} must be a list'.format(table))
+            modes = _modes(table)
+        except SpecError as error:
+            errors.append(str(error))
+            continue
+        for mode in modes:
+            bound = commands.setdefault(mode, {})
+            for chain in chains:
+                try:
+                    keys = split_chain(chain)
+                except SpecError as error:
+                    errors.append(str(error))
+                    continue
+                if bound.get(keys) is not None:
+                    errors.append('{0} {1} is both bound and unbound'
+                                  .format(mode, chain))
+                bound[keys] = None
+    for mode, bound in commands.items():
+        hidden = _hidden(''.join(keys) for keys, command in bound.items()
+                         if command)
+        for shorter, longer in hidden.items():
+            errors.extend('{0} {1} hides {2}'.format(mode, shorter, chain)
+                          for chain in longer)
+    settings = spec.get('settings', {})
+    for name in settings:
+        if '.' not in name:
+            errors.append('Setting {0!r} is not an option name; quote '
+                          'dotted names, e.g., "editor.command"'
+                          .format(name))
+    if errors:
+        raise SpecError('\n'.join(errors))
+    return ({mode: {''.join(keys): command
+                    for keys, command in bound.items()}
+             for mode, bound in commands.items() if bound}, settings)
+
+
+def generate(commands, settings, source=''):    # {{{1
+
+    """ text of the compiled config file """
+
+    lines = ['# compiled from {0} by compile_config.py, do not edit'
+             .format(source or 'binding spec'), '']
+    if commands:
+        lines.append('_bindings = c.bindings.commands')
+        lines.append('for _mode, _commands in {')
+        for mode in MODES:
+            if mode not in commands:
+                continue
+            lines.append('    {0!r}: {{'.format(mode))
+            for chain, command in commands[mode].items():
+                lines.append('        {0!r}: {1!r},'.format(chain, command))
+            lines.append('    },')
+        lines.append('}.items():')
+        lines.append('    _bindings.setdefault(_mode, {}).update(_commands)')
+        lines.append('del _bindings, _mode, _commands')
+    for name, value in settings.items():
+        lines.append('c.{0} = {1!r}'.format(name, value))
+    return '\n'.join(lines) + '\n'
+
+
+def _tomllib():    # {{{1
+
+    """ toml parser module, imported only when the spec must be parsed
+
+    importing it takes longer than loading a compiled config
+    """
+
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+    return tomllib
+
+
+def compile_spec(data, source=''):    # {{{1
+
+    """ compiled config text of spec file contents (bytes) """
+
+    tomllib = _tomllib()
+    if tomllib is None:
+        raise SpecError('Compiling {0} needs python 3.11 or module tomli'
+                        .format(source or 'the binding spec'))
+    try:
+        spec = tomllib.loads(data.decode('utf-8'))
+    except (tomllib.TOMLDecodeError, UnicodeDecodeError) as error:
+        raise SpecError('{0}: {1}'.format(source, error)) from None
+    return generate(*build(spec), source=source)
+
+
+def compiled(spec_file=SPEC_FILE, cache_dir=CACHE_DIR,
+             compiled_file=COMPILED_FILE):    # {{{1
+
+    """ path of the compiled config, compiling the spec if it changed
+
+    raises SpecError if the spec cannot be compiled, when
+    compiled_file still holds the last config that compiled
+    """
+
+    with open(spec_file, 'rb') as spec:
+        data = spec.read()
+    digest = hashlib.sha1(COMPILER_VERSION.encode() + b'\0' + data)
+    path = os.path.join(cache_dir, digest.hexdigest()[:16] + '.py')
+    if os.path.isfile(path):
+        return path
+    stamp = '# spec {0}\n'.format(digest.hexdigest())
+    try:
+        with open(compiled_file) as last:
+            if last.readline() == stamp:
+                return compiled_file
+    except OSError:
+        pass
+    text = compile_spec(data, source=os.path.basename(spec_file))
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):    # earlier versions of the spec
+        if name.endswith('.py'):
+            os.remove(os.path.join(cache_dir, name))
+    _write(path, text)
+    try:
+        _write(compiled_file, stamp + text)
+    except OSError:    # read-only config: the cache serves until then
+        pass
+    return path
+
+
+def _write(path, text):    # {{{1
+
+    """ replace file path with text, never leaving it partly written """
+
+    partial = path + '.part'
+    with open(partial, 'w') as output:
+        output.write(text)
+    os.replace(partial, path)
+
+
+def migrate(keys_conf):    # {{{1
+
+    """ (spec text, warnings) for a legacy keys.conf
+
+    commands are carried over as written, so any renamed since
+    keys.conf was current need updating by hand; a chain that starts
+    longer chains of its table is commented out, with a warning
+    """
+
+    tables = {}
+    table = None
+    command = None
+    with open(keys_conf) as keys:
+        for line in keys:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            if line.startswith('['):
+                table = tables.setdefault(line.strip()[1:-1], {})
+                command = None
+            elif not line[0].isspace():
+                command = line.strip()
+            elif table is None or command is None:
+                raise SpecError('{0}: key chain outside a binding: {1}'
+                                .format(keys_conf, line.strip()))
+            else:
+                table[line.strip()] = command
+    lines = ['# Key bindings migrated from {0} by compile_config.py'
+             .format(os.path.basename(keys_conf))]
+    unbound = {}
+    warnings = []
+    for name, bindings in tables.items():
+        lines.extend(['', '[bindings.{0}]'.format(
+            name if re.match(r'^\w+$', name) else json.dumps(name))])
+        hidden = _hidden(chain for chain, command in bindings.items()
+                         if command != '<unbound>')
+        for chain, command in bindings.items():
+            binding = '{0} = {1}'.format(
+                json.dumps(chain, ensure_ascii=False),
+                json.dumps(command, ensure_ascii=False))
+            if command == '<unbound>':
+                unbound.setdefault(name, []).append(chain)
+            elif chain in hidden:
+                longer = ', '.join(hidden[chain])
+                lines.append('# ran after the ambiguous key timeout in {0}; '
+                             'would hide {1}'.format(
+                                 os.path.basename(keys_conf), longer))
+                lines.append('# ' + binding)
+                warnings.append('{0} {1} commented out, it would hide {2}'
+                                .format(name, chain, longer))
+            else:
+                lines.append(binding)
+    if unbound:
+        lines.extend(['', '[unbind]'])
+        for name, chains in unbound.items():
+            lines.append('{0} = {1}'.format(
+                json.dumps(name), json.dumps(chains, ensure_ascii=False)))
+    return '\n'.join(lines) + '\n', warnings
+
+
+def _hidden(chains):    # {{{1
+
+    """ {chain: longer chains it starts} among key chains """
+
+    keys = {}
+    for chain in chains:
+        try:
+            keys[split_chain(chain)] = chain
+        except SpecError:    # reported when the spec is compiled
+            pass
+    hidden = {}
+    # sorted, any chain that starts others comes just before them
+    ordered = sorted(keys)
+    for index, shorter in enumerate(ordered):
+        for longer in ordered[index + 1:]:
+            if longer[:len(shorter)] != shorter:
+                break
+            hidden.setdefault(keys[shorter], []).append(keys[longer])
+    return hidden
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Compile the qutebrowser binding spec into config')
+    parser.add_argument('--spec', default=SPEC_FILE,
+                        help='binding spec (default: %(default)s)')
+    parser.add_argument('--check', action='store_true',
+                        help='only check the spec for errors')
+    parser.add_argument('--migrate', metavar='KEYS_CONF',
+                        help='convert legacy keys.conf into a spec')
+    parser.add_argument('--output', help='file to write, instead of '
+                        'standard output')
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    problems = None
+    try:
+        if args.migrate:
+            text, warnings = migrate(args.migrate)
+            for warning in warnings:
+                sys.stderr.write('compile_config.py: warning: {0}\n'
+                                 .format(warning))
+            # the spec is written even if it needs fixing by hand
+            try:
+                compile_spec(text.encode('utf-8'), source=args.migrate)
+            except SpecError as error:
+                problems = error
+        else:
+            with open(args.spec, 'rb') as spec:
+                text = compile_spec(spec.read(),
+                                    source=os.path.basename(args.spec))
+    except (OSError, SpecError) as error:
+        sys.exit('compile_config.py: ' + str(error))
+    if not args.check:
+        if args.output:
+            with open(args.output, 'w') as output:
+                output.write(text)
+        else:
+            sys.stdout.write(text)
+    if problems:
+        sys.exit('compile_config.py: fix before use:\n' + str(problems))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" check SaveMarkdown.py's time and memory budget on hostile pages
+
+SaveMarkdown.py converts a page within a time and memory budget,
+and saves a page that exceeds it as plain text (see budget.py and
+html_text.py). This script checks that guarantee against a corpus
+of pages built to be slow or large to convert:
+
+    huge-text      a single text node of 50 MB
+    many-spans     100,000 sibling <span> elements
+    deep-nesting   100,000 nested <div> elements
+    deep-lists     5,000 nested lists
+    unclosed-tags  200,000 <b> tags never closed
+    bare-brackets  2,000,000 '<' characters that start no tag
+    long-tag       a tag name of 10 MB that never ends
+    entities       1,500,000 character references
+    wide-table     a table of 1,000 rows of 300 cells
+    normal         an ordinary article page
+
+Each page is converted by a fresh 'SaveMarkdown.py --input', and
+passes if the converter exits without error, the saved file holds
+the page's marker text, the wall time is within the time budget
+plus an allowance for start-up and for extracting the text (two
+seconds, plus half a second per MB of page), and the peak memory
+of the converter's processes is within the memory budget plus the
+same for the text extraction (64 MB, plus twenty times the page
+size, as python 2 may hold text as four bytes a character). The
+normal page must also be converted, not saved as plain text.
+Whether a hostile page is converted or saved as plain text depends
+on the machine, and is reported, not checked.
+
+Usage:
+
+    adversarial_bench.py [--time-budget SECONDS] [--memory-budget MB]
+                         [--scale FACTOR] [--command COMMAND] [CASE ...]
+
+'--scale' shrinks (or grows) every hostile page, e.g., 0.1 for a
+quick run. The converter command can be changed with '--command'
+(e.g., to use a particular python 2), or environmental variable
+'SAVE_MARKDOWN_COMMAND'. Exits with status 1 if any page fails.
+"""
+
+# import statements    {{{1
+import argparse
+import collections
+import os
+import resource
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+
+import startup_bench
+
+
+# constants    {{{1
+COMMAND = os.getenv('SAVE_MARKDOWN_COMMAND') or shlex.quote(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'userscripts', 'SaveMarkdown.py'))
+TIME_BUDGET = 10
+MEMORY_BUDGET = 1024
+MARKER = 'ADVERSARIALMARKER'
+Result = collections.namedtuple(
+    'Result', 'case size seconds peak outcome problems')
+
+
+def _page(body):    # {{{1
+
+    """ html page with body, and the marker text """
+
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+            '<title>Hostile page</title></head><body><p>{0}</p>{1}'
+            '</body></html>\n').format(MARKER, body)
+
+
+def corpus(scale=1.0):    # {{{1
+
+    """ {case: function returning the page's html} """
+
+    def count(number):
+        return max(1, int(number * scale))
+
+    return collections.OrderedDict((
+        ('huge-text', lambda: _page(
+            '<p>' + 'lorem ipsum dolor sit amet ' * count(2000000)
+            + '</p>')),
+        ('many-spans', lambda: _page(
+            '<p>' + '<span>word</span> ' * count(100000) + '</p>')),
+        ('deep-nesting', lambda: _page(
+            '<div>' * count(100000) + 'deep' + '</div>' * count(100000))),
+        ('deep-lists', lambda: _page(
+            '<ul><li>' * count(5000) + 'deep' + '</li></ul>' * count(5000))),
+        ('unclosed-tags', lambda: _page('<p>' + '<b>x ' * count(200000))),
+        ('bare-brackets', lambda: _page(
+            '<p>' + '< ' * count(2000000) + '</p>')),
+        ('long-tag', lambda: _page('<a' + 'a' * count(10000000))),
+        ('entities', lambda: _page(
+            '<p>' + '&amp;&#x41;&hellip;' * count(500000) + '</p>')),
+        ('wide-table', lambda: _page(
+            '<table>' + ('<tr>' + '<td>c</td>' * 300 + '</tr>')
+            * count(1000) + '</table>')),
+        ('normal', lambda: startup_bench.fixture_html().replace(
+            '<h1>Fixture page</h1>', '<h1>{0}</h1>'.format(MARKER))),
+    ))
+
+
+class AdversarialBench(object):    # {{{1
+
+    # class docstring    {{{2
+    """ convert each hostile page and check the budget was kept
+
+    usage:
+
+    bench = AdversarialBench(command, time_budget=10, memory_budget=1024)
+    results = bench.run(corpus())
+    """
+
+    def __init__(self, command=COMMAND, time_budget=TIME_BUDGET,
+                 memory_budget=MEMORY_BUDGET):    # {{{2
+
+        """ initialise variables """
+
+        self._command = shlex.split(command)
+        self._time_budget = time_budget
+        self._memory_budget = memory_budget
+
+    def _convert(self, case, html, directory):    # {{{2
+
+        """ convert one page in a child process, returning its Result
+
+        each page is converted by a child of this process, so that
+        its peak memory is not hidden by that of earlier pages
+        """
+
+        inpath = os.path.join(directory, case + '.html')
+        outpath = os.path.join(directory, case + '.md')
+        with open(inpath, 'w', encoding='utf-8') as page:
+            page.write(html)
+        size = os.path.getsize(inpath) / (1024 * 1024)
+        reader, writer = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(reader)
+            started = time.monotonic()
+            proc = subprocess.run(
+                self._command + [
+                    '--input', inpath, '--output', outpath,
+                    '--time-budget', str(self._time_budget),
+                    '--memory-budget', str(self._memory_budget)],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                universal_newlines=True)
+            seconds = time.monotonic() - started
+            peak = resource.getrusage(
+                resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+            lines = (proc.stdout.strip() or proc.stderr.strip()
+                     or 'no output').splitlines()
+            os.write(writer, '{0}\t{1}\t{2}\t{3}'.format(
+                proc.returncode, seconds, peak, lines[-1]).encode())
+            os._exit(0)    # pylint: disable=protected-access
+        os.close(writer)
+        with os.fdopen(reader) as reply:
+            status, seconds, peak, message = reply.read().split('\t', 3)
+        os.waitpid(pid, 0)
+        seconds, peak = float(seconds), float(peak)
+        problems = []
+        if status != '0':
+            problems.append('exit status ' + status)
+        try:
+            with open(outpath, encoding='utf-8', errors='replace') as saved:
+                if MARKER not in saved.read():
+                    problems.append('marker text missing')
+        except OSError:
+            problems.append('nothing saved')
+        if seconds > self._time_budget + 2 + size / 2:
+            problems.append('over time')
+        if peak > self._memory_budget + 64 + size * 20:
+            problems.append('over memory')
+        # 'Saved as PATH (plain text: REASON)' if saved as plain text
+        outcome = ('plain text' + message.partition('(plain text')[2][:-1]
+                   if '(plain text: ' in message else 'converted')
+        if case == 'normal' and outcome != 'converted':
+            problems.append('not converted')
+        for path in (inpath, outpath):
+            if os.path.exists(path):
+                os.remove(path)
+        return Result(case, size, seconds, peak,
+                      message if problems else outcome, problems)
+
+    def run(self, pages):    # {{{2
+
+        """ Result for each page of {case: function returning html} """
+
+        results = []
+        with tempfile.TemporaryDirectory(
+                prefix='qutebrowser_adversarial_') as directory:
+            for case, html in pages.items():
+                results.append(self._convert(case, html(), directory))
+                report([results[-1]], header=len(results) == 1)
+        return results
+
+
+def report(results, header=True):    # {{{1
+
+    """ print results, as a table """
+
+    if header:
+        print('{0:<14} {1:>8} {2:>8} {3:>9}  {4}'.format(
+            'page', 'size MB', 'time s', 'peak MB', 'outcome'))
+    for result in results:
+        print('{0:<14} {1:>8.1f} {2:>8.1f} {3:>9.0f}  {4}{5}'.format(
+            result.case, result.size, result.seconds, result.peak,
+            result.outcome, ''.join(' [FAIL: {0}]'.format(problem)
+                                    for problem in result.problems)),
+              flush=True)
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    cases = list(corpus())
+    parser = argparse.ArgumentParser(
+        description="Check SaveMarkdown.py's budget on hostile pages")
+    parser.add_argument('--time-budget', type=float, default=TIME_BUDGET,
+                        metavar='SECONDS',
+                        help='time budget (default: %(default)s)')
+    parser.add_argument('--memory-budget', type=int, default=MEMORY_BUDGET,
+                        metavar='MB',
+                        help='memory budget (default: %(default)s)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='size of hostile pages, relative to the '
+                        'default (default: %(default)s)')
+    parser.add_argument('--command', default=COMMAND,
+                        help='converter command (default: %(default)s)')
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help='pages to convert (default: all of {0})'.format(
+                            ', '.join(cases)))
+    args = parser.parse_args()
+    unknown = set(args.cases) - set(cases)
+    if unknown:
+        parser.error('unknown cases: ' + ', '.join(sorted(unknown)))
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    pages = corpus(args.scale)
+    if args.cases:
+        pages = collections.OrderedDict(
+            (case, pages[case]) for case in args.cases)
+    bench = AdversarialBench(args.command, time_budget=args.time_budget,
+                             memory_budget=args.memory_budget)
+    results = bench.run(pages)
+    failed = [result.case for result in results if result.problems]
+    if failed:
+        sys.exit('Failed: ' + ', '.join(failed))
+    print('All {0} pages within budget'.format(len(results)))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
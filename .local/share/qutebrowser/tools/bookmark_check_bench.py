@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" check CheckBookmarks.py against local fixture servers
+
+Serves bookmarked pages from fixture servers on several loopback
+addresses (127.0.0.1, 127.0.0.2, ...), which CheckBookmarks.py takes
+for different hosts, and checks a scratch bookmarks file with
+'CheckBookmarks.py', outside qutebrowser:
+
+    status    each kind of page is classified as it should be: ok
+              (also after a redirect, or when HEAD is refused), dead
+              (404, 410) or unknown (server error, timeout); a
+              bookmarklet is not probed
+    cache     a second check answers every url from the cache
+    fairness  many bookmarks on one host do not hold up the others:
+              the other hosts are probed at once, while the busy host
+              gets no more than '--per-host' requests at a time,
+              starting at least '--interval' seconds apart
+    prune     '--prune' removes the dead bookmarks, keeping a backup
+
+The loopback addresses other than 127.0.0.1 need a system that
+answers on all of 127.0.0.0/8, as Linux does. Exits with status 1
+if any check fails.
+
+Usage:
+
+    bookmark_check_bench.py [--command COMMAND] [CHECK ...]
+
+The checker command can be changed with '--command', or
+environmental variable 'CHECK_BOOKMARKS_COMMAND'.
+"""
+
+# import statements    {{{1
+import argparse
+import collections
+import http.server
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# constants    {{{1
+COMMAND = os.getenv('CHECK_BOOKMARKS_COMMAND') or shlex.quote(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'userscripts', 'CheckBookmarks.py'))
+HOSTS = ('127.0.0.1', '127.0.0.2', '127.0.0.3', '127.0.0.4', '127.0.0.5')
+DELAY = 0.2    # seconds each fixture page takes to answer
+TIMEOUT = 1    # checker's timeout, which the slow page exceeds
+PER_HOST = 2
+INTERVAL = 0.5
+# path: (expected status, expected code)
+PAGES = collections.OrderedDict((
+    ('/ok', ('ok', '200')),
+    ('/redirect', ('ok', '200')),
+    ('/no-head', ('ok', '200')),
+    ('/missing', ('dead', '404')),
+    ('/gone', ('dead', '410')),
+    ('/error', ('unknown', '500')),
+    ('/slow', ('unknown', '-')),
+))
+Request = collections.namedtuple('Request', 'host method path start end')
+
+
+class _PageHandler(http.server.BaseHTTPRequestHandler):    # {{{1
+
+    """ serve the fixture pages, recording every request """
+
+    requests = []
+    guard = threading.Lock()
+
+    def _answer(self, method):    # {{{2
+
+        """ answer a request, after the fixture delay """
+
+        start = time.monotonic()
+        path = self.path.split('?')[0]
+        time.sleep(TIMEOUT * 3 if path == '/slow' else DELAY)
+        if path == '/redirect':
+            self.send_response(301)
+            self.send_header('Location', '/ok')
+        elif path == '/no-head' and method == 'HEAD':
+            self.send_response(405)
+        elif path in ('/ok', '/no-head'):
+            self.send_response(200)
+        elif path == '/gone':
+            self.send_response(410)
+        elif path == '/error':
+            self.send_response(500)
+        else:
+            self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        with self.guard:
+            self.requests.append(Request(self.server.server_address[0],
+                                         method, path, start,
+                                         time.monotonic()))
+
+    def do_HEAD(self):    # {{{2
+
+        """ answer HEAD """
+
+        # pylint: disable=invalid-name
+        self._answer('HEAD')
+
+    def do_GET(self):    # {{{2
+
+        """ answer GET """
+
+        # pylint: disable=invalid-name
+        self._answer('GET')
+
+    def log_message(self, *args):    # {{{2
+
+        """ keep quiet """
+
+
+def _most_at_once(requests):    # {{{1
+    # largest number of requests being answered at the same time
+    events = sorted([(request.start, 1) for request in requests]
+                    + [(request.end, -1) for request in requests])
+    most = current = 0
+    for _, change in events:
+        current += change
+        most = max(most, current)
+    return most
+
+
+class BookmarkCheckBench(object):    # {{{1
+
+    # class docstring    {{{2
+    """ check scratch bookmarks files against the fixture servers
+
+    usage:
+
+    with BookmarkCheckBench(command) as bench:
+        problems = bench.run('status')
+    """
+
+    def __init__(self, command=COMMAND):    # {{{2
+
+        """ initialise variables """
+
+        self._command = shlex.split(command)
+        self._servers = []
+        self._port = None
+        self._tmp = None
+
+    def __enter__(self):    # {{{2
+
+        """ start a fixture server on each host, in a scratch directory """
+
+        self._tmp = tempfile.TemporaryDirectory(
+            prefix='qutebrowser_bookmark_check_')
+        for host in HOSTS:
+            server = http.server.ThreadingHTTPServer(
+                (host, self._port or 0), _PageHandler)
+            self._port = server.server_address[1]
+            threading.Thread(target=server.serve_forever,
+                             daemon=True).start()
+            self._servers.append(server)
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ stop servers and remove scratch directory """
+
+        for server in self._servers:
+            server.shutdown()
+        self._tmp.cleanup()
+
+    def _url(self, host, path):    # {{{2
+
+        """ url of path on the fixture server of host """
+
+        return 'http://{0}:{1}{2}'.format(host, self._port, path)
+
+    def _check(self, name, urls, *options):    # {{{2
+
+        """ (bookmarks file, report rows, requests) of checking urls
+
+        report rows are {url: (status, code)}
+        """
+
+        path = os.path.join(self._tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as bookmarks:
+            bookmarks.writelines('{0} Title {1}\n'.format(url, number)
+                                 for number, url in enumerate(urls))
+        report = path + '.report'
+        env = dict(os.environ)
+        env.pop('QUTE_FIFO', None)
+        started = time.monotonic()
+        subprocess.run(
+            self._command + [
+                '--bookmarks', path, '--cache', path + '.cache',
+                '--report', report, '--timeout', str(TIMEOUT),
+                '--per-host', str(PER_HOST), '--interval', str(INTERVAL)]
+            + list(options), stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, env=env, check=True)
+        rows = {}
+        with open(report, encoding='utf-8') as lines:
+            for line in lines:
+                fields = line.split('\t')
+                rows[fields[2]] = (fields[0], fields[1])
+        # the slow page of an earlier check may be answered during this one
+        with _PageHandler.guard:
+            requests = [request for request in _PageHandler.requests
+                        if request.start >= started]
+        return path, rows, requests
+
+    def _status(self):    # {{{2
+
+        """ problems classifying the fixture pages """
+
+        problems = []
+        urls = [self._url(HOSTS[0], path) for path in PAGES]
+        _, rows, requests = self._check('status', urls + [
+            'javascript:alert(1)'])
+        for path, expected in PAGES.items():
+            found = rows.get(self._url(HOSTS[0], path))
+            if found != expected:
+                problems.append('{0}: {1}, not {2}'.format(
+                    path, ' '.join(found or ('missing',)),
+                    ' '.join(expected)))
+        if 'javascript:alert(1)' in rows:
+            problems.append('bookmarklet probed')
+        if not any(request.path == '/no-head' and request.method == 'GET'
+                   for request in requests):
+            problems.append('no GET after HEAD was refused')
+        return problems
+
+    def _cache(self):    # {{{2
+
+        """ problems answering a second check from the cache """
+
+        urls = [self._url(HOSTS[0], path) for path in PAGES]
+        self._check('cache', urls)
+        _, rows, requests = self._check('cache', urls)
+        problems = []
+        if requests:
+            problems.append('{0} requests on the second check'.format(
+                len(requests)))
+        if len(rows) != len(urls):
+            problems.append('results missing from the report')
+        return problems
+
+    def _fairness(self):    # {{{2
+
+        """ problems with a busy host and several quiet ones """
+
+        busy = [self._url(HOSTS[0], '/ok?page={0}'.format(number))
+                for number in range(16)]
+        quiet = [self._url(host, '/ok') for host in HOSTS[1:]]
+        _, rows, requests = self._check('fairness', busy + quiet,
+                                        '--concurrency', '4')
+        problems = []
+        if len(rows) != len(busy + quiet):
+            problems.append('results missing from the report')
+        if not requests:
+            return problems + ['no requests']
+        first = min(request.start for request in requests)
+        late = [request for request in requests
+                if request.host != HOSTS[0]
+                and request.start - first > INTERVAL + 2 * DELAY]
+        if late:
+            problems.append('quiet hosts waited up to {0:.1f}s'.format(
+                max(request.start for request in late) - first))
+        busy_requests = sorted((request for request in requests
+                                if request.host == HOSTS[0]),
+                               key=lambda request: request.start)
+        if _most_at_once(busy_requests) > PER_HOST:
+            problems.append('{0} requests at once to one host'.format(
+                _most_at_once(busy_requests)))
+        gaps = [later.start - earlier.start for earlier, later
+                in zip(busy_requests, busy_requests[1:])]
+        if gaps and min(gaps) < INTERVAL - 0.05:
+            problems.append('requests to one host {0:.2f}s apart'.format(
+                min(gaps)))
+        return problems
+
+    def _prune(self):    # {{{2
+
+        """ problems pruning dead bookmarks from the file """
+
+        urls = [self._url(HOSTS[0], path) for path in PAGES]
+        path, _, _ = self._check('prune', urls, '--prune')
+        with open(path, encoding='utf-8') as bookmarks:
+            kept = [line.split(' ')[0] for line in bookmarks]
+        expected = [self._url(HOSTS[0], page)
+                    for page, (status, _) in PAGES.items()
+                    if status != 'dead']
+        problems = []
+        if kept != expected:
+            problems.append('kept ' + ' '.join(
+                url.rsplit('/', 1)[-1] for url in kept))
+        if not os.path.exists(path + '.bak'):
+            problems.append('no backup')
+        return problems
+
+    def run(self, check):    # {{{2
+
+        """ problems found by check """
+
+        return getattr(self, '_' + check)()
+
+
+CHECKS = ('status', 'cache', 'fairness', 'prune')
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Check CheckBookmarks.py against local fixture servers')
+    parser.add_argument('--command', default=COMMAND,
+                        help='checker command (default: %(default)s)')
+    parser.add_argument('checks', nargs='*', metavar='CHECK',
+                        help='checks to run (default: all of {0})'.format(
+                            ', '.join(CHECKS)))
+    args = parser.parse_args()
+    unknown = set(args.checks) - set(CHECKS)
+    if unknown:
+        parser.error('unknown checks: ' + ', '.join(sorted(unknown)))
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    failed = []
+    with BookmarkCheckBench(args.command) as bench:
+        for check in args.checks or CHECKS:
+            started = time.monotonic()
+            problems = bench.run(check)
+            print('{0:<9} {1:>6.1f}s  {2}'.format(
+                check, time.monotonic() - started,
+                'FAIL: ' + '; '.join(problems) if problems else 'ok'),
+                  flush=True)
+            if problems:
+                failed.append(check)
+    if failed:
+        sys.exit('Failed: ' + ', '.join(failed))
+    print('All checks passed')
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
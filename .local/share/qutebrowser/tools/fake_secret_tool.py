@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" stand-in for secret-tool, for checking password_fill_secret.py
+
+Answers 'secret-tool search' from a keyring kept in a json file, named
+by environmental variable 'FAKE_KEYRING': a list of items, each with a
+'label', a 'secret' and 'attributes', including 'xdg:schema'. As
+secret-tool does, each item matching every attribute given is printed
+with its path, label, secret and dates on stdout, and its schema and
+other attributes on stderr.
+
+Every call is appended, one per line, to the file named by
+'FAKE_KEYRING_LOG', if set. 'FAKE_KEYRING_MODE' changes the answers:
+
+    fail      exit with status 1, as when the secret service cannot
+              be reached
+    locked    find nothing, as when unlocking the keyring is cancelled
+
+Usage:
+
+    fake_secret_tool.py search [--all] [--unlock] ATTRIBUTE VALUE ...
+
+Point password_fill_secret.py at it with environmental variable
+'SECRET_TOOL'; see password_fill_secret_check.py.
+"""
+
+# import statements    {{{1
+import json
+import os
+import sys
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = sys.argv[1:]
+    log = os.getenv('FAKE_KEYRING_LOG')
+    if log:
+        with open(log, 'a') as calls:
+            calls.write(' '.join(args) + '\n')
+    mode = os.getenv('FAKE_KEYRING_MODE', '')
+    if mode == 'fail':
+        sys.exit('secret-tool: Cannot autolaunch D-Bus without X11 $DISPLAY')
+    if not args or args[0] != 'search':
+        sys.exit('usage: fake_secret_tool.py search [--all] [--unlock] '
+                 'ATTRIBUTE VALUE ...')
+    pairs = [arg for arg in args[1:] if arg not in ('--all', '--unlock')]
+    if not pairs or len(pairs) % 2:
+        sys.exit('secret-tool: must specify attribute and value pairs')
+    wanted = dict(zip(pairs[::2], pairs[1::2]))
+    if mode == 'locked':
+        return
+    with open(os.environ['FAKE_KEYRING']) as keyring:
+        items = json.load(keyring)
+    for number, item in enumerate(items, 1):
+        attributes = item['attributes']
+        if any(attributes.get(name) != value
+               for name, value in wanted.items()):
+            continue
+        print('[/org/freedesktop/secrets/collection/login/{0}]'.format(
+            number))
+        print('label = ' + item['label'])
+        print('secret = ' + item['secret'])
+        print('created = 2024-01-01 00:00:00')
+        print('modified = 2024-01-01 00:00:00', flush=True)
+        print('schema = ' + attributes['xdg:schema'], file=sys.stderr)
+        for name, value in attributes.items():
+            if name != 'xdg:schema':
+                print('attribute.{0} = {1}'.format(name, value),
+                      file=sys.stderr)
+        sys.stderr.flush()
+        if '--all' not in args:
+            break
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
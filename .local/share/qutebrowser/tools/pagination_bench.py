@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" check 'SaveMarkdown.py --pages' against a local fixture server
+
+Serves articles split across pages on 127.0.0.1, each page taking
+a moment to answer, as a real server does, and saves the first
+page of each with 'SaveMarkdown.py --pages', twice:
+
+    numbered   pages linked by number from every page (1 2 3 ...)
+    next       pages linked only by <link rel="next">, one by one
+    both       pages linked both ways
+
+Each article passes if the saved file holds every page, in order,
+and its footnotes are numbered 1, 2, 3, ... throughout with a note
+for each; and if the second save fetches no page again, as each
+page is answered '304 Not Modified' from the on-disk cache (the
+fixture sends 'Cache-Control: no-cache' and an ETag, so every save
+asks). The time of each save is reported: with numbered links the
+pages are fetched several at a time, and with only next links one
+after another.
+
+Usage:
+
+    pagination_bench.py [--pages N] [--delay SECONDS]
+                        [--command COMMAND] [CASE ...]
+
+The converter command can be changed with '--command' (e.g., to
+use a particular python 2), or environmental variable
+'SAVE_MARKDOWN_COMMAND'. Exits with status 1 if any article fails.
+"""
+
+# import statements    {{{1
+import argparse
+import collections
+import http.server
+import os
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# constants    {{{1
+COMMAND = os.getenv('SAVE_MARKDOWN_COMMAND') or shlex.quote(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'userscripts', 'SaveMarkdown.py'))
+CASES = ('numbered', 'next', 'both')
+PAGES = 6
+DELAY = 0.3
+NOTES = 2    # footnotes on each page
+TIMEOUT = 120
+_PAGE_RE = re.compile(r'/(\w+)/article\?page=(\d+)$')
+_MARKER_RE = re.compile(r'PAGEMARKER(\d+)')
+_REFERENCE_RE = re.compile(r'\[\^(\d+)\](?!:)')
+_NOTE_RE = re.compile(r'^\[\^(\d+)\]:', re.M)
+Result = collections.namedtuple('Result', 'case run seconds fetched '
+                                'revalidated message problems')
+
+
+def article_page(case, number, count):    # {{{1
+
+    """ html of page number of count of an article linked as case """
+
+    link = '/{0}/article?page={1}'.format(case, '{0}')
+    head = ('<link rel="next" href="{0}">'.format(link.format(number + 1))
+            if case != 'numbered' and number < count else '')
+    pager = ''
+    if case != 'next':
+        pager = '<div class="pager">{0}</div>'.format(' '.join(
+            '<span>{0}</span>'.format(page) if page == number
+            else '<a href="{0}">{1}</a>'.format(link.format(page), page)
+            for page in range(1, count + 1)))
+    references = ''.join(
+        ' note<sup id="fnref:{0}"><a href="#fn:{0}">{0}</a></sup>'.format(
+            note) for note in range(1, NOTES + 1))
+    notes = ''.join(
+        '<li id="fn:{0}">Note {0} of page {1} '
+        '<a href="#fnref:{0}">&#8617;</a></li>'.format(note, number)
+        for note in range(1, NOTES + 1))
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8">'
+            '<title>Article, page {0}</title>{1}</head><body>'
+            '<h1>Article, page {0}</h1><p>PAGEMARKER{0} text with a{2}.</p>'
+            '<div class="footnote"><ol>{3}</ol></div>{4}'
+            '</body></html>\n').format(number, head, references, notes,
+                                       pager)
+
+
+class _ArticleHandler(http.server.BaseHTTPRequestHandler):    # {{{1
+
+    """ serve the pages of the articles, counting answers """
+
+    pages = PAGES
+    delay = DELAY
+    counts = collections.Counter()
+    guard = threading.Lock()
+
+    def do_GET(self):    # {{{2
+
+        """ send page, or 'not modified' if the client has it """
+
+        # pylint: disable=invalid-name
+        time.sleep(self.delay)
+        match = _PAGE_RE.search(self.path)
+        if not match or match.group(1) not in CASES \
+                or not 1 <= int(match.group(2)) <= self.pages:
+            self.send_error(404)
+            return
+        case, number = match.group(1), int(match.group(2))
+        etag = '"{0}-{1}-{2}"'.format(case, number, self.pages)
+        if self.headers.get('If-None-Match') == etag:
+            with self.guard:
+                self.counts[case, 304] += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        page = article_page(case, number, self.pages).encode('utf-8')
+        with self.guard:
+            self.counts[case, 200] += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):    # {{{2
+
+        """ keep quiet """
+
+
+def check(markdown, count):    # {{{1
+
+    """ problems with the saved markdown of an article of count pages """
+
+    problems = []
+    markers = [int(number) for number in _MARKER_RE.findall(markdown)]
+    if markers != list(range(1, count + 1)):
+        problems.append('pages {0}'.format(
+            ' '.join(str(marker) for marker in markers) or 'missing'))
+    expected = list(range(1, count * NOTES + 1))
+    references = [int(number) for number in _REFERENCE_RE.findall(markdown)]
+    notes = [int(number) for number in _NOTE_RE.findall(markdown)]
+    if references != expected or notes != expected:
+        problems.append('footnotes not numbered throughout')
+    return problems
+
+
+class PaginationBench(object):    # {{{1
+
+    # class docstring    {{{2
+    """ save paginated fixture articles, checking the results
+
+    usage:
+
+    with PaginationBench(command, pages=6, delay=0.3) as bench:
+        results = bench.run(['numbered', 'next'])
+    """
+
+    def __init__(self, command=COMMAND, pages=PAGES,
+                 delay=DELAY):    # {{{2
+
+        """ initialise variables """
+
+        self._command = shlex.split(command)
+        self._pages = pages
+        _ArticleHandler.pages = pages
+        _ArticleHandler.delay = delay
+        self._server = None
+        self._tmp = None
+
+    def __enter__(self):    # {{{2
+
+        """ start fixture server, in a scratch directory """
+
+        self._tmp = tempfile.TemporaryDirectory(
+            prefix='qutebrowser_pagination_')
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                       _ArticleHandler)
+        threading.Thread(target=self._server.serve_forever,
+                         daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ stop server and remove scratch directory """
+
+        self._server.shutdown()
+        self._tmp.cleanup()
+
+    def _save(self, case, run):    # {{{2
+
+        """ save the first page of case's article, returning its Result """
+
+        directory = self._tmp.name
+        url = 'http://127.0.0.1:{0}/{1}/article?page=1'.format(
+            self._server.server_address[1], case)
+        inpath = os.path.join(directory, case + '.html')
+        outpath = os.path.join(directory, case + '.md')
+        with open(inpath, 'w', encoding='utf-8') as page:
+            page.write(article_page(case, 1, self._pages))
+        before = _ArticleHandler.counts.copy()
+        started = time.monotonic()
+        try:
+            proc = subprocess.run(
+                self._command + ['--pages', '--input', inpath,
+                                 '--output', outpath],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                universal_newlines=True, timeout=TIMEOUT,
+                env=dict(os.environ, QUTE_URL=url,
+                         XDG_CACHE_HOME=os.path.join(directory, 'cache')))
+            status = proc.returncode
+            message = (proc.stdout.strip() or proc.stderr.strip()
+                       or 'no output').splitlines()[-1]
+        except subprocess.TimeoutExpired:
+            status, message = 'timeout', 'timed out'
+        seconds = time.monotonic() - started
+        counts = _ArticleHandler.counts - before
+        problems = [] if status == 0 else ['exit status {0}'.format(status)]
+        try:
+            with open(outpath, encoding='utf-8') as saved:
+                problems.extend(check(saved.read(), self._pages))
+        except OSError:
+            problems.append('nothing saved')
+        if run > 1 and counts[case, 200]:
+            problems.append('{0} pages fetched again'.format(
+                counts[case, 200]))
+        return Result(case, run, seconds, counts[case, 200],
+                      counts[case, 304], message, problems)
+
+    def run(self, cases):    # {{{2
+
+        """ Result of saving each case's article twice """
+
+        results = []
+        for case in cases:
+            for run in (1, 2):
+                results.append(self._save(case, run))
+                report([results[-1]], header=len(results) == 1)
+        return results
+
+
+def report(results, header=True):    # {{{1
+
+    """ print results, as a table """
+
+    if header:
+        print('{0:<9} {1:>4} {2:>7} {3:>8} {4:>12}  {5}'.format(
+            'article', 'save', 'time s', 'fetched', 'not modified',
+            'outcome'))
+    for result in results:
+        print('{0:<9} {1:>4} {2:>7.2f} {3:>8} {4:>12}  {5}{6}'.format(
+            result.case, result.run, result.seconds, result.fetched,
+            result.revalidated, result.message,
+            ''.join(' [FAIL: {0}]'.format(problem)
+                    for problem in result.problems)), flush=True)
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description="Check 'SaveMarkdown.py --pages' against a local "
+        'fixture server')
+    parser.add_argument('--pages', type=int, default=PAGES,
+                        help='pages in each article (default: %(default)s)')
+    parser.add_argument('--delay', type=float, default=DELAY,
+                        metavar='SECONDS',
+                        help="server's delay in answering (default: "
+                        '%(default)s)')
+    parser.add_argument('--command', default=COMMAND,
+                        help='converter command (default: %(default)s)')
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help='articles to save (default: all of {0})'.format(
+                            ', '.join(CASES)))
+    args = parser.parse_args()
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error('unknown cases: ' + ', '.join(sorted(unknown)))
+    if args.pages < 2:
+        parser.error('--pages must be at least 2')
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    with PaginationBench(args.command, pages=args.pages,
+                         delay=args.delay) as bench:
+        results = bench.run(args.cases or CASES)
+    failed = sorted({result.case for result in results if result.problems})
+    if failed:
+        sys.exit('Failed: ' + ', '.join(failed))
+    print('All {0} articles saved whole'.format(len(results) // 2))
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" check password_fill_secret.py against a stand-in secret service
+
+Runs 'password_fill_secret.py query' with 'SECRET_TOOL' pointing at
+fake_secret_tool.py, whose keyring holds items stored by secret-tool
+(schema org.freedesktop.Secret.Generic) and by another tool, and
+checks the lookups, the number of secret-tool calls they cost, and
+what is cached:
+
+    cached      items are enumerated once, then answered from the cache
+    fallback    subdomains are dropped until an item matches, from the
+                cached items alone
+    misses      a domain with no item is searched for once, then
+                answered from the cache until it expires
+    schemas     an item of another schema is found, and its schema is
+                enumerated once the cache expires
+    failure     a failing secret-tool is not cached
+    locked      a keyring left locked is not cached
+
+Usage:
+
+    password_fill_secret_check.py [CHECK ...]
+
+Exits with status 1 if any check fails.
+"""
+
+# import statements    {{{1
+import argparse
+import collections
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+# constants    {{{1
+HERE = os.path.dirname(os.path.abspath(__file__))
+HELPER = os.path.join(os.path.dirname(HERE), 'userscripts',
+                      'password_fill_secret.py')
+FAKE = os.path.join(HERE, 'fake_secret_tool.py')
+GENERIC = 'org.freedesktop.Secret.Generic'
+OTHER = 'org.gnome.keyring.NetworkPassword'
+KEYRING = [
+    {'label': 'GitHub', 'secret': 'one',
+     'attributes': {'xdg:schema': GENERIC, 'domain': 'github.com',
+                    'username': 'alice'}},
+    {'label': 'GitHub work', 'secret': 'two',
+     'attributes': {'xdg:schema': GENERIC, 'username': 'bob',
+                    'domain': 'github.com'}},
+    {'label': 'Example', 'secret': 'three',
+     'attributes': {'xdg:schema': GENERIC, 'domain': 'example.org',
+                    'username': 'carol'}},
+    {'label': 'Intranet', 'secret': 'four',
+     'attributes': {'xdg:schema': OTHER, 'domain': 'intranet.example',
+                    'username': 'dave', 'protocol': 'https'}},
+]
+
+
+class Keyring(object):    # {{{1
+
+    # class docstring    {{{2
+    """ stand-in keyring and cache in a scratch directory
+
+    usage:
+
+    with Keyring() as keyring:
+        lines = keyring.query('github.com')
+        calls = keyring.calls()
+    """
+
+    def __enter__(self):    # {{{2
+
+        """ write the keyring, in a scratch directory """
+
+        self._tmp = tempfile.TemporaryDirectory(
+            prefix='qutebrowser_secret_')
+        directory = self._tmp.name
+        self.path = os.path.join(directory, 'keyring.json')
+        self.log = os.path.join(directory, 'calls')
+        self.cache = os.path.join(directory, 'qutebrowser',
+                                  'password_fill_secret.json')
+        with open(self.path, 'w') as keyring:
+            json.dump(KEYRING, keyring)
+        open(self.log, 'w').close()
+        self.mode = ''
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ remove scratch directory """
+
+        self._tmp.cleanup()
+
+    def query(self, domain, fallback=False, ttl=60):    # {{{2
+
+        """ lines printed by the helper's query """
+
+        env = dict(os.environ, SECRET_TOOL=FAKE, FAKE_KEYRING=self.path,
+                   FAKE_KEYRING_LOG=self.log, FAKE_KEYRING_MODE=self.mode,
+                   XDG_RUNTIME_DIR=self._tmp.name)
+        proc = subprocess.run(
+            [sys.executable, HELPER, '--ttl', str(ttl), 'query']
+            + (['--fallback'] if fallback else []) + [domain],
+            stdout=subprocess.PIPE, universal_newlines=True, env=env,
+            check=True)
+        return proc.stdout.splitlines()
+
+    def calls(self):    # {{{2
+
+        """ secret-tool calls made so far, then forget them """
+
+        with open(self.log) as log:
+            calls = log.read().splitlines()
+        open(self.log, 'w').close()
+        return calls
+
+
+def _search(*attributes):    # {{{1
+    # secret-tool call searching for attributes
+    return ' '.join(('search', '--all', '--unlock') + attributes)
+
+
+def check_cached(keyring):    # {{{1
+
+    """ problems with enumerating once, then using the cache """
+
+    problems = []
+    if keyring.query('github.com') != ['github.com alice', 'github.com bob']:
+        problems.append('github.com not found')
+    if keyring.calls() != [_search('xdg:schema', GENERIC)]:
+        problems.append('not one enumeration')
+    if keyring.query('example.org') != ['example.org carol'] \
+            or keyring.calls():
+        problems.append('example.org not answered from the cache')
+    return problems
+
+
+def check_fallback(keyring):    # {{{1
+
+    """ problems with dropping subdomains """
+
+    problems = []
+    if keyring.query('gist.github.com', fallback=True) != [
+            'github.com', 'github.com alice', 'github.com bob']:
+        problems.append('gist.github.com did not fall back to github.com')
+    if keyring.calls() != [_search('xdg:schema', GENERIC)]:
+        problems.append('levels searched although github.com is cached')
+    if keyring.query('nowhere.test', fallback=True) != ['']:
+        problems.append('unknown domain matched')
+    return problems
+
+
+def check_misses(keyring):    # {{{1
+
+    """ problems with caching the levels that have no item """
+
+    problems = []
+    keyring.query('a.nowhere.test', fallback=True)
+    if keyring.calls() != [_search('xdg:schema', GENERIC),
+                           _search('domain', 'a.nowhere.test'),
+                           _search('domain', 'nowhere.test'),
+                           _search('domain', 'test')]:
+        problems.append('levels not searched once each')
+    if keyring.query('a.nowhere.test', fallback=True) != [''] \
+            or keyring.query('nowhere.test') or keyring.calls():
+        problems.append('empty levels not answered from the cache')
+    keyring.query('nowhere.test', ttl=0)
+    if keyring.calls() != [_search('xdg:schema', GENERIC),
+                           _search('domain', 'nowhere.test')]:
+        problems.append('empty level cached after expiry')
+    return problems
+
+
+def check_schemas(keyring):    # {{{1
+
+    """ problems with items of a schema other than secret-tool's """
+
+    problems = []
+    if keyring.query('intranet.example') != ['intranet.example dave']:
+        problems.append('item of another schema not found')
+    keyring.calls()
+    if keyring.query('intranet.example') != ['intranet.example dave'] \
+            or keyring.calls():
+        problems.append('item of another schema not cached')
+    keyring.query('github.com', ttl=0)
+    if sorted(keyring.calls()) != sorted([_search('xdg:schema', GENERIC),
+                                          _search('xdg:schema', OTHER)]):
+        problems.append('other schema not enumerated')
+    return problems
+
+
+def check_unavailable(keyring, mode):    # {{{1
+
+    """ problems after secret-tool failed, or found nothing, in mode """
+
+    problems = []
+    keyring.mode = mode
+    if keyring.query('github.com'):
+        problems.append('found items while ' + mode)
+    if os.path.exists(keyring.cache):
+        problems.append('cached while ' + mode)
+    keyring.mode = ''
+    if keyring.query('github.com') != ['github.com alice', 'github.com bob']:
+        problems.append('github.com not found afterwards')
+    return problems
+
+
+CHECKS = collections.OrderedDict((
+    ('cached', check_cached),
+    ('fallback', check_fallback),
+    ('misses', check_misses),
+    ('schemas', check_schemas),
+    ('failure', lambda keyring: check_unavailable(keyring, 'fail')),
+    ('locked', lambda keyring: check_unavailable(keyring, 'locked')),
+))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Check password_fill_secret.py against a stand-in '
+        'secret service')
+    parser.add_argument('checks', nargs='*', metavar='CHECK',
+                        help='checks to run (default: all of {0})'.format(
+                            ', '.join(CHECKS)))
+    args = parser.parse_args()
+    unknown = set(args.checks) - set(CHECKS)
+    if unknown:
+        parser.error('unknown checks: ' + ', '.join(sorted(unknown)))
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    failed = []
+    for name in args.checks or CHECKS:
+        with Keyring() as keyring:
+            problems = CHECKS[name](keyring)
+        print('{0:<10} {1}'.format(name, 'FAIL: ' + '; '.join(problems)
+                                   if problems else 'ok'), flush=True)
+        if problems:
+            failed.append(name)
+    if failed:
+        sys.exit('Failed: ' + ', '.join(failed))
+    print('All checks passed')
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
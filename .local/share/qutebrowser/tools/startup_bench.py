@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" measure the start-up cost of config.py and the userscripts
+
+Runs config.py, as qutebrowser would at start-up, against a stub
+of qutebrowser's config API ('config' and 'c'), and reports how
+long it takes and how many config calls it makes: once with an
+empty cache, as on the first start after bindings.toml changes,
+and then with the compiled bindings cached.
+
+Then runs each userscript end to end, as a fresh process, the way
+qutebrowser does, and reports the time until it sends its first
+command to qutebrowser (usually the status line message the user
+sees) and the time until it exits. The userscripts get:
+
+* a stub QUTE_FIFO, a real named pipe read by the harness
+* a fixture page in QUTE_HTML, also served over http on
+  127.0.0.1 as QUTE_URL, so nothing is fetched from the internet
+* scratch HOME, XDG and QUTE_*_DIR directories, with a copy of
+  the qutebrowser config directory, so real bookmarks, caches and
+  downloads are left alone
+* stand-ins for the interactive programs they start (terminal
+  emulator, zenity, rofi), which return at once
+
+Each python 3 script is also run once with '-X importtime', and
+the imports that take longest are listed, so that a slow new
+import shows up as a number rather than a feeling.
+
+Usage:
+
+    startup_bench.py [--repeat N] [--config-dir DIR] [--json FILE]
+                     [--baseline FILE] [SCRIPT ...]
+
+With '--json' the results are saved, and with '--baseline' they
+are compared with saved results, showing the change in each time.
+A script that fails is reported with the last line of its error
+output; missing dependencies (e.g., BeautifulSoup for
+SaveMarkdown.py, or w3m for SaveText.sh) show up that way.
+"""
+
+# import statements    {{{1
+import argparse
+import contextlib
+import http.server
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# constants    {{{1
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'userscripts')
+CONFIG_DIR = (os.getenv('QUTE_CONFIG_DIR')
+              or os.path.join(os.getenv('XDG_CONFIG_HOME')
+                              or os.path.join(os.path.expanduser('~'),
+                                              '.config'),
+                              'qutebrowser'))
+REPEAT = 5
+TIMEOUT = 60
+TOP_IMPORTS = 5
+# arguments for an end-to-end run of each userscript; '{url}' is the
+# fixture url, and '{tmp}' the scratch directory
+SCENARIOS = {
+    'AddToPocket.py': ['--force'],
+    'ArchivePages.py': ['{url}'],
+    'CheckBookmarks.py': ['--bookmarks', '{tmp}/bookmarks.txt',
+                          '--no-cache'],
+    'SaveMarkdown.py': ['--input', '{tmp}/fixture.html',
+                        '--output', '{tmp}/downloads/fixture.md'],
+    'SearchBookmarks.py': ['qutebrowser'],
+    'SearchPages.py': ['fixture'],
+    'qutebrowser_viewsource': [],
+    'SaveMarkdown.sh': [],
+    'SaveText.sh': [],
+}
+# interactive programs replaced for the benchmark
+STUBS = {
+    'x-terminal-emulator': 'exit 0',
+    'zenity': 'echo "$QUTE_DOWNLOAD_DIR/saved"',
+    'rofi': 'head -n 1',
+}
+
+
+def fixture_html():    # {{{1
+
+    """ a representative article page, about 60 KB """
+
+    section = ''.join([
+        '<h2>Section {0}</h2>\n',
+        '<p>Paragraph with <a href="/link/{0}">a link</a>, <em>emphasis'
+        '</em>, <code>code</code> and an entity &amp; more text. ' * 4,
+        '</p>\n<ul><li>First item</li><li>Second <b>item</b></li></ul>\n',
+        '<pre>def example():\n    return {0}\n</pre>\n',
+        '<table><tr><th>Name</th><th>Value</th></tr>',
+        '<tr><td>row</td><td>{0}</td></tr></table>\n',
+    ])
+    return ''.join([
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">',
+        '<title>Fixture page</title>',
+        '<style>body { font-family: sans-serif; }</style>',
+        '<script>var analytics = {"id": 1};</script></head><body>',
+        '<h1>Fixture page</h1>\n',
+        ''.join(section.format(index) for index in range(40)),
+        '</body></html>\n',
+    ])
+
+
+class StubContainer(object):    # {{{1
+
+    # class docstring    {{{2
+    """ stand-in for config.py's 'c': records the options set
+
+    usage:
+
+    c = StubContainer(calls)
+    c.tabs.position = 'left'
+    """
+
+    def __init__(self, calls, prefix=''):    # {{{2
+
+        """ initialise variables """
+
+        object.__setattr__(self, '_calls', calls)
+        object.__setattr__(self, '_prefix', prefix)
+        object.__setattr__(self, '_values', {})
+
+    def __getattr__(self, name):    # {{{2
+
+        """ value of a set option, or container of options below it """
+
+        values = object.__getattribute__(self, '_values')
+        if name not in values:
+            option = self._prefix + name
+            values[name] = ({} if option == 'bindings.commands'
+                            else StubContainer(self._calls, option + '.'))
+        return values[name]
+
+    def __setattr__(self, name, value):    # {{{2
+
+        """ record option being set """
+
+        self._calls.append('c.' + self._prefix + name)
+        self._values[name] = value
+
+
+class StubConfig(object):    # {{{1
+
+    # class docstring    {{{2
+    """ stand-in for config.py's 'config': records the calls made
+
+    usage:
+
+    config = StubConfig(config_dir)
+    config.run('config.py')
+    print(config.calls)
+    """
+
+    def __init__(self, config_dir):    # {{{2
+
+        """ initialise variables """
+
+        self.configdir = config_dir
+        self.datadir = os.getenv('QUTE_DATA_DIR', config_dir)
+        self.calls = []
+        self.c = StubContainer(self.calls)
+
+    def run(self, filename):    # {{{2
+
+        """ execute a config file with 'config' and 'c' defined """
+
+        path = os.path.join(self.configdir, filename)
+        with open(path) as config_file:
+            code = compile(config_file.read(), path, 'exec')
+        exec(code, {'config': self, 'c': self.c, '__file__': path})
+
+    def load_autoconfig(self, value=True):    # {{{2
+
+        """ read autoconfig.yml, if present, as qutebrowser would """
+
+        self.calls.append('load_autoconfig')
+        path = os.path.join(self.configdir, 'autoconfig.yml')
+        if value and os.path.isfile(path):
+            with open(path) as autoconfig:
+                data = autoconfig.read()
+            with contextlib.suppress(ImportError):
+                import yaml
+                yaml.safe_load(data)
+
+    def source(self, filename):    # {{{2
+
+        """ execute another config file """
+
+        self.calls.append('source')
+        self.run(filename)
+
+    def bind(self, key, command, mode='normal'):    # {{{2
+
+        """ record binding """
+
+        self.calls.append('bind')
+        self.c.bindings.commands.setdefault(mode, {})[key] = command
+
+    def unbind(self, key, mode='normal'):    # {{{2
+
+        """ record unbinding """
+
+        self.calls.append('unbind')
+        self.c.bindings.commands.setdefault(mode, {})[key] = None
+
+    def set(self, option, value, pattern=None):    # {{{2
+
+        """ record option being set """
+
+        # pylint: disable=unused-argument
+        self.calls.append('set')
+
+    def get(self, option, pattern=None):    # {{{2
+
+        """ options are not known to the stub """
+
+        # pylint: disable=unused-argument
+        self.calls.append('get')
+
+    @contextlib.contextmanager
+    def pattern(self, pattern):    # {{{2
+
+        """ container for options set for a url pattern """
+
+        # pylint: disable=unused-argument
+        self.calls.append('pattern')
+        yield StubContainer(self.calls)
+
+
+class StubFifo(object):    # {{{1
+
+    # class docstring    {{{2
+    """ named pipe standing in for qutebrowser's QUTE_FIFO
+
+    usage:
+
+    fifo = StubFifo(path)
+    mark = fifo.mark()
+    ... run userscript ...
+    for arrived, command in fifo.since(mark): ...
+    """
+
+    def __init__(self, path):    # {{{2
+
+        """ create the pipe and start reading it """
+
+        os.mkfifo(path)
+        self.path = path
+        self._commands = []
+        self._guard = threading.Lock()
+        # held open for writing too, so the pipe never reports
+        # end of file between userscripts, as in qutebrowser
+        self._handle = os.open(path, os.O_RDWR)
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):    # {{{2
+
+        """ record each command with its arrival time """
+
+        pending = b''
+        while True:
+            pending += os.read(self._handle, 65536)
+            arrived = time.perf_counter()
+            *lines, pending = pending.split(b'\n')
+            with self._guard:
+                self._commands.extend(
+                    (arrived, line.decode('utf-8', 'replace'))
+                    for line in lines if line.strip())
+
+    def mark(self):    # {{{2
+
+        """ position after the commands received so far """
+
+        with self._guard:
+            return len(self._commands)
+
+    def since(self, mark):    # {{{2
+
+        """ [(arrival time, command)] received after mark """
+
+        with self._guard:
+            return self._commands[mark:]
+
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):    # {{{1
+
+    """ serve the fixture page for any path """
+
+    page = b''
+
+    def do_GET(self):    # {{{2
+
+        """ send fixture page """
+
+        # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def do_HEAD(self):    # {{{2
+
+        """ send fixture page headers """
+
+        # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.end_headers()
+
+    def log_message(self, *args):    # {{{2
+
+        """ keep quiet """
+
+
+class StartupBench(object):    # {{{1
+
+    # class docstring    {{{2
+    """ time config.py and userscripts in a scratch environment
+
+    usage:
+
+    with StartupBench(repeat=5) as bench:
+        results = bench.run(['AddToPocket.py'])
+    """
+
+    def __init__(self, repeat=REPEAT, config_dir=CONFIG_DIR):    # {{{2
+
+        """ initialise variables """
+
+        self._repeat = repeat
+        self._config_dir = config_dir
+        self._tmp = None
+        self._server = None
+        self._fifo = None
+        self._env = None
+
+    def __enter__(self):    # {{{2
+
+        """ set up scratch directories, fixture server and pipe """
+
+        self._tmp = tempfile.mkdtemp(prefix='qutebrowser_bench_')
+        tmp = self._tmp
+        page = fixture_html().encode('utf-8')
+        with open(os.path.join(tmp, 'fixture.html'), 'wb') as fixture:
+            fixture.write(page)
+        _FixtureHandler.page = page
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                       _FixtureHandler)
+        threading.Thread(target=self._server.serve_forever,
+                         daemon=True).start()
+        url = 'http://127.0.0.1:{0}/fixture.html'.format(
+            self._server.server_address[1])
+        self._fifo = StubFifo(os.path.join(tmp, 'fifo'))
+        for name in ('home', 'cache', 'data', 'downloads', 'runtime', 'bin'):
+            os.makedirs(os.path.join(tmp, name))
+        # without the last compiled bindings, so the first start compiles
+        shutil.copytree(self._config_dir, os.path.join(tmp, 'config'),
+                        ignore=shutil.ignore_patterns('__pycache__',
+                                                      'bindings.py'))
+        with open(os.path.join(tmp, 'bookmarks.txt'), 'w') as bookmarks:
+            bookmarks.write(url + ' Fixture page\n')
+        with open(os.path.join(tmp, 'home', 'qute_mail.ini'), 'w') as ini:
+            ini.write('[queue]\npath = {0}\n'.format(
+                os.path.join(tmp, 'pocket_queue.txt')))
+        for name, body in STUBS.items():
+            path = os.path.join(tmp, 'bin', name)
+            with open(path, 'w') as stub:
+                stub.write('#!/bin/sh\n' + body + '\n')
+            os.chmod(path, 0o755)
+        self._env = dict(
+            os.environ, HOME=os.path.join(tmp, 'home'),
+            PATH=os.path.join(tmp, 'bin') + os.pathsep + os.getenv('PATH'),
+            XDG_CACHE_HOME=os.path.join(tmp, 'cache'),
+            XDG_CONFIG_HOME=tmp, XDG_DATA_HOME=os.path.join(tmp, 'data'),
+            XDG_RUNTIME_DIR=os.path.join(tmp, 'runtime'),
+            QUTE_CONFIG_DIR=os.path.join(tmp, 'config'),
+            QUTE_DATA_DIR=os.path.join(tmp, 'data'),
+            QUTE_DOWNLOAD_DIR=os.path.join(tmp, 'downloads'),
+            QUTE_FIFO=self._fifo.path,
+            QUTE_HTML=os.path.join(tmp, 'fixture.html'),
+            QUTE_URL=url, QUTE_TITLE='Fixture page', QUTE_MODE='command',
+            EDITOR='true')
+        self._env.pop('PYTHONPROFILEIMPORTTIME', None)
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ stop server and remove scratch directories """
+
+        self._server.shutdown()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _child(self, args, env):    # {{{2
+
+        """ (wall time, first command time, exit status, stderr,
+        commands sent) """
+
+        mark = self._fifo.mark()
+        start = time.perf_counter()
+        try:
+            process = subprocess.run(
+                args, env=env, cwd=self._tmp, stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                timeout=TIMEOUT)
+            status, stderr = process.returncode, process.stderr
+        except subprocess.TimeoutExpired:
+            status, stderr = 'timeout', b''
+        except OSError as error:
+            status, stderr = 'failed', str(error).encode()
+        elapsed = time.perf_counter() - start
+        time.sleep(0.01)    # let the reader catch up
+        commands = self._fifo.since(mark)
+        first = commands[0][0] - start if commands else None
+        return (elapsed, first, status, stderr.decode('utf-8', 'replace'),
+                [command for _, command in commands])
+
+    def config(self):    # {{{2
+
+        """ timings of config.py, with an empty and a warm cache """
+
+        command = [sys.executable, os.path.abspath(__file__),
+                   '--config-child', os.path.join(self._tmp, 'config')]
+        env = dict(self._env, XDG_CACHE_HOME=os.path.join(
+            self._tmp, 'cache', 'config-bench'))
+        runs = []
+        for _ in range(self._repeat + 1):
+            output = subprocess.run(command, env=env, check=True,
+                                    stdout=subprocess.PIPE).stdout
+            runs.append(json.loads(output))
+        imports = subprocess.run(
+            command, env=dict(env, PYTHONPROFILEIMPORTTIME='1'),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE).stderr
+        calls = {}
+        for call in runs[-1]['calls']:
+            calls[call] = calls.get(call, 0) + 1
+        return {'first': runs[0]['elapsed'],
+                'median': statistics.median(run['elapsed']
+                                            for run in runs[1:]),
+                'calls': calls, 'bindings': runs[-1]['bindings'],
+                'imports': top_imports(imports.decode('utf-8', 'replace'),
+                                       skip=_HARNESS_IMPORTS)}
+
+    def userscript(self, name):    # {{{2
+
+        """ timings of an end-to-end run of userscript name """
+
+        path = os.path.join(SCRIPT_DIR, name)
+        args = [path] + [arg.format(url=self._env['QUTE_URL'], tmp=self._tmp)
+                         for arg in SCENARIOS.get(name, [])]
+        runs = [self._child(args, self._env) for _ in range(self._repeat)]
+        result = {'exit': [run[0] for run in runs],
+                  'first': [run[1] for run in runs if run[1] is not None],
+                  'status': runs[-1][2],
+                  'error': (runs[-1][3].strip().splitlines() or [''])[-1],
+                  'imports': []}
+        # the shell scripts report failure to qutebrowser and exit 0
+        errors = [command for command in runs[-1][4]
+                  if command.startswith('message-error')]
+        if result['status'] == 0 and errors:
+            result['status'], result['error'] = 'message-error', errors[0]
+        with open(path, 'rb') as script:
+            python3 = b'python3' in script.readline()
+        if python3:
+            stderr = self._child(
+                args, dict(self._env, PYTHONPROFILEIMPORTTIME='1'))[3]
+            result['imports'] = top_imports(stderr)
+        return result
+
+    def run(self, names):    # {{{2
+
+        """ results for config.py and userscripts names """
+
+        return {'config.py': self.config(),
+                'userscripts': {name: self.userscript(name)
+                                for name in names}}
+
+
+def top_imports(stderr, count=TOP_IMPORTS, skip=()):    # {{{1
+
+    """ [(module, cumulative ms)] of slowest top-level imports
+
+    reads the output of python's '-X importtime', skipping the
+    imports made by the interpreter itself before site is done
+    """
+
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        # a top-level import is preceded by a single space, and
+        # nested imports by two more spaces per level
+        name = parts[2].rstrip()
+        if name.startswith('  '):
+            continue
+        name = name.strip()
+        if name in skip or name in sys.builtin_module_names:
+            continue
+        imports.append((name, int(parts[1]) / 1000))
+    imports = [entry for entry in imports
+               if entry[0] not in _STARTUP_IMPORTS]
+    imports.sort(key=lambda entry: -entry[1])
+    return imports[:count]
+
+
+# imported by every interpreter before the script runs
+_STARTUP_IMPORTS = {'encodings', 'codecs', 'site', 'abc', 'io', 'stat',
+                    'os', 'posixpath', 'genericpath', '_collections_abc',
+                    '_sitebuiltins', 'encodings.utf_8', 'encodings.aliases',
+                    '_distutils_hack', 'sitecustomize', 'usercustomize',
+                    '_frozen_importlib_external', 'zipimport'}
+# imported by the harness itself, not by config.py
+_HARNESS_IMPORTS = {'argparse', 'contextlib', 'http.server', 'json',
+                    'shutil', 'statistics', 'subprocess', 'tempfile',
+                    'threading', 'time'}
+
+
+def _ms(seconds):    # {{{1
+
+    """ seconds as a column of milliseconds """
+
+    return '{0:9.1f}'.format(seconds * 1000) if seconds is not None \
+        else '{0:>9}'.format('-')
+
+
+def _delta(value, previous):    # {{{1
+
+    """ change from a baseline value, if any """
+
+    if value is None or previous is None:
+        return ''
+    return ' {0:+.1f}'.format((value - previous) * 1000)
+
+
+def report(results, baseline=None):    # {{{1
+
+    """ print results, compared with baseline results if given """
+
+    baseline = baseline or {'config.py': {}, 'userscripts': {}}
+    config = results['config.py']
+    before = baseline.get('config.py', {})
+    print('config.py, against a stub config API (ms)')
+    print('  first start (bindings compiled): '
+          + _ms(config['first']).strip()
+          + _delta(config['first'], before.get('first')).replace(
+              ' ', ' change ', 1))
+    print('  later starts (median):          '
+          + _ms(config['median']).strip()
+          + _delta(config['median'], before.get('median')).replace(
+              ' ', ' change ', 1))
+    print('  config calls: ' + ', '.join(
+        '{0} {1}'.format(count, call)
+        for call, count in sorted(config['calls'].items()))
+        + '; {0} bindings'.format(config['bindings']))
+    if config['imports']:
+        print('  slowest imports: ' + ', '.join(
+            '{0} {1:.1f}'.format(*entry) for entry in config['imports']))
+    print()
+    print('userscripts, end to end (ms)')
+    print('  {0:24} {1:>9} {2:>9} {3:>9}  {4}'.format(
+        'script', 'first cmd', 'exit min', 'exit med', 'status'))
+    for name, result in results['userscripts'].items():
+        old = baseline.get('userscripts', {}).get(name, {})
+        first = statistics.median(result['first']) \
+            if result['first'] else None
+        old_first = statistics.median(old['first']) \
+            if old.get('first') else None
+        exit_median = statistics.median(result['exit'])
+        status = result['status']
+        print('  {0:24} {1} {2} {3}  {4}'.format(
+            name, _ms(first), _ms(min(result['exit'])), _ms(exit_median),
+            'ok' if status == 0 else status))
+        if old:
+            print('  {0:24} change: first cmd{1}, exit med{2}'.format(
+                '', _delta(first, old_first) or ' -', _delta(
+                    exit_median, statistics.median(old['exit'])) or ' -'))
+        if status != 0 and result['error']:
+            print('  {0:24} {1}'.format('', result['error'][:100]))
+        if result['imports']:
+            print('  {0:24} slowest imports: {1}'.format('', ', '.join(
+                '{0} {1:.1f}'.format(*entry) for entry in result['imports'])))
+
+
+def config_child(config_dir):    # {{{1
+
+    """ run config.py once against the stub, printing time and calls """
+
+    sys.path.insert(0, config_dir)    # as qutebrowser does
+    config = StubConfig(config_dir)
+    start = time.perf_counter()
+    config.run('config.py')
+    elapsed = time.perf_counter() - start
+    bindings = sum(len(commands) for commands
+                   in config.c.bindings.commands.values())
+    print(json.dumps({'elapsed': elapsed, 'calls': config.calls,
+                      'bindings': bindings}))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Measure start-up time of config.py and userscripts')
+    parser.add_argument('scripts', nargs='*', metavar='SCRIPT',
+                        help='userscripts to time (default: all known)')
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help='runs of each (default: %(default)s)')
+    parser.add_argument('--config-dir', default=CONFIG_DIR,
+                        help='qutebrowser config directory to copy '
+                        '(default: %(default)s)')
+    parser.add_argument('--json', help='save results to file')
+    parser.add_argument('--baseline', help='compare with saved results')
+    parser.add_argument('--config-child', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    if args.config_child:
+        config_child(args.config_child)
+        return
+    names = args.scripts or [name for name in SCENARIOS
+                             if os.path.isfile(os.path.join(SCRIPT_DIR,
+                                                            name))]
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    if not os.path.isdir(args.config_dir):
+        sys.exit('No qutebrowser config directory ' + args.config_dir)
+    with StartupBench(repeat=max(1, args.repeat),
+                      config_dir=args.config_dir) as bench:
+        results = bench.run(names)
+    report(results, baseline)
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(results, json_file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
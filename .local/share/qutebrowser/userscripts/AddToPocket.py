@@ -9,19 +9,59 @@ qutebrowser with a command like:
 
 This userscript takes the current page in qutebrowser and
 adds it to Pocket. The current page url is obtained from
-environmental variable 'QUTE_URL'. The script first attempts
-to send this url to Pocket by email (add@getpocket.com). In
-Windows Outlook is used. In other operating systems the
-generic python module 'smtplib' is used. If the attempt to
-send by email fails the script attempts to add the url to
-Pocket via the Pocket website
-(http://www.getpocket.com/edit).
+environmental variable 'QUTE_URL'. The url is handed to the
+first healthy transport, fastest first, out of those that
+are configured:
+
+* email to add@getpocket.com (Outlook in Windows, otherwise
+  the generic python module 'smtplib')
+* the Pocket v3 HTTP API ('/v3/add' for a single url,
+  '/v3/send' for batches)
+* a local queue file, which is only used when no other
+  transport succeeds
+
+Urls that have already been submitted are recognised from a
+local index, $XDG_CACHE_HOME/qutebrowser/pocket_submitted.sqlite,
+and answered with an 'already in Pocket' message without any
+network traffic. Urls are normalised before lookup: fragments,
+tracking parameters and a 'www.' subdomain are ignored. Use
+'--force' to submit a url again.
+
+Every delivery attempt is timed, and the latency and health
+of each transport is recorded in
+$XDG_CACHE_HOME/qutebrowser/pocket_transports.json; a
+transport that failed is skipped for five minutes. A url left
+in the queue file is reported as queued, not added. If every
+transport fails the script attempts to add the url to Pocket
+via the Pocket website (http://www.getpocket.com/edit).
 
 Feedback is sent to qutebrowser's status line. This process
 uses environmental variable 'QUTE_FIFO' which holds the name
 of a named pipe (unix and mac os) or regular file (windows)
 used in communicating with qutebrowser.
 
+With '--bookmarks' every bookmark in qutebrowser's bookmarks
+file (or the file given) is added to Pocket instead, and the
+script can be run from a terminal, where feedback is printed
+on stderr. The file is read a line at a time; bookmarklets
+('javascript:' urls) and other urls that are not web pages
+are skipped, as are urls already submitted (unless forced).
+The rest are sent in batches ('--batch', by default 20 urls)
+at no more than '--rate' urls a minute (by default 60, or 0
+for no limit), and the email transport keeps a single smtp
+session open for the whole run. Urls are recorded as
+submitted, and progress is checkpointed to
+$XDG_CACHE_HOME/qutebrowser/pocket_bulk.json, as each batch,
+or part of a batch, is delivered; a transport that fails part
+way through a batch hands only the urls it did not deliver to
+the next. A run that stops because every transport failed,
+or is interrupted, resumes after the urls delivered when run
+again. Ctrl-C lets the batch being sent finish first; a
+second Ctrl-C stops at once, and the urls of that batch may
+then be sent again. A checkpoint is ignored if the bookmarks
+file has changed before the point it records, or with
+'--restart'.
+
 Details about the mail server and email account to use are
 obtained from ~/qute_mail.ini. The file format is:
 
@@ -34,30 +74,643 @@ obtained from ~/qute_mail.ini. The file format is:
     password = ...
     email = ...
 
-Note that while the email value must be provided, it is
-ignored in Windows: the default Outlook email account is
-used.
+    [pocket]
+    consumer_key = ...
+    access_token = ...
+    api = ...
+
+    [queue]
+    path = ...
+
+Each section is optional, but at least one transport must be
+configured. The email transport needs all of the [server] and
+[account] values. Note that while the email value must be
+provided, it is ignored in Windows: the default Outlook email
+account is used. The pocket 'api' value defaults to
+https://getpocket.com/v3 and can point to a local stand-in
+server for testing.
 """
 
 # import statements    {{{1
+import abc
 import os
 import sys
+import json
+import time
+import collections
+import hashlib
+import sqlite3
 import textwrap
 import argparse
 import email.message
 import platform
+import signal
+import urllib.error
+import urllib.parse
+import urllib.request
 if platform.system() == 'Windows':
     import win32com.client
 else:
     import smtplib
 import configparser  # noqa: flake8: module level import not at top of file
 import inflect    # noqa: flake8: module level import not at top of file
+import qute_fifo    # noqa: flake8: module level import not at top of file
+
+
+# constants    {{{1
+POCKET_EMAIL = 'add@getpocket.com'
+POCKET_API = 'https://getpocket.com/v3'
+CONFIG_DIR = (os.getenv('QUTE_CONFIG_DIR')
+              or os.path.join(os.getenv('XDG_CONFIG_HOME')
+                              or os.path.join(os.path.expanduser('~'),
+                                              '.config'),
+                              'qutebrowser'))
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser')
+BOOKMARKS_FILE = os.path.join(CONFIG_DIR, 'bookmarks', 'urls')
+METRICS_FILE = os.path.join(CACHE_DIR, 'pocket_transports.json')
+INDEX_FILE = os.path.join(CACHE_DIR, 'pocket_submitted.sqlite')
+CHECKPOINT_FILE = os.path.join(CACHE_DIR, 'pocket_bulk.json')
+BULK_BATCH = 20    # urls in each batch of a bulk submission
+BULK_RATE = 60    # most urls submitted a minute in bulk, or 0 for no limit
+TRACKING_PARAMS = ('fbclid', 'gclid', 'dclid', 'msclkid', 'igshid',
+                   'mc_cid', 'mc_eid', 'ref', 'ref_src', 'ref_url',
+                   '_hsenc', '_hsmi', 'yclid', 'spm')
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')
+
+
+class TransportError(Exception):    # {{{1
+
+    """ raised when a transport fails to deliver urls to Pocket
+
+    'delivered' holds the items that did reach Pocket before the
+    failure, so that they are not handed to another transport
+    """
+
+    def __init__(self, message, delivered=()):    # {{{2
+
+        """ initialise variables """
+
+        super().__init__(message)
+        self.delivered = list(delivered)
+
+
+class Transport(abc.ABC):    # {{{1
+
+    # class docstring    {{{2
+    """ base class for a way of getting urls into Pocket
+
+    subclasses set 'name', optionally 'batch_size' (the number
+    of urls a single delivery can carry) and 'deferred' (true
+    for local sinks that do not reach Pocket immediately), and
+    implement _deliver(items), where items is a list of
+    (url, title) tuples; a failed delivery raises TransportError,
+    with the items delivered before the failure
+
+    used as a context manager, a transport may keep its connection
+    open between deliveries until exit; by default each delivery
+    connects anew
+    """
+
+    name = None
+    batch_size = 1
+    deferred = False
+
+    def __enter__(self):    # {{{2
+
+        """ keep connection open between deliveries """
+
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ close connection kept open """
+
+    def send(self, items):    # {{{2
+
+        """ deliver items and return elapsed time in seconds """
+
+        start = time.monotonic()
+        self._deliver(items)
+        return time.monotonic() - start
+
+    @abc.abstractmethod
+    def _deliver(self, items):    # {{{2
+
+        """ deliver items; implemented by subclasses """
+
+
+class SmtpTransport(Transport):    # {{{1
+
+    # class docstring    {{{2
+    """ email urls to Pocket over smtp
+
+    all urls in a delivery share a single smtp session,
+    with one email per url; used as a context manager, the
+    session is kept open for every delivery until exit
+    """
+
+    name = 'smtp'
+    batch_size = 50
+
+    def __init__(self, server, account):    # {{{2
+
+        """ initialise variables """
+
+        self.__server = server
+        self.__account = account
+        self.__keep = False
+        self.__session = None    # session kept open between deliveries
+
+    def __enter__(self):    # {{{2
+
+        """ keep the smtp session open between deliveries """
+
+        self.__keep = True
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ close the smtp session kept open """
+
+        self.__keep = False
+        self.__close()
+
+    def __close(self):    # {{{2
+
+        """ end the session kept open, if any, ignoring errors """
+
+        session, self.__session = self.__session, None
+        if session is not None:
+            try:
+                session.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+    def __connect(self):    # {{{2
+
+        """ session kept open, if the server still answers, or a new one
+
+        the kept session is checked before use, so that a session
+        the server has dropped is replaced rather than failing the
+        delivery; emails sent before a later failure are reported
+        with it, so the runner does not send them again
+        """
+
+        if self.__session is not None:
+            try:
+                if self.__session.noop()[0] == 250:
+                    return self.__session
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.__close()
+        server = smtplib.SMTP(self.__server['smtp'], self.__server['port'])
+        server.login(self.__account['login'], self.__account['password'])
+        if self.__keep:
+            self.__session = server
+        return server
+
+    def _deliver(self, items):    # {{{2
+
+        """ send one email per url over a single smtp session """
+
+        sent = 0
+        try:
+            server = self.__connect()
+            for url, _ in items:
+                mail = email.message.Message()
+                mail['To'] = POCKET_EMAIL
+                mail['From'] = self.__account['email']
+                mail['Subject'] = 'Add to Pocket'
+                mail.add_header('Content-Type', 'text/plain')
+                mail.set_payload(url)
+                server.sendmail(self.__account['email'], mail['To'],
+                                mail.as_string())
+                sent += 1
+            if not self.__keep:
+                server.quit()
+        except (smtplib.SMTPException, OSError) as err:
+            self.__close()
+            raise TransportError(err, items[:sent])
+
+
+class OutlookTransport(Transport):    # {{{1
+
+    """ email urls to Pocket using the default Outlook account """
+
+    name = 'outlook'
+    batch_size = 50
+
+    def _deliver(self, items):    # {{{2
+
+        """ send one Outlook email per url """
+
+        sent = 0
+        try:
+            const = win32com.client.constants
+            const.olMailItem = 0x0
+            obj = win32com.client.Dispatch('Outlook.Application')
+            for url, _ in items:
+                mail = obj.CreateItem(const.olMailItem)
+                mail.To = POCKET_EMAIL
+                mail.Subject = 'Add to Pocket'
+                mail.Body = url
+                mail.Send()
+                sent += 1
+        except win32com.client.exception as err:
+            raise TransportError(err, items[:sent])
+
+
+class PocketApiTransport(Transport):    # {{{1
+
+    # class docstring    {{{2
+    """ add urls with the Pocket v3 HTTP API
+
+    a single url is posted to '/v3/add'; several urls are
+    posted together as 'add' actions to '/v3/send', so one
+    request carries the whole batch
+    """
+
+    name = 'api'
+    batch_size = 500
+
+    def __init__(self, consumer_key, access_token, api=POCKET_API,
+                 timeout=10):    # {{{2
+
+        """ initialise variables """
+
+        self.__auth = {'consumer_key': consumer_key,
+                       'access_token': access_token}
+        self.__api = api.rstrip('/')
+        self.__timeout = timeout
+
+    def __post(self, endpoint, payload):    # {{{2
+
+        """ post json payload to api endpoint and return decoded reply """
+
+        payload.update(self.__auth)
+        request = urllib.request.Request(
+            self.__api + '/' + endpoint,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json; charset=UTF-8',
+                     'X-Accept': 'application/json'})
+        try:
+            with urllib.request.urlopen(request,
+                                        timeout=self.__timeout) as reply:
+                return json.loads(reply.read().decode('utf-8') or '{}')
+        except urllib.error.HTTPError as err:
+            raise TransportError('{0} {1}'.format(
+                err.code, err.headers.get('X-Error', err.reason)))
+        except (urllib.error.URLError, OSError, ValueError) as err:
+            raise TransportError(err)
+
+    def _deliver(self, items):    # {{{2
+
+        """ add a single url, or send a batch of add actions """
+
+        if len(items) == 1:
+            url, title = items[0]
+            payload = {'url': url}
+            if title:
+                payload['title'] = title
+            if self.__post('add', payload).get('status') != 1:
+                raise TransportError('Pocket rejected the url')
+            return
+        now = int(time.time())
+        actions = [{'action': 'add', 'url': url, 'title': title or '',
+                    'time': now} for url, title in items]
+        reply = self.__post('send', {'actions': actions})
+        results = reply.get('action_results', [])
+        if reply.get('status') != 1 or len(results) < len(items) \
+                or not all(results):
+            added = [item for item, res in zip(items, results) if res]
+            raise TransportError('Pocket rejected {0} of {1} urls'.format(
+                len(items) - len(added), len(items)), added)
+
+
+class QueueTransport(Transport):    # {{{1
+
+    # class docstring    {{{2
+    """ append urls to a local queue file
+
+    each line of the queue file is a url and title separated
+    by a tab; the queue is a last resort that does not reach
+    Pocket until drained by other means
+    """
+
+    name = 'queue'
+    batch_size = 10000
+    deferred = True
+
+    def __init__(self, path):    # {{{2
+
+        """ initialise variables """
+
+        self.__path = os.path.expanduser(path)
+
+    def _deliver(self, items):    # {{{2
+
+        """ append items to the queue file """
+
+        lines = [url + '\t' + ' '.join((title or '').split()) + '\n'
+                 for url, title in items]
+        try:
+            with open(self.__path, 'a') as queue:
+                queue.write(''.join(lines))
+        except OSError as err:
+            raise TransportError(err)
+
+
+class SubmittedIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ bounded on-disk set of urls already submitted to Pocket
+
+    urls are normalised with normalise_url() and stored as 64-bit
+    hashes in a sqlite table, together with the time they were
+    submitted; once the table holds more than 'limit' urls the
+    oldest are dropped
+
+    usage:
+
+    index = SubmittedIndex()
+    added = index.lookup(url)    # submission time or None
+    index.add([url, ...])
+    """
+
+    def __init__(self, path=INDEX_FILE, limit=100000):    # {{{2
+
+        """ initialise variables """
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.__limit = limit
+        self.__db = sqlite3.connect(path)
+        self.__db.execute('CREATE TABLE IF NOT EXISTS submitted ('
+                          'hash INTEGER PRIMARY KEY, added REAL NOT NULL)')
+        self.__db.execute('CREATE INDEX IF NOT EXISTS submitted_added '
+                          'ON submitted (added)')
+
+    @staticmethod
+    def __hash(url):    # {{{2
+
+        """ signed 64-bit hash of normalised url """
+
+        digest = hashlib.blake2b(normalise_url(url).encode('utf-8'),
+                                 digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+
+    def lookup(self, url):    # {{{2
+
+        """ time url was submitted, or None if it never was """
+
+        row = self.__db.execute('SELECT added FROM submitted WHERE hash = ?',
+                                (self.__hash(url),)).fetchone()
+        return row[0] if row else None
+
+    def add(self, urls):    # {{{2
+
+        """ record urls as submitted now, then trim to limit """
+
+        now = time.time()
+        with self.__db:
+            self.__db.executemany(
+                'INSERT OR REPLACE INTO submitted (hash, added) VALUES (?, ?)',
+                [(self.__hash(url), now) for url in urls])
+            excess = (self.__db.execute('SELECT COUNT(*) FROM submitted')
+                      .fetchone()[0] - self.__limit)
+            if excess > 0:
+                self.__db.execute(
+                    'DELETE FROM submitted WHERE hash IN (SELECT hash '
+                    'FROM submitted ORDER BY added LIMIT ?)', (excess,))
+
+
+class TransportRunner(object):    # {{{1
+
+    # class docstring    {{{2
+    """ deliver urls using the fastest healthy transport
+
+    per-transport metrics are kept in a json file: an
+    exponentially weighted average of delivery latency, success
+    and failure counts, and the time of the last failure. A
+    transport that failed within 'cooldown' seconds is unhealthy
+    and is only tried after the healthy ones; deferred
+    transports are always tried last
+
+    usage:
+
+    runner = TransportRunner([transport, ...])
+    name, elapsed = runner.send([(url, title), ...])
+
+    with runner:    # transports keep connections open for every send
+        runner.send(...)
+    """
+
+    def __init__(self, transports, metrics_file=METRICS_FILE,
+                 cooldown=300):    # {{{2
+
+        """ initialise variables """
+
+        self.__transports = transports
+        self.__metrics_file = metrics_file
+        self.__cooldown = cooldown
+        self.__metrics = load_metrics(metrics_file)
+
+    def __enter__(self):    # {{{2
+
+        """ keep the transports' connections open until exit """
+
+        for transport in self.__transports:
+            transport.__enter__()
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        """ close the transports' connections """
+
+        for transport in self.__transports:
+            transport.__exit__(*exc)
+
+    def ordered(self):    # {{{2
+
+        """ transports in the order they will be tried """
+
+        now = time.time()
+
+        def rank(transport):
+            stats = self.__metrics.get(transport.name, {})
+            failed = stats.get('failed_at')
+            unhealthy = bool(failed and now - failed < self.__cooldown)
+            return (transport.deferred, unhealthy, stats.get('latency', 0.0))
+
+        return sorted(self.__transports, key=rank)
+
+    def send(self, items, delivered=None):    # {{{2
+
+        """ deliver items with the first transport that succeeds
+
+        items a transport delivered before failing are not handed
+        to the next; delivered, if given, is called with (transport,
+        items) as each batch, or part of a batch, is delivered
+
+        returns (transport, elapsed seconds) of the transport that
+        delivered the last items, or (None, 0.0) if there are no
+        items; raises TransportError if every transport fails, with
+        the items that were delivered
+        """
+
+        if not items:
+            return None, 0.0
+        errors = []
+        remaining = list(items)
+        done = []
+        for transport in self.ordered():
+            elapsed = 0.0
+            try:
+                while remaining:
+                    batch = remaining[:transport.batch_size]
+                    elapsed += transport.send(batch)
+                    self.__delivered(transport, batch, done, delivered)
+                    remaining = remaining[len(batch):]
+            except TransportError as err:
+                sent = [item for item in batch if item in err.delivered]
+                self.__delivered(transport, sent, done, delivered)
+                remaining = ([item for item in batch if item not in sent]
+                             + remaining[len(batch):])
+                self.__record(transport.name, None)
+                errors.append(transport.name + ': ' + str(err))
+                continue
+            self.__record(transport.name, elapsed / len(items))
+            return transport, elapsed
+        raise TransportError('; '.join(errors) or 'No transport configured',
+                             done)
+
+    @staticmethod
+    def __delivered(transport, items, done, callback):    # {{{2
+
+        """ note items delivered by transport """
+
+        if items:
+            done.extend(items)
+            if callback:
+                callback(transport, items)
+
+    def __record(self, name, latency):    # {{{2
+
+        """ update and save metrics after a delivery attempt
+
+        latency is None for a failed attempt
+        """
+
+        stats = self.__metrics.setdefault(name, {'sent': 0, 'failures': 0})
+        if latency is None:
+            stats['failures'] = stats.get('failures', 0) + 1
+            stats['failed_at'] = time.time()
+        else:
+            stats['sent'] = stats.get('sent', 0) + 1
+            stats['failed_at'] = None
+            previous = stats.get('latency')
+            stats['latency'] = (latency if previous is None
+                                else 0.7 * previous + 0.3 * latency)
+        try:
+            os.makedirs(os.path.dirname(self.__metrics_file), exist_ok=True)
+            with open(self.__metrics_file, 'w') as metrics:
+                json.dump(self.__metrics, metrics, indent=1, sort_keys=True)
+        except OSError:
+            pass    # metrics are advisory only
+
+
+class Checkpoint(object):    # {{{1
+
+    # class docstring    {{{2
+    """ on-disk progress of a bulk submission of a bookmarks file
+
+    records how far into the file submission has got, as a byte
+    offset, with the sha1 hash of the file up to that offset, the
+    counts so far and the normalised urls already delivered from
+    beyond the offset; a checkpoint is only resumed from if it is
+    for the same file and the file is unchanged up to the offset
+
+    usage:
+
+    checkpoint = Checkpoint(path)
+    offset, hasher, counts, ahead = (checkpoint.resume()
+                                     or (0, sha1(), {}, set()))
+    checkpoint.save(offset, hasher, counts, ahead)    # as urls go
+    checkpoint.clear()    # when the whole file is done
+    """
+
+    def __init__(self, source, path=CHECKPOINT_FILE):    # {{{2
+
+        """ initialise variables """
+
+        self.__source = os.path.abspath(source)
+        self.__path = path
+
+    def resume(self):    # {{{2
+
+        """ (offset, hasher, counts, ahead) to resume from, or None
+
+        hasher is a sha1 object fed with the file up to offset, and
+        ahead a set of normalised urls delivered from beyond it
+        """
+
+        hasher = hashlib.sha1()
+        try:
+            with open(self.__path) as handle:
+                saved = json.load(handle)
+            if saved['source'] != self.__source:
+                return None
+            offset = remaining = saved['offset']
+            with open(self.__source, 'rb') as source:
+                while remaining > 0:
+                    block = source.read(min(remaining, 1 << 16))
+                    if not block:
+                        return None
+                    hasher.update(block)
+                    remaining -= len(block)
+            if hasher.hexdigest() != saved['digest']:
+                return None
+            return (offset, hasher, dict(saved['counts']),
+                    set(saved.get('ahead', [])))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, offset, hasher, counts, ahead=()):    # {{{2
+
+        """ record progress, through a file renamed into place
+
+        failure is ignored, as the index of submitted urls still
+        stops a later run resending them
+        """
+
+        temporary = self.__path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+            with open(temporary, 'w') as handle:
+                json.dump({'source': self.__source, 'offset': offset,
+                           'digest': hasher.hexdigest(),
+                           'counts': counts, 'ahead': sorted(ahead),
+                           'saved': time.time()},
+                          handle, indent=1, sort_keys=True)
+            os.replace(temporary, self.__path)
+        except OSError:
+            pass
+
+    def clear(self):    # {{{2
+
+        """ remove the checkpoint """
+
+        try:
+            os.remove(self.__path)
+        except OSError:
+            pass
 
 
 class AddToPocket(object):    # {{{1
 
     # class docstring    {{{2
-    """ send url to qutebrowser by email
+    """ send url to Pocket
 
     assumes the existence of correctly written configuration file
     ~/qute_mail.ini
@@ -70,19 +723,46 @@ class AddToPocket(object):    # {{{1
     pocket = AddToPocket()
     pocket.read_config()
     pocket.add()
+
+    or, to add every bookmark, from qutebrowser or a terminal:
+
+    pocket = AddToPocket(bookmarks=BOOKMARKS_FILE)
+    pocket.read_config()
+    pocket.add_bookmarks()
     """
 
-    def __init__(self):    # {{{2
+    def __init__(self, force=False, bookmarks=None):    # {{{2
 
-        """ initialise variables """
+        """ initialise variables
+
+        force: submit url even if it was submitted before
+        bookmarks: bookmarks file to submit in bulk, instead of the
+                   current page (QUTE_FIFO and QUTE_URL are then
+                   not needed)
+        """
 
     # mail server and account (to come from config file)
         self.__server = {'smtp': None, 'port': None}
         self.__account = {'login': None, 'password': None, 'email': None}
 
+    # transports used to reach Pocket (assembled from config file)
+        self.__transports = []
+
+    # whether to bypass the index of previously submitted urls
+        self.__force = force
+
+    # bookmarks file to submit in bulk
+        self.__bookmarks = bookmarks
+
+    # message pipe to qute (qute-set environmental variable;
+    # without it messages are printed on stderr)
+        self.__fifo = qute_fifo.QuteFifo()
+        if not self.__fifo.active and not bookmarks:
+            self.__abort('Missing environmental variable QUTE_FIFO')
+
     # url to send (qute-set environmental variable)
         self.__url = os.getenv('QUTE_URL')
-        if not self.__url:
+        if not self.__url and not bookmarks:
             self.__abort('Missing environmental variable QUTE_URL')
 
     # web page title (optional qute-set environmental variable)
@@ -97,11 +777,6 @@ class AddToPocket(object):    # {{{1
                     self.__title = tail
                     break
 
-    # message pipe to qute (qute-set environmental variable)
-        self.__fifo = os.getenv('QUTE_FIFO')
-        if not self.__fifo:
-            self.__abort('Missing environmental variable QUTE_FIFO')
-
     # configuration file is ~/qute_mail.ini
         self.__conf = os.path.join(os.path.expanduser('~'), 'qute_mail.ini')
         if not os.path.isfile(self.__conf):
@@ -113,54 +788,56 @@ class AddToPocket(object):    # {{{1
     @staticmethod
     def __simplify(string):    # {{{2
 
-        """ simplify string so it can be part of qutebrower command
-
-        commands cannot contain newlines or unbalanced quotes, so:
-        - if string is multiline take only first line
-        - strip all quotes from string
+        """ simplify string for display in a message
 
-        for visual simplicity also strip final period if present
+        if string is multiline take only first line, and for visual
+        simplicity strip final period if present; quoting for the
+        qutebrowser command is left to qute_fifo
         """
 
-        simple = str(string).splitlines()[0]
-        return simple.rstrip('.').replace("'", "").replace('"', '')
+        lines = str(string).splitlines()
+        return lines[0].rstrip('.') if lines else ''
 
-    def __abort(self, message):    # {{{2
+    def __abort(self, message, status=None):    # {{{2
 
         """ exit script on failure
 
-        assume message is simplified, i.e., no newlines or quotes
-
         exiting without error status means error message is not followed
         in status bar by an exit status message, and the first message
-        remains visible for a fraction longer
+        remains visible for a fraction longer; a bulk submission that
+        stops part way gives a status, for use from a terminal
         """
 
-        cmd = 'message-error "' + message + '"'
-        self.__send_command(cmd)
-        sys.exit()
+        self.__fifo.error(message)
+        sys.exit(status)
 
-    def __success(self):    # {{{2
+    def __duplicate(self, added):    # {{{2
 
-        """ exit script on success """
+        """ exit script when url has already been submitted """
 
-        msg = (('Added to Pocket: ' + self.__title) if self.__title
-               else 'Added page to Pocket')
-        cmd = 'message-info "' + msg + '"'
-        self.__send_command(cmd)
+        msg = 'Already in Pocket (added {0}): {1}'.format(
+            time.strftime('%Y-%m-%d', time.localtime(added)),
+            self.__simplify(self.__title or self.__url))
+        self.__fifo.info(msg)
         sys.exit()
 
-    def __send_command(self, command):    # {{{2
+    def __success(self, transport, elapsed):    # {{{2
 
-        """ send command to qutebrowser via pipe
+        """ exit script on success
 
-        cannot open pipe in append mode ('a') because it
-        causes the userscript to exit with status 1
+        a url left in a local queue is reported as queued, as it
+        has not reached Pocket yet
         """
 
-        fifo = open(self.__fifo, 'w')
-        fifo.write(command)
-        fifo.close()
+        if transport.deferred:
+            msg = (('Queued for Pocket: ' + self.__simplify(self.__title))
+                   if self.__title else 'Queued page for Pocket')
+        else:
+            msg = (('Added to Pocket: ' + self.__simplify(self.__title))
+                   if self.__title else 'Added page to Pocket')
+        msg += ' [{0}, {1:.2f}s]'.format(transport.name, elapsed)
+        self.__fifo.info(msg)
+        sys.exit()
 
     def read_config(self):    # {{{2
 
@@ -191,77 +868,287 @@ class AddToPocket(object):    # {{{1
                  'password': self.__account['password'],
                  'email': self.__account['email']}
         missing = {key: check[key] for key in check if not check[key]}
-        if len(missing) > 0:
+        others = config.has_section('pocket') or config.has_section('queue')
+        if len(missing) > 0 and (len(missing) < len(check) or not others):
             self.__abort('Missing config ' +
                          self.__plural.plural_noun('value', len(missing)) +
                          ': ' + ', '.join(missing.keys()))
 
+    # assemble configured transports
+        if not missing:
+            if platform.system() == 'Windows':
+                self.__transports.append(OutlookTransport())
+            else:
+                self.__transports.append(SmtpTransport(self.__server,
+                                                       self.__account))
+        if config.has_section('pocket'):
+            key = config.get('pocket', 'consumer_key', fallback=None)
+            token = config.get('pocket', 'access_token', fallback=None)
+            if not key or not token:
+                self.__abort('Missing config values: pocket consumer_key '
+                             'and access_token')
+            api = config.get('pocket', 'api', fallback=POCKET_API)
+            self.__transports.append(PocketApiTransport(key, token, api))
+        if config.has_section('queue'):
+            path = config.get('queue', 'path', fallback=None)
+            if not path:
+                self.__abort('Missing config value: queue path')
+            self.__transports.append(QueueTransport(path))
+
     def add(self):    # {{{2
 
         """ add url to Pocket
 
-        first try email (Outlook in Windows, otherwise smtp,
+        skip urls that have already been submitted, then try the
+        configured transports, fastest healthy transport first,
         then try adding via getpocket website
         """
 
-    # first try to add by sending email
-        if platform.system() == 'Windows':
-            self.__send_outlook_email()
+    # answer repeat submissions from the local index
+        index = SubmittedIndex()
+        if not self.__force:
+            added = index.lookup(self.__url)
+            if added is not None:
+                self.__duplicate(added)
+
+    # first try to add with a transport
+        runner = TransportRunner(self.__transports)
+        try:
+            transport, elapsed = runner.send([(self.__url, self.__title)])
+        except TransportError:
+            pass
         else:
-            self.__send_smtp_email()
+            if not transport.deferred:
+                index.add([self.__url])
+            self.__success(transport, elapsed)
 
-    # if still here, then email attempt failed, so
+    # if still here, then every transport failed, so
     # try using getpocket website
-        cmd = 'open www.getpocket.com/edit?url=' + self.__url
-        self.__send_command(cmd)
+        self.__fifo.send('open ' + qute_fifo.verbatim(
+            'www.getpocket.com/edit?url=' + self.__url))
 
     # effect of previous command is to open pocket website,
     # and the website will clearly convey the outcome
         sys.exit()
 
-    def __send_smtp_email(self):    # {{{2
+    def add_bookmarks(self, batch=BULK_BATCH, rate=BULK_RATE,
+                      restart=False):    # {{{2
 
-        """ send smtp email to Pocket email address """
+        """ add every web page in the bookmarks file to Pocket
+
+        the file is read a line at a time, skipping urls that are
+        not web pages and, unless forced, urls already submitted;
+        the rest are sent 'batch' at a time, at most 'rate' a minute
+        (0 for no limit), with each transport's connection kept
+        open throughout; urls are recorded, and progress is
+        checkpointed, as they are delivered, and resumed from unless
+        'restart' is true
+        """
 
+    # resume from the checkpoint of an earlier, interrupted run
+        checkpoint = Checkpoint(self.__bookmarks)
+        resumed = None if restart else checkpoint.resume()
+        offset, hasher, counts, ahead = (resumed
+                                         or (0, hashlib.sha1(), {}, set()))
+        counts = collections.Counter(counts)
         try:
-    # create email
-            mail = email.message.Message()
-            mail['To'] = 'add@getpocket.com'
-            mail['From'] = self.__account['email']
-            mail['Subject'] = 'Add to Pocket'
-            mail.add_header('Content-Type', 'text/plain')
-            mail.set_payload(self.__url)
-
-    # send email
-            server = smtplib.SMTP(self.__server['smtp'], self.__server['port'])
-            server.login(self.__account['login'], self.__account['password'])
-            server.sendmail(self.__account['email'], mail['To'],
-                            mail.as_string())
-            server.quit()
-        except smtplib.SMTPException:
-            return
+            size = os.path.getsize(self.__bookmarks)
+        except OSError as err:
+            self.__abort("Cannot read '" + self.__bookmarks + "': " +
+                         self.__simplify(err.strerror or err), 1)
+        if resumed:
+            self.__fifo.info('Resuming bookmarks at {0}%: {1}'.format(
+                100 * offset // max(size, 1), self.__tally(counts)))
+
+        index = SubmittedIndex()
+        runner = TransportRunner(self.__transports)
+        seen = set()    # normalised urls of this run
+        pending = []
+        # where to resume from after each pending url: (offset,
+        # hasher, skipped, already), with the start of the batch first
+        marks = [(offset, hasher.copy(), counts['skipped'],
+                  counts['already'])]
+        delivered = set()    # pending urls delivered
+        stopping = []    # set by a ctrl-c while a batch is sent
+        started = time.monotonic()
+        paced = 0    # urls sent this run, for the rate limit
+
+        def record(transport, items):
+            # record items as delivered, and checkpoint after the
+            # pending urls delivered so far, noting those beyond
+            if transport.deferred:
+                counts['queued'] += len(items)
+            else:
+                index.add([url for url, _ in items])
+                counts['sent'] += len(items)
+            delivered.update(items)
+            done = 0
+            while done < len(pending) and pending[done] in delivered:
+                done += 1
+            ahead.update(normalise_url(url) for url, title
+                         in pending[done:] if (url, title) in delivered)
+            at, digest, skipped, already = marks[done]
+            checkpoint.save(at, digest, dict(counts, skipped=skipped,
+                                             already=already), ahead)
+
+        def stop_after_batch(*_):
+            # first ctrl-c while a batch is sent: finish it, so that
+            # what was delivered is recorded, then stop
+            if stopping:
+                raise KeyboardInterrupt
+            stopping.append(True)
+            self.__fifo.progress('Stopping after this batch '
+                                 '(ctrl-c again to stop now)')
+
+        def submit():
+            # send pending urls, once the rate limit allows, then
+            # checkpoint and start the next batch
+            nonlocal paced
+            if rate:
+                time.sleep(max(0.0, started + paced * 60 / rate
+                               - time.monotonic()))
+            handler = signal.signal(signal.SIGINT, stop_after_batch)
+            try:
+                runner.send(pending, delivered=record)
+            finally:
+                signal.signal(signal.SIGINT, handler)
+            if stopping:
+                raise KeyboardInterrupt
+            paced += len(pending)
+            ahead.difference_update(normalise_url(url)
+                                    for url, _ in pending)
+            del pending[:]
+            delivered.clear()
+            marks[:] = [(offset, hasher.copy(), counts['skipped'],
+                         counts['already'])]
+            checkpoint.save(offset, hasher, counts, ahead)
+            self.__fifo.progress('Adding bookmarks to Pocket, {0}%: {1}'
+                                 .format(100 * offset // max(size, 1),
+                                         self.__tally(counts)))
+
+    # stream the file, submitting batches as they fill
+        try:
+            with open(self.__bookmarks, 'rb') as bookmarks, runner:
+                bookmarks.seek(offset)
+                for line in bookmarks:
+                    offset += len(line)
+                    hasher.update(line)
+                    url, _, title = (line.decode('utf-8', 'replace')
+                                     .strip().partition(' '))
+                    if not url:
+                        continue
+                    try:
+                        web = urllib.parse.urlsplit(url).scheme.lower() \
+                            in ('http', 'https')
+                    except ValueError:
+                        web = False
+                    if not web:
+                        counts['skipped'] += 1
+                        continue
+                    key = normalise_url(url)
+                    if key in ahead:
+                        seen.add(key)    # delivered by an earlier run
+                        continue
+                    if key in seen or (not self.__force and
+                                       index.lookup(url) is not None):
+                        counts['already'] += 1
+                        continue
+                    seen.add(key)
+                    pending.append((url, title.strip()))
+                    marks.append((offset, hasher.copy(), counts['skipped'],
+                                  counts['already']))
+                    if len(pending) >= batch:
+                        submit()
+                if pending:
+                    submit()
+        except OSError as err:
+            self.__abort("Cannot read '" + self.__bookmarks + "': " +
+                         self.__simplify(err.strerror or err), 1)
+        except TransportError as err:
+            self.__abort('Stopped adding bookmarks (run again to resume), '
+                         + self.__tally(counts) + ': '
+                         + self.__simplify(err), 1)
+        except KeyboardInterrupt:
+            self.__abort('Interrupted adding bookmarks (run again to '
+                         'resume), ' + self.__tally(counts), 1)
+        checkpoint.clear()
+        self.__fifo.info('Added bookmarks to Pocket: ' + self.__tally(counts))
+        sys.exit()
 
-    # assume success if no exceptions occurred
-        self.__success()
+    @staticmethod
+    def __tally(counts):    # {{{2
 
-    def __send_outlook_email(self):    # {{{2
+        """ counts of a bulk submission, for display in a message """
 
-        """ send Outlook email to Pocket email address """
+        return ('{0} sent, {1} queued, {2} already submitted, '
+                '{3} not web pages'.format(counts['sent'], counts['queued'],
+                                           counts['already'],
+                                           counts['skipped']))
 
-        try:
-            const = win32com.client.constants
-            const.olMailItem = 0x0
-            obj = win32com.client.Dispatch('Outlook.Application')
-            mail = obj.CreateItem(const.olMailItem)
-            mail.To = 'add@getpocket.com'
-            mail.Subject = 'Add to Pocket'
-            mail.Body = self.__url
-            mail.Send()
-        except win32com.client.exception:
-            return
 
-    # report success
-        self.__success()
+def normalise_url(url):    # {{{1
+
+    """ reduce url to a canonical form for duplicate detection
+
+    like simplify_url in password_fill, drop the parts that do
+    not identify the page: fragment, tracking parameters, 'www.'
+    subdomain and default port; scheme and host are lowercased
+    and the remaining parameters sorted
+    """
+
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        host += ':' + str(port)
+    query = sorted((key, value) for key, value
+                   in urllib.parse.parse_qsl(parts.query,
+                                             keep_blank_values=True)
+                   if key.lower() not in TRACKING_PARAMS
+                   and not key.lower().startswith(TRACKING_PREFIXES))
+    path = parts.path.rstrip('/') or '/'
+    if scheme in ('http', 'https'):
+        scheme = 'http'    # the same page whichever scheme was used
+    return urllib.parse.urlunsplit((scheme, host, path,
+                                    urllib.parse.urlencode(query), ''))
+
+
+def load_metrics(path=METRICS_FILE):    # {{{1
+
+    """ read transport metrics, returning empty metrics on failure """
+
+    try:
+        with open(path) as metrics:
+            return json.load(metrics)
+    except (OSError, ValueError):
+        return {}
+
+
+def show_metrics():    # {{{1
+
+    """ print transport metrics """
+
+    metrics = load_metrics()
+    if not metrics:
+        print('No transport metrics recorded in ' + METRICS_FILE)
+        return
+    print('{0:<8} {1:>10} {2:>6} {3:>8}  {4}'.format(
+        'name', 'latency', 'sent', 'failures', 'last failure'))
+    for name in sorted(metrics):
+        stats = metrics[name]
+        latency = stats.get('latency')
+        failed = stats.get('failed_at')
+        print('{0:<8} {1:>10} {2:>6} {3:>8}  {4}'.format(
+            name, '-' if latency is None else '{0:.3f}s'.format(latency),
+            stats.get('sent', 0), stats.get('failures', 0),
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(failed))
+            if failed else '-'))
 
 
 def usage():    # {{{1
@@ -277,18 +1164,34 @@ def usage():    # {{{1
 
     This userscript takes the current page in qutebrowser and
     adds it to Pocket.  The current page url is obtained from
-    environmental variable 'QUTE_URL'. The script attempts to
-    send this url to Pocket by email (add@getpocket.com). In
-    Windows Outlook is used. In other operating systems the
-    generic python module 'smtplib' is used.
+    environmental variable 'QUTE_URL'. The url is handed to the
+    first healthy transport, fastest first, out of those that
+    are configured: email to add@getpocket.com (Outlook in
+    Windows, otherwise the generic python module 'smtplib'),
+    the Pocket v3 HTTP API, and a local queue file which is
+    only used as a last resort. Urls that were submitted before
+    are answered from a local index without network traffic,
+    unless '--force' is used. Transport latency and health
+    are recorded in $XDG_CACHE_HOME/qutebrowser/
+    pocket_transports.json; use '--stats' to display them.
 
     Feedback is sent to qutebrowser's status line. This process
     uses environmental variable 'QUTE_FIFO' which holds the name
     of a named pipe (unix and mac os) or regular file (windows)
     used in communicating with qutebrowser.
 
-    Details about the mail server and email account to use are
-    obtained from ~/qute_mail.ini. The file format is:
+    With '--bookmarks' every web page in the bookmarks file is
+    added instead, and the script can be run from a terminal.
+    Bookmarklets and other urls that are not web pages, and urls
+    already submitted, are skipped. The rest are sent in batches
+    of '--batch' urls, at most '--rate' urls a minute, and the
+    email transport keeps one smtp session open throughout.
+    Progress is checkpointed in $XDG_CACHE_HOME/qutebrowser/
+    pocket_bulk.json after each batch, so an interrupted run
+    resumes where it stopped, unless '--restart' is used.
+
+    Transport details are obtained from ~/qute_mail.ini. The
+    file format is:
 
         [server]
         address = ...
@@ -299,22 +1202,64 @@ def usage():    # {{{1
         password = ...
         email = ...
 
-    Note that while the email value must be provided, it is
-    ignored in Windows: the default Outlook email account is
-    used.
+        [pocket]
+        consumer_key = ...
+        access_token = ...
+        api = ...
+
+        [queue]
+        path = ...
+
+    Each section is optional, but at least one transport must
+    be configured. Note that while the email value must be
+    provided, it is ignored in Windows: the default Outlook
+    email account is used. The pocket 'api' value defaults to
+    https://getpocket.com/v3.
     ''')
-    argparse.ArgumentParser(formatter_class=argparse.
-                            RawDescriptionHelpFormatter,
-                            description=description).parse_args()    # }}}1
+    parser = argparse.ArgumentParser(formatter_class=argparse.
+                                     RawDescriptionHelpFormatter,
+                                     description=description)
+    parser.add_argument('--force', action='store_true',
+                        help='add url even if it was submitted before')
+    parser.add_argument('--stats', action='store_true',
+                        help='print transport latency metrics and exit')
+    parser.add_argument('--bookmarks', nargs='?', const=BOOKMARKS_FILE,
+                        metavar='FILE',
+                        help='add every bookmark in FILE instead of the '
+                        'current page (default FILE: {0})'.format(
+                            BOOKMARKS_FILE))
+    parser.add_argument('--batch', type=int, default=BULK_BATCH,
+                        metavar='N',
+                        help='with --bookmarks, urls sent in each batch '
+                        '(default: %(default)s)')
+    parser.add_argument('--rate', type=float, default=BULK_RATE,
+                        metavar='N',
+                        help='with --bookmarks, most urls sent a minute, '
+                        'or 0 for no limit (default: %(default)s)')
+    parser.add_argument('--restart', action='store_true',
+                        help='with --bookmarks, ignore the checkpoint of '
+                        'an interrupted run')
+    args = parser.parse_args()
+    if args.batch < 1:
+        parser.error('--batch must be at least 1')
+    if args.rate < 0:
+        parser.error('--rate must not be negative')
+    return args    # }}}1
 
 
 def main():
 
     """ script execution starts here """
 
-    usage()
-    pocket = AddToPocket()
+    args = usage()
+    if args.stats:
+        show_metrics()
+        return
+    pocket = AddToPocket(force=args.force, bookmarks=args.bookmarks)
     pocket.read_config()
+    if args.bookmarks:
+        pocket.add_bookmarks(batch=args.batch, rate=args.rate,
+                             restart=args.restart)
     pocket.add()
 
 
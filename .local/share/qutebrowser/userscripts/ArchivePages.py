@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" qutebrowser userscript to save many pages as markdown
+
+This qutebrowser userscript is designed to be called from
+qutebrowser with commands like:
+
+    hint --rapid links userscript ArchivePages.py
+    spawn --userscript ArchivePages.py --tabs
+    spawn --userscript ArchivePages.py --bookmarks
+
+Each invocation adds urls to a queue,
+$XDG_CACHE_HOME/qutebrowser/archive_queue.txt: the url in
+environmental variable 'QUTE_URL' (as set for a hinted link),
+any urls given as arguments, every http(s) bookmark with
+'--bookmarks', or the current page of every open tab with
+'--tabs'. Open tabs are found by asking qutebrowser to save a
+session, which is read from, and then removed from, the
+'sessions' directory in environmental variable 'QUTE_DATA_DIR'.
+
+The first invocation to find no archiver running becomes the
+archiver, and keeps running in the background until the queue is
+empty; later invocations, e.g., the other links of a rapid hint
+session, only add to the queue. The archiver fetches pages
+concurrently in a bounded pool of http requests, with at most
+two requests to any one host at a time, and converts them to
+markdown in a pool of 'SaveMarkdown.py --batch' processes, so
+the python 2 converter starts once per process rather than once
+per page. The converter command can be changed with
+environmental variable 'SAVE_MARKDOWN'.
+
+Pages are saved to a path given by a template (option '--dest')
+with the fields:
+
+    {downloads}  directory in 'QUTE_DOWNLOAD_DIR', defaulting
+                 to '$HOME/Downloads'
+    {date}       today's date, e.g., 2020-01-31
+    {host}       host name of the url
+    {name}       last part of the url path, without extension
+    {title}      page title, or {name} if the page has no title
+
+Existing files are not overwritten: '-2', '-3', etc., is added to
+the file name instead. Progress is sent to qutebrowser's status
+line every few seconds through the named pipe in environmental
+variable 'QUTE_FIFO', and every page is logged, with its saved
+path or the reason it failed, in
+$XDG_CACHE_HOME/qutebrowser/archive_pages.log. Saved pages are
+also recorded, with their url and title, for SearchPages.py.
+
+With '--compressed', pages are stored in the compressed,
+content-addressed archive of saved pages (see PageArchive.py)
+instead of files, under the file name the template gives, so that
+the same page saved from several urls is only stored once.
+"""
+
+# import statements    {{{1
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import fcntl
+import html
+import http.client
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import page_archive
+import qute_fifo
+import saved_pages
+
+
+# constants    {{{1
+CONFIG_DIR = (os.getenv('QUTE_CONFIG_DIR')
+              or os.path.join(os.getenv('XDG_CONFIG_HOME')
+                              or os.path.join(os.path.expanduser('~'),
+                                              '.config'),
+                              'qutebrowser'))
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser')
+DOWNLOAD_DIR = (os.getenv('QUTE_DOWNLOAD_DIR')
+                or os.path.join(os.path.expanduser('~'), 'Downloads'))
+QUEUE_FILE = os.path.join(CACHE_DIR, 'archive_queue.txt')
+LOCK_FILE = os.path.join(CACHE_DIR, 'archive_worker.lock')
+LOG_FILE = os.path.join(CACHE_DIR, 'archive_pages.log')
+DEST_TEMPLATE = '{downloads}/archive/{date}/{host}/{title}.md'
+DEST_FIELDS = ('downloads', 'date', 'host', 'name', 'title')
+CONVERTER = os.getenv('SAVE_MARKDOWN') or shlex.quote(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 'SaveMarkdown.py')) + ' --batch'
+SESSION_NAME = 'archive-pages'
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) '
+              'qutebrowser-archive-pages/1.0')
+MAX_PAGE_SIZE = 20 * 1024 * 1024
+GRACE = 2    # seconds to wait for more rapid hints before exiting
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title', re.IGNORECASE | re.DOTALL)
+_UNSAFE_RE = re.compile(r'[^\w.-]+')
+
+
+class ArchiveError(Exception):    # {{{1
+
+    """ page could not be fetched or converted """
+
+
+class UrlQueue(object):    # {{{1
+
+    # class docstring    {{{2
+    """ queue of urls to archive, shared between invocations
+
+    usage:
+
+    queue = UrlQueue()
+    queue.put(urls)
+    if queue.claim():    # this process is the archiver
+        urls = queue.take()
+
+    The archiver holds an exclusive lock on a lock file while
+    it runs. It releases the lock only while holding the queue
+    lock and having found the queue empty, so a url added after
+    that point always finds the lock free, and its invocation
+    becomes the next archiver.
+    """
+
+    def __init__(self, path=QUEUE_FILE, lock_path=LOCK_FILE):    # {{{2
+
+        """ initialise variables """
+
+        self._path = path
+        self._lock_path = lock_path
+        self._lock = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def put(self, urls):    # {{{2
+
+        """ append urls to the queue """
+
+        with open(self._path, 'a', encoding='utf-8') as queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            queue.writelines(url + '\n' for url in urls)
+
+    def claim(self):    # {{{2
+
+        """ become the archiver, returning False if one is running """
+
+        lock = open(self._lock_path, 'w')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._lock = lock
+        return True
+
+    def take(self, last=False):    # {{{2
+
+        """ remove and return the queued urls
+
+        if last is true and the queue is empty, give up the
+        archiver lock before the queue is unlocked
+        """
+
+        with open(self._path, 'a+', encoding='utf-8') as queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            queue.seek(0)
+            urls = [line.strip() for line in queue if line.strip()]
+            queue.truncate(0)
+            if last and not urls:
+                self._lock.close()
+                self._lock = None
+        return urls
+
+
+class ConverterPool(object):    # {{{1
+
+    # class docstring    {{{2
+    """ pool of long running 'SaveMarkdown.py --batch' processes
+
+    usage:
+
+    with ConverterPool(size=4) as pool:
+        pool.convert(html_path, markdown_path)
+
+    convert() may be called from several threads at once; each
+    call uses an idle converter process
+    """
+
+    def __init__(self, size, command=CONVERTER):    # {{{2
+
+        """ initialise variables """
+
+        self._command = shlex.split(command)
+        self._idle = collections.deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._guard = threading.Lock()
+        self._procs = []
+
+    def __enter__(self):    # {{{2
+
+        return self
+
+    def __exit__(self, *exc):    # {{{2
+
+        for proc in self._procs:
+            proc.stdin.close()
+        for proc in self._procs:
+            proc.wait()
+
+    def _spawn(self):    # {{{2
+
+        """ start a converter process """
+
+        proc = subprocess.Popen(
+            self._command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, universal_newlines=True, bufsize=1)
+        with self._guard:
+            self._procs.append(proc)
+        return proc
+
+    def convert(self, inpath, outpath):    # {{{2
+
+        """ convert html file inpath to markdown file outpath
+
+        returns why the page was saved as plain text instead, if it
+        was (see SaveMarkdown.py's budget), else None
+        """
+
+        with self._slots:
+            with self._guard:
+                proc = self._idle.pop() if self._idle else None
+            if proc is None or proc.poll() is not None:
+                proc = self._spawn()
+            try:
+                proc.stdin.write(inpath + '\t' + outpath + '\n')
+                proc.stdin.flush()
+                reply = proc.stdout.readline()
+            except OSError:
+                reply = ''
+            with self._guard:
+                self._idle.append(proc)
+        status, _, detail = reply.rstrip('\n').partition('\t')
+        if status != 'ok':
+            raise ArchiveError(detail or 'converter exited')
+        # 'ok<TAB>OUTPUT<TAB>plain text: REASON' if saved as plain text
+        return detail.partition('\t')[2] or None
+
+
+class Archiver(object):    # {{{1
+
+    # class docstring    {{{2
+    """ fetch and convert queued urls until the queue is empty
+
+    usage:
+
+    archiver = Archiver(queue, dest=DEST_TEMPLATE, jobs=8)
+    archiver.run()
+    """
+
+    def __init__(self, queue, dest=DEST_TEMPLATE, jobs=8, converters=None,
+                 timeout=20, progress=None, archive=None):    # {{{2
+
+        """ initialise variables
+
+        progress, if given, is called with a progress message about
+        once a second, and is expected to throttle them; archive, if
+        given, is the page_archive.Archive pages are stored in
+        instead of files
+        """
+
+        self._queue = queue
+        self._dest = dest
+        self._page_archive = archive
+        self._jobs = jobs
+        self._converters = converters or min(4, os.cpu_count() or 1)
+        self._timeout = timeout
+        self._progress = progress
+        self._hosts = collections.defaultdict(
+            lambda: threading.BoundedSemaphore(2))
+        self._claimed = set()
+        self._guard = threading.Lock()
+        self._tally = collections.Counter()
+        self._date = datetime.date.today().isoformat()
+        self._tempdir = None
+
+    def _fetch(self, url):    # {{{2
+
+        """ fetch url into a temporary file, returning (path, title) """
+
+        request = urllib.request.Request(url, headers={
+            'User-Agent': USER_AGENT, 'Accept': 'text/html,*/*;q=0.5'})
+        with self._guard:
+            slot = self._hosts[urllib.parse.urlsplit(url).hostname or '']
+        try:
+            with slot, urllib.request.urlopen(
+                    request, timeout=self._timeout) as response:
+                kind = response.headers.get_content_type()
+                if kind not in ('text/html', 'application/xhtml+xml'):
+                    raise ArchiveError('not html: ' + kind)
+                page = response.read(MAX_PAGE_SIZE + 1)
+        except (http.client.HTTPException, OSError, ValueError) as error:
+            raise ArchiveError(str(getattr(error, 'reason', error)))
+        if len(page) > MAX_PAGE_SIZE:
+            raise ArchiveError('page larger than 20 MB')
+        descriptor, path = tempfile.mkstemp(suffix='.html',
+                                            dir=self._tempdir)
+        with os.fdopen(descriptor, 'wb') as html_file:
+            html_file.write(page)
+        title = _TITLE_RE.search(page)
+        if title:
+            title = html.unescape(title.group(1).decode('utf-8', 'replace'))
+        return path, title
+
+    def _fields(self, url, title):    # {{{2
+
+        """ fields of the output path template for url """
+
+        parts = urllib.parse.urlsplit(url)
+        name = os.path.splitext(os.path.basename(parts.path.rstrip('/')))[0]
+        name = _slug(name) or 'index'
+        return {'downloads': DOWNLOAD_DIR, 'date': self._date,
+                'host': _slug(parts.hostname or '') or 'unknown',
+                'name': name,
+                'title': _slug(title or '')[:80].strip('-') or name}
+
+    def _target(self, url, title):    # {{{2
+
+        """ unused output path for url, from the template """
+
+        path = os.path.expanduser(_fill_template(
+            self._dest, self._fields(url, title)))
+        base, extension = os.path.splitext(path)
+        with self._guard:
+            count = 1
+            while path in self._claimed or os.path.exists(path):
+                count += 1
+                path = '{0}-{1}{2}'.format(base, count, extension)
+            self._claimed.add(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _archive(self, url, pool):    # {{{2
+
+        """ fetch and convert url, returning the saved path """
+
+        html_path, title = self._fetch(url)
+        try:
+            if self._page_archive:
+                return self._store(url, title, html_path, pool)
+            path = self._target(url, title)
+            plain = pool.convert(html_path, path)
+        finally:
+            os.remove(html_path)
+        saved_pages.record(path, url=url, title=title)
+        return path + (' ({0})'.format(plain) if plain else '')
+
+    def _store(self, url, title, html_path, pool):    # {{{2
+
+        """ convert html_path and store it in the page archive,
+        returning the blob path """
+
+        markdown_path = os.path.splitext(html_path)[0] + '.md'
+        try:
+            plain = pool.convert(html_path, markdown_path)
+            with open(markdown_path, 'rb') as markdown:
+                data = markdown.read()
+        finally:
+            if os.path.exists(markdown_path):
+                os.remove(markdown_path)
+        name = os.path.basename(_fill_template(self._dest,
+                                               self._fields(url, title)))
+        try:
+            entry, new = self._page_archive.store(data, name=name, url=url,
+                                                  title=title)
+        except page_archive.ArchiveError as error:
+            raise ArchiveError(str(error))
+        path = self._page_archive.blob_path(entry.digest)
+        saved_pages.record(path, url=url, title=title)
+        result = path if new else path + ' (already archived)'
+        return result + (' ({0})'.format(plain) if plain else '')
+
+    def _log(self, url, result):    # {{{2
+
+        """ record the outcome for url in the log """
+
+        with open(LOG_FILE, 'a', encoding='utf-8') as log:
+            log.write('\t'.join((time.strftime('%Y-%m-%d %H:%M:%S'), url,
+                                 result)) + '\n')
+
+    def run(self):    # {{{2
+
+        """ archive queued urls, returning the tally of outcomes """
+
+        self._tempdir = tempfile.mkdtemp(prefix='qutebrowser_archive_')
+        pending = set()
+        seen = set()
+        idle_since = None
+        try:
+            with ConverterPool(self._converters) as pool, \
+                    concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self._jobs) as executor:
+                while True:
+                    last = (not pending and idle_since is not None
+                            and time.monotonic() - idle_since >= GRACE)
+                    for url in self._queue.take(last=last):
+                        if url not in seen:
+                            seen.add(url)
+                            future = executor.submit(self._archive, url, pool)
+                            future.url = url
+                            pending.add(future)
+                    if last and not pending:
+                        break
+                    if not pending:
+                        idle_since = idle_since or time.monotonic()
+                        time.sleep(0.2)
+                        continue
+                    idle_since = None
+                    done, pending = concurrent.futures.wait(
+                        pending, timeout=1,
+                        return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        # pylint: disable=broad-except
+                        try:
+                            self._log(future.url, future.result())
+                            self._tally['saved'] += 1
+                        except (ArchiveError, OSError) as error:
+                            self._log(future.url, 'failed: ' + str(error))
+                            self._tally['failed'] += 1
+                        except Exception as error:
+                            # a page the converter chokes on, or a bug,
+                            # fails that page only
+                            self._log(future.url, 'failed: {0}: {1}'.format(
+                                type(error).__name__, error))
+                            self._tally['failed'] += 1
+                    if self._progress:
+                        self._progress('Archived {0}/{1} pages'.format(
+                            self._tally['saved'] + self._tally['failed'],
+                            len(seen)))
+        finally:
+            shutil.rmtree(self._tempdir, ignore_errors=True)
+        return self._tally
+
+
+def _fill_template(template, fields):    # {{{1
+    # template filled in with fields; raises ArchiveError if it names a
+    # field there is not, or is otherwise not a valid template
+    try:
+        return template.format(**fields)
+    except KeyError as error:
+        raise ArchiveError('template {0!r} has unknown field {1}'.format(
+            template, error))
+    except (AttributeError, IndexError, TypeError, ValueError) as error:
+        raise ArchiveError('template {0!r} is invalid: {1}'.format(
+            template, error))
+
+
+def _slug(text):    # {{{1
+
+    """ text made safe for use in a file name """
+
+    return _UNSAFE_RE.sub('-', text).strip('-.')
+
+
+def read_bookmarks(path):    # {{{1
+
+    """ http(s) urls of the bookmarks file """
+
+    with open(path, encoding='utf-8') as marks:
+        urls = [line.split(' ', 1)[0].strip() for line in marks]
+    return [url for url in urls if url.startswith(('http://', 'https://'))]
+
+
+def read_session(path):    # {{{1
+
+    """ current url of each tab of a saved qutebrowser session
+
+    reads just enough of the yaml session format: the entries
+    of each 'history' list, of which the one marked active (or
+    else the last) is the page the tab shows
+    """
+
+    tabs = []
+    history = None
+    indent = None
+    with open(path, encoding='utf-8') as session:
+        for line in session:
+            text = line.lstrip(' ')
+            depth = len(line) - len(text)
+            if text.startswith(('history:', '- history:')):
+                history = []
+                indent = depth + text.index('history:')
+                tabs.append(history)
+                continue
+            if history is None:
+                continue
+            if text.startswith('- ') and depth == indent:
+                history.append({})
+                text, depth = text[2:], depth + 2
+            elif depth <= indent:
+                history = None
+                continue
+            if depth == indent + 2 and history:
+                key, _, value = text.rstrip('\n').partition(':')
+                value = value.strip()
+                if value[:1] == "'":
+                    value = value[1:-1].replace("''", "'")
+                history[-1][key] = value
+    urls = []
+    for history in tabs:
+        current = [entry for entry in history if entry.get('active') == 'true']
+        entry = (current or history or [{}])[-1]
+        if entry.get('url', '').startswith(('http://', 'https://')):
+            urls.append(entry['url'])
+    return urls
+
+
+class ArchivePages(object):    # {{{1
+
+    # class docstring    {{{2
+    """ queue urls for archiving, and archive them if no one else is
+
+    usage:
+
+    archive = ArchivePages(args)
+    archive.run()
+    """
+
+    def __init__(self, args):    # {{{2
+
+        """ initialise variables """
+
+        self._args = args
+        self._fifo = qute_fifo.QuteFifo()
+
+    def _abort(self, message):    # {{{2
+
+        """ exit script on failure """
+
+        self._fifo.error(message)
+        sys.exit()
+
+    def _open_tabs(self):    # {{{2
+
+        """ urls of the open tabs, via a saved session """
+
+        data_dir = os.getenv('QUTE_DATA_DIR')
+        if not self._fifo.active or not data_dir:
+            self._abort('Saving open tabs only works from qutebrowser')
+        path = os.path.join(data_dir, 'sessions', SESSION_NAME + '.yml')
+        started = time.time()
+        self._fifo.send('session-save --quiet ' + SESSION_NAME)
+        self._fifo.flush()
+        # qutebrowser saves the session after reading the command
+        while time.time() - started < 10:
+            try:
+                if os.stat(path).st_mtime >= started - 1:
+                    time.sleep(0.2)    # let the write finish
+                    urls = read_session(path)
+                    os.remove(path)
+                    return urls
+            except OSError:
+                pass
+            time.sleep(0.1)
+        self._abort('Qutebrowser did not save the open tabs')
+
+    def run(self):    # {{{2
+
+        """ queue urls and archive them """
+
+        urls = list(self._args.urls)
+        if self._args.bookmarks:
+            try:
+                urls.extend(read_bookmarks(os.path.join(
+                    CONFIG_DIR, 'bookmarks', 'urls')))
+            except OSError as error:
+                self._abort('Unable to read bookmarks: ' + str(error))
+        if self._args.tabs:
+            urls.extend(self._open_tabs())
+        elif not urls and not self._args.bookmarks and os.getenv('QUTE_URL'):
+            urls.append(os.getenv('QUTE_URL'))
+        queue = UrlQueue()
+        queue.put(urls)
+        if not queue.claim():
+            return    # the running archiver takes the urls
+        self._fifo.info('Archiving pages in the background')
+        try:
+            store = (page_archive.Archive() if self._args.compressed
+                     else None)
+        except page_archive.ArchiveError as error:
+            self._abort(str(error))
+        archiver = Archiver(queue, dest=self._args.dest,
+                            jobs=self._args.jobs,
+                            converters=self._args.converters,
+                            progress=self._fifo.progress, archive=store)
+        tally = archiver.run()
+        if tally['failed']:
+            self._fifo.error('Archived {0} pages, {1} failed (see {2})'.format(
+                tally['saved'], tally['failed'], LOG_FILE))
+        else:
+            self._fifo.info('Archived {0} pages'.format(tally['saved']))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Qutebrowser userscript to save many pages as markdown')
+    parser.add_argument('--bookmarks', action='store_true',
+                        help='archive all http(s) bookmarks')
+    parser.add_argument('--tabs', action='store_true',
+                        help='archive the pages of all open tabs')
+    parser.add_argument('--dest', default=DEST_TEMPLATE,
+                        help='output path template (default: %(default)s)')
+    parser.add_argument('--compressed', action='store_true',
+                        help='store pages in the compressed archive of '
+                        'saved pages instead of files')
+    parser.add_argument('--jobs', type=int, default=8,
+                        help='pages fetched at once (default: %(default)s)')
+    parser.add_argument('--converters', type=int,
+                        help='converter processes (default: number of '
+                        'cpus, at most 4)')
+    parser.add_argument('urls', nargs='*',
+                        help="urls to archive (default: 'QUTE_URL')")
+    args = parser.parse_args()
+    # check the template now, not in the archiver, where every page
+    # would fail
+    try:
+        _fill_template(args.dest, dict.fromkeys(DEST_FIELDS, 'field'))
+    except ArchiveError as error:
+        parser.error('--dest: ' + str(error))
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    archive = ArchivePages(usage())
+    archive.run()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
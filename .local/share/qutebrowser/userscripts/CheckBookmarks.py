@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" qutebrowser userscript to find dead bookmarks
+
+This qutebrowser userscript is designed to be called from
+qutebrowser with a command like:
+'spawn --userscript CheckBookmarks.py', and can also be run
+from a terminal.
+
+Every http and https url in the bookmarks file ('bookmarks/urls'
+in the directory in environmental variable 'QUTE_CONFIG_DIR',
+which defaults to '~/.config/qutebrowser') is probed with a HEAD
+request. If the server rejects HEAD, or answers with an error,
+the url is requested again with GET, of which only the status is
+used. Each url is then classified as:
+
+* ok: the url, after any redirects, answered with a status
+  below 400
+* dead: the server answered 404 or 410, or the host name does
+  not resolve
+* unknown: any other error, e.g., a timeout, a refused
+  connection, an authorisation challenge or a server error
+
+Requests run concurrently in a bounded pool (default: 16 at a
+time). No more than two requests go to any one host at a time,
+and requests to the same host start at least half a second
+apart, so large sites that have many bookmarks are not hammered.
+
+Results are cached in
+$XDG_CACHE_HOME/qutebrowser/bookmark_health.json and reused for
+a week, so an interrupted or repeated check only probes the
+urls that have not been checked recently. A tab-separated report
+of 'status code url title' lines, dead urls first, is written to
+$XDG_CACHE_HOME/qutebrowser/bookmark_health.txt.
+
+Dead bookmarks can be dealt with in two ways:
+
+* '--prune' removes them. When run from qutebrowser this is
+  done with 'bookmark-del' commands, so qutebrowser's copy of
+  the bookmarks stays in step; otherwise the bookmarks file is
+  rewritten, after copying it to 'urls.bak'.
+* '--annotate' prefixes their titles with '[dead CODE]'. This
+  rewrites the bookmarks file, which qutebrowser would
+  overwrite, so it is only available outside qutebrowser.
+
+When run from qutebrowser, progress and the final tally are sent
+to qutebrowser's status line through the named pipe in
+environmental variable 'QUTE_FIFO', and the report is opened in
+a new tab.
+
+All paths can be overridden on the command line, so the checker
+can be exercised against a local http server, e.g.,
+'python3 -m http.server', and a scratch bookmarks file;
+../tools/bookmark_check_bench.py does so with fixture servers.
+"""
+
+# import statements    {{{1
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import json
+import os
+import shutil
+import socket
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import qute_fifo
+
+
+# constants    {{{1
+CONFIG_DIR = (os.getenv('QUTE_CONFIG_DIR')
+              or os.path.join(os.getenv('XDG_CONFIG_HOME')
+                              or os.path.join(os.path.expanduser('~'),
+                                              '.config'),
+                              'qutebrowser'))
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser')
+BOOKMARKS_FILE = os.path.join(CONFIG_DIR, 'bookmarks', 'urls')
+RESULTS_FILE = os.path.join(CACHE_DIR, 'bookmark_health.json')
+REPORT_FILE = os.path.join(CACHE_DIR, 'bookmark_health.txt')
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) '
+              'qutebrowser-bookmark-check/1.0')
+DEAD_CODES = (404, 410)
+STATUS_ORDER = {'dead': 0, 'unknown': 1, 'ok': 2}
+ANNOTATION = '[dead {0}] '
+
+
+Result = collections.namedtuple('Result',
+                                'status code reason final checked')
+
+
+class HostLimiter(object):    # {{{1
+
+    # class docstring    {{{2
+    """ limit the concurrency and request rate of each host
+
+    usage:
+
+    limiter = HostLimiter(per_host=2, interval=0.5)
+    async with limiter.slot('example.com'):
+        ...
+    """
+
+    def __init__(self, per_host=2, interval=0.5):    # {{{2
+
+        """ initialise variables """
+
+        self._per_host = per_host
+        self._interval = interval
+        self._slots = {}
+        self._next = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host):    # {{{2
+
+        """ wait for a free slot for host, spacing out request starts """
+
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self._per_host)
+        async with self._slots[host]:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class LinkChecker(object):    # {{{1
+
+    # class docstring    {{{2
+    """ probe urls concurrently, caching the results
+
+    usage:
+
+    checker = LinkChecker(concurrency=16, timeout=10)
+    results = asyncio.run(checker.check(urls, progress=callback))
+    """
+
+    def __init__(self, concurrency=16, per_host=2, interval=0.5,
+                 timeout=10, ttl=7 * 86400, cache_file=RESULTS_FILE):  # {{{2
+
+        """ initialise variables """
+
+        self._concurrency = concurrency
+        self._limiter = HostLimiter(per_host, interval)
+        self._timeout = timeout
+        self._ttl = ttl
+        self._cache_file = cache_file
+        self._cache = self._load()
+
+    def _load(self):    # {{{2
+
+        """ cached results that are still fresh
+
+        a cache that cannot be read, or a row in another format (e.g.,
+        written by an earlier version), counts as a miss
+        """
+
+        if not self._cache_file:
+            return {}
+        try:
+            with open(self._cache_file) as cache:
+                stored = json.load(cache)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(stored, dict):
+            return {}
+        cutoff = time.time() - self._ttl
+        fresh = {}
+        for url, values in stored.items():
+            if (isinstance(values, list)
+                    and len(values) == len(Result._fields)
+                    and isinstance(values[-1], (int, float))
+                    and values[-1] >= cutoff):
+                fresh[url] = Result(*values)
+        return fresh
+
+    def save(self):    # {{{2
+
+        """ write results to the cache """
+
+        if not self._cache_file:
+            return
+        os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
+        partial = self._cache_file + '.part'
+        with open(partial, 'w') as cache:
+            json.dump({url: list(result)
+                       for url, result in self._cache.items()}, cache)
+        os.replace(partial, self._cache_file)
+
+    def _request(self, url, method):    # {{{2
+
+        """ (code, reason, final url) of a blocking request
+
+        code is None if no http response was received
+        """
+
+        request = urllib.request.Request(
+            url, method=method, headers={'User-Agent': USER_AGENT,
+                                         'Accept': '*/*'})
+        try:
+            with urllib.request.urlopen(request,
+                                        timeout=self._timeout) as response:
+                return response.status, response.reason, response.geturl()
+        except urllib.error.HTTPError as error:
+            return error.code, str(error.reason), error.geturl()
+        except urllib.error.URLError as error:
+            reason = error.reason
+            if isinstance(reason, socket.gaierror) and reason.errno in (
+                    socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)):
+                return None, 'unresolved host', url
+            return None, str(reason), url
+        except (OSError, ValueError) as error:    # timeouts, bad urls
+            return None, str(error) or type(error).__name__, url
+
+    def _probe(self, url):    # {{{2
+
+        """ result of probing url with HEAD, then GET if need be """
+
+        code, reason, final = self._request(url, 'HEAD')
+        if code is None and reason in ('unresolved host', 'timed out'):
+            pass    # GET would fare no better
+        elif code is None or code >= 400:
+            code, reason, final = self._request(url, 'GET')
+        if code is not None and code < 400:
+            status = 'ok'
+        elif code in DEAD_CODES or reason == 'unresolved host':
+            status = 'dead'
+        else:
+            status = 'unknown'
+        return Result(status, code, reason,
+                      final if final != url else None, time.time())
+
+    async def _check_one(self, url, pool):    # {{{2
+
+        """ probe url within the pool and host limits
+
+        the host's slot is taken before the pool's, so that urls
+        waiting for a busy host do not hold pool slots other hosts
+        could use
+        """
+
+        host = urllib.parse.urlsplit(url).hostname or ''
+        async with self._limiter.slot(host), pool:
+            return url, await asyncio.to_thread(self._probe, url)
+
+    async def check(self, urls, progress=None):    # {{{2
+
+        """ map of url to Result for urls
+
+        cached results are reused; progress, if given, is called
+        with (done, total) after each url is probed
+        """
+
+        results = {url: self._cache[url] for url in urls
+                   if url in self._cache}
+        pending = [url for url in dict.fromkeys(urls) if url not in results]
+        # urllib blocks, so each request takes a worker thread
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._concurrency))
+        pool = asyncio.Semaphore(self._concurrency)
+        tasks = [asyncio.ensure_future(self._check_one(url, pool))
+                 for url in pending]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                url, result = await task
+                results[url] = self._cache[url] = result
+                if progress:
+                    progress(done, len(pending))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
+
+def read_bookmarks(path):    # {{{1
+
+    """ (url, title) tuples of the bookmarks file, in file order """
+
+    bookmarks = []
+    with open(path, encoding='utf-8') as marks:
+        for line in marks:
+            parts = line.rstrip('\n').split(' ', 1)
+            if parts[0]:
+                bookmarks.append((parts[0], parts[1] if len(parts) > 1
+                                  else ''))
+    return bookmarks
+
+
+def strip_annotation(title):    # {{{1
+
+    """ title without a '[dead CODE] ' prefix """
+
+    if title.startswith('[dead ') and '] ' in title:
+        return title.split('] ', 1)[1]
+    return title
+
+
+class CheckBookmarks(object):    # {{{1
+
+    # class docstring    {{{2
+    """ check bookmarks, report dead ones and optionally fix the file
+
+    usage:
+
+    check = CheckBookmarks(args)
+    check.run()
+    """
+
+    def __init__(self, args):    # {{{2
+
+        """ initialise variables """
+
+        self._args = args
+        self._fifo = qute_fifo.QuteFifo()
+
+    def _progress(self, done, total):    # {{{2
+
+        """ report progress, throttled """
+
+        self._fifo.progress('Checked {0}/{1} bookmarks'.format(done, total),
+                            final=done == total)
+
+    def _write_report(self, bookmarks, results):    # {{{2
+
+        """ write report of all checked bookmarks, dead ones first """
+
+        rows = sorted(((results[url], url, title) for url, title in bookmarks
+                       if url in results),
+                      key=lambda row: (STATUS_ORDER[row[0].status], row[1]))
+        os.makedirs(os.path.dirname(self._args.report) or '.', exist_ok=True)
+        with open(self._args.report, 'w', encoding='utf-8') as report:
+            for result, url, title in rows:
+                detail = result.reason or ''
+                if result.final:
+                    detail += ' -> ' + result.final
+                report.write('\t'.join((result.status,
+                                        str(result.code or '-'), url,
+                                        strip_annotation(title),
+                                        detail)) + '\n')
+
+    def _rewrite(self, bookmarks, results):    # {{{2
+
+        """ prune or annotate dead bookmarks in the bookmarks file """
+
+        lines = []
+        for url, title in bookmarks:
+            result = results.get(url)
+            dead = result is not None and result.status == 'dead'
+            if dead and self._args.prune:
+                continue
+            if self._args.annotate:
+                title = strip_annotation(title)
+                if dead:
+                    title = ANNOTATION.format(result.code or 'dns') + title
+            lines.append(url + (' ' + title if title else '') + '\n')
+        shutil.copyfile(self._args.bookmarks, self._args.bookmarks + '.bak')
+        partial = self._args.bookmarks + '.part'
+        with open(partial, 'w', encoding='utf-8') as marks:
+            marks.writelines(lines)
+        os.replace(partial, self._args.bookmarks)
+
+    def run(self):    # {{{2
+
+        """ check bookmarks and act on the results """
+
+        if self._fifo.active and self._args.annotate:
+            self._fifo.error('Annotating rewrites the bookmarks file, '
+                             'run CheckBookmarks.py outside qutebrowser')
+            sys.exit()
+        try:
+            bookmarks = read_bookmarks(self._args.bookmarks)
+        except OSError as error:
+            self._fifo.error('Unable to read bookmarks: ' + str(error))
+            sys.exit()
+        urls = [url for url, _ in bookmarks
+                if urllib.parse.urlsplit(url).scheme in ('http', 'https')]
+        checker = LinkChecker(
+            concurrency=self._args.concurrency,
+            per_host=self._args.per_host, interval=self._args.interval,
+            timeout=self._args.timeout, ttl=self._args.ttl * 3600,
+            cache_file=None if self._args.no_cache else self._args.cache)
+        try:
+            results = asyncio.run(checker.check(urls,
+                                                progress=self._progress))
+        finally:
+            checker.save()
+        self._write_report(bookmarks, results)
+        tally = collections.Counter(result.status
+                                    for result in results.values())
+        dead = [url for url in dict.fromkeys(urls)
+                if results[url].status == 'dead']
+        if dead and (self._args.prune or self._args.annotate):
+            if self._fifo.active:
+                # queued, and written to qutebrowser in one go
+                for url in dead:
+                    self._fifo.send('bookmark-del ' + qute_fifo.verbatim(url))
+            else:
+                self._rewrite(bookmarks, results)
+        summary = '{0} bookmarks: {1} ok, {2} dead, {3} unknown'.format(
+            len(urls), tally['ok'], tally['dead'], tally['unknown'])
+        if dead and self._args.prune:
+            summary += ' (dead pruned)'
+        elif dead and self._args.annotate:
+            summary += ' (dead annotated)'
+        if self._fifo.active:
+            self._fifo.send('open -t ' + qute_fifo.verbatim(
+                'file://' + self._args.report))
+        else:
+            print('Report: ' + self._args.report, file=sys.stderr)
+        self._fifo.info(summary)
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Qutebrowser userscript to find dead bookmarks')
+    parser.add_argument('--bookmarks', default=BOOKMARKS_FILE,
+                        help='bookmarks file (default: %(default)s)')
+    parser.add_argument('--cache', default=RESULTS_FILE,
+                        help='results cache (default: %(default)s)')
+    parser.add_argument('--report', default=REPORT_FILE,
+                        help='report file (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='probe every url, ignoring cached results')
+    parser.add_argument('--ttl', type=float, default=7 * 24,
+                        help='hours cached results stay valid '
+                        '(default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='requests in flight (default: %(default)s)')
+    parser.add_argument('--per-host', type=int, default=2,
+                        help='requests in flight per host '
+                        '(default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='seconds between requests to the same host '
+                        '(default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=10,
+                        help='seconds to wait for a response '
+                        '(default: %(default)s)')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--prune', action='store_true',
+                        help='remove dead bookmarks')
+    action.add_argument('--annotate', action='store_true',
+                        help="prefix titles of dead bookmarks with "
+                        "'[dead CODE]'")
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    check = CheckBookmarks(usage())
+    check.run()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" read and add to the compressed archive of saved pages
+
+SaveMarkdown.py, SaveMarkdown.sh and SaveText.sh, run with
+'--archive', and ArchivePages.py, run with '--compressed', store
+pages in a compressed, content-addressed archive instead of files,
+so that a page saved again, or from another url, takes no more
+space (see page_archive.py). This script reads the archive without
+mounting it, and is how the python 2 and shell scripts add to it:
+
+    PageArchive.py add [--name NAME] [--url URL] [--title TITLE] [FILE]
+    PageArchive.py list [TEXT]
+    PageArchive.py cat REF
+    PageArchive.py export DIR [TEXT]
+    PageArchive.py stats
+    PageArchive.py verify
+
+'add' stores FILE (default: stdin) and records it for
+SearchPages.py; 'list' shows the saves whose name, url or title
+contain TEXT; 'cat' writes a page to stdout, where REF is a hash,
+or its first characters, or the url or name of a save (the latest
+with that url or name); 'export' writes the latest save of each
+distinct page, or of those matching TEXT, to files in DIR;
+'stats' compares the archive's size with the files it replaces;
+'verify' checks every blob against its hash.
+"""
+
+# import statements    {{{1
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+import page_archive
+import saved_pages
+
+
+def _date(saved):    # {{{1
+
+    """ save time as a date and time """
+
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(saved))
+
+
+def _size(count):    # {{{1
+
+    """ byte count in readable units """
+
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if count < 1024 or unit == 'GB':
+            break
+        count /= 1024
+    return '{0:.1f} {1}'.format(count, unit) if unit != 'B' \
+        else '{0} B'.format(count)
+
+
+def _matches(entry, text):    # {{{1
+
+    """ whether entry's name, url or title contains text """
+
+    text = text.lower()
+    return any(text in field.lower()
+               for field in (entry.name, entry.url, entry.title))
+
+
+class PageArchive(object):    # {{{1
+
+    # class docstring    {{{2
+    """ command line interface to the page archive
+
+    usage:
+
+    cli = PageArchive(args)
+    cli.run()
+    """
+
+    def __init__(self, args):    # {{{2
+
+        """ initialise variables """
+
+        self._args = args
+        self._archive = page_archive.Archive(codec=args.codec)
+
+    def add(self):    # {{{2
+
+        """ store a page, printing its hash """
+
+        args = self._args
+        if args.file in (None, '-'):
+            data = sys.stdin.buffer.read()
+            name = args.name
+        else:
+            with open(args.file, 'rb') as page:
+                data = page.read()
+            name = args.name or os.path.basename(args.file)
+        if not data.strip():
+            raise page_archive.ArchiveError('Page is empty')
+        entry, new = self._archive.store(data, name=name, url=args.url,
+                                         title=args.title)
+        saved_pages.record(self._archive.blob_path(entry.digest),
+                           url=args.url, title=args.title)
+        print('Archived {0} as {1}{2}'.format(
+            entry.name or 'page', entry.digest[:12],
+            '' if new else ' (already archived)'))
+
+    def cat(self):    # {{{2
+
+        """ write a page to stdout """
+
+        entry = self._archive.resolve(self._args.ref)
+        sys.stdout.buffer.write(self._archive.read(entry.digest))
+
+    def export(self):    # {{{2
+
+        """ write the latest save of each distinct page to a file """
+
+        latest = {}
+        for entry in self._archive.entries():
+            if not self._args.text or _matches(entry, self._args.text):
+                latest[entry.digest] = entry
+        os.makedirs(self._args.dir, exist_ok=True)
+        for entry in sorted(latest.values()):
+            base, extension = os.path.splitext(
+                os.path.basename(entry.name) or entry.digest[:12] + '.md')
+            path = os.path.join(self._args.dir, base + extension)
+            count = 1
+            while os.path.exists(path):
+                count += 1
+                path = os.path.join(self._args.dir, '{0}-{1}{2}'.format(
+                    base, count, extension))
+            with open(path, 'wb') as page:
+                page.write(self._archive.read(entry.digest))
+            os.utime(path, (entry.saved, entry.saved))
+        print('Exported {0} pages to {1}'.format(len(latest), self._args.dir))
+
+    def list(self):    # {{{2
+
+        """ print the saves matching the text """
+
+        for entry in self._archive.entries():
+            if not self._args.text or _matches(entry, self._args.text):
+                print('{0}  {1}  {2}\n    {3}'.format(
+                    _date(entry.saved), entry.digest[:12],
+                    entry.title or entry.name, entry.url or '-'))
+
+    def stats(self):    # {{{2
+
+        """ print the archive's size, and the size of the files saved """
+
+        entries = self._archive.entries()
+        distinct = {entry.digest: entry.size for entry in entries}
+        stored = sum(os.path.getsize(path)
+                     for _, path in self._archive.blobs())
+        as_files = sum(entry.size for entry in entries)
+        print('{0} saves of {1} distinct pages in {2}'.format(
+            len(entries), len(distinct), self._archive.directory))
+        print('  saved as files:   {0}'.format(_size(as_files)))
+        print('  without repeats:  {0}'.format(_size(sum(distinct.values()))))
+        print('  archived:         {0}{1}'.format(
+            _size(stored), ' ({0:.1%})'.format(stored / as_files)
+            if as_files else ''))
+
+    def verify(self):    # {{{2
+
+        """ check every blob against its hash, exiting 1 if any fail """
+
+        failed = checked = 0
+        for digest, path in self._archive.blobs():
+            checked += 1
+            try:
+                data = page_archive.read_blob(path)
+            except (page_archive.ArchiveError, OSError) as error:
+                print(error)
+                failed += 1
+                continue
+            if hashlib.sha256(data).hexdigest() != digest:
+                print('Hash does not match content: ' + path)
+                failed += 1
+        missing = {entry.digest for entry in self._archive.entries()
+                   if not self._archive.blob_path(entry.digest)}
+        for digest in sorted(missing):
+            print('Missing blob of manifest entry: ' + digest)
+        print('Checked {0} blobs: {1} bad, {2} missing'.format(
+            checked, failed, len(missing)))
+        if failed or missing:
+            sys.exit(1)
+
+    def run(self):    # {{{2
+
+        """ run the command """
+
+        try:
+            getattr(self, self._args.command)()
+        except BrokenPipeError:
+            # output piped to, e.g., head, which has exited
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except (page_archive.ArchiveError, OSError) as error:
+            sys.exit(str(error))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Read and add to the compressed archive of saved pages')
+    parser.add_argument('--codec', choices=page_archive.EXTENSIONS,
+                        help='compression of new pages (default: zst if '
+                        'available, else xz)')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+    add = commands.add_parser('add', help='store a page')
+    add.add_argument('--name', default='',
+                     help='file name the page would be saved as')
+    add.add_argument('--url', default='', help='url of the page')
+    add.add_argument('--title', default='', help='title of the page')
+    add.add_argument('file', nargs='?', help='page to store (default: stdin)')
+    show = commands.add_parser('list', help='list saves')
+    show.add_argument('text', nargs='?',
+                      help='only saves whose name, url or title contain TEXT')
+    cat = commands.add_parser('cat', help='write a page to stdout')
+    cat.add_argument('ref', help='hash (or its start), url or name of a save')
+    export = commands.add_parser('export',
+                                 help='write distinct pages to files')
+    export.add_argument('dir', help='directory to write to')
+    export.add_argument('text', nargs='?',
+                        help='only pages whose name, url or title '
+                        'contain TEXT')
+    commands.add_parser('stats', help='show space saved')
+    commands.add_parser('verify', help='check blobs against their hashes')
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    try:
+        cli = PageArchive(args)
+    except page_archive.ArchiveError as error:
+        sys.exit(str(error))
+    cli.run()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
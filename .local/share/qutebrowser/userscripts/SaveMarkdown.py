@@ -17,6 +17,45 @@ variable is not set. The default file name is taken from the
 current page url, obtained from environmental variable
 'QUTE_URL', with the extension changed to 'md'.
 
+The converter can also be run without qutebrowser or a save
+dialog: '--input FILE [--output FILE]' converts a single file,
+and '--batch' converts each 'INPUT<TAB>OUTPUT' line read from
+stdin, answering with an 'ok<TAB>OUTPUT' or 'error<TAB>MESSAGE'
+line, so that one converter process can handle many pages.
+
+With '--archive', the markdown is stored in the compressed,
+content-addressed archive of saved pages (see PageArchive.py)
+instead of a file chosen with a save dialog, so a page saved again,
+or from another url, takes no more space.
+
+With '--incremental', a page saved to the same file before is
+converted only where it has changed, and the file rewritten only
+from the first change, using a record of the last conversion kept
+next to the file (see block_cache.py).
+
+Conversion runs within a time and memory budget, by default 60
+seconds and 2048 MB more than the script uses at start-up
+('--time-budget SECONDS', '--memory-budget MB', 0 for no limit),
+enforced in a separate process (see budget.py). A page that
+exceeds it (e.g., a single huge text node, a hundred thousand
+sibling elements, or very deep nesting) is saved as plain text
+instead, extracted in linear time (see html_text.py), with a
+warning.
+
+With '--pages', an article or thread split across pages is saved
+whole: its later pages, found by '<link rel="next">' or numbered
+page links, are fetched several at a time, through an on-disk http
+cache (see pagination.py and http_cache.py), converted in parallel,
+each within the budget, and saved after the current page, separated
+by horizontal rules, with footnotes numbered throughout.
+
+Tables become GitHub Flavored Markdown pipe tables (see
+markdown_table.py), unless they contain other tables, which are
+kept as html.
+
+Html entities are decoded, and curly quotes, dashes and ellipses
+are folded to plain ascii (see html_entities.py).
+
 Credit: began life as al3xandru's html2md
         (https://github.com/al3xandru/html2md),
         commit fe9c49c, 2015-02-21
@@ -25,21 +64,34 @@ Credit: began life as al3xandru's html2md
 # import statements    {{{1
 from __future__ import print_function
 import argparse
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import os
 import re
+import shutil
+import subprocess
 import sys
+import tempfile
 import wx
 
-from BeautifulSoup import ICantBelieveItsBeautifulSoup
-from BeautifulSoup import Tag, NavigableString, Declaration
-from BeautifulSoup import ProcessingInstruction, Comment
+import block_cache
+import budget
+from html_tree import Node, String, Declaration
+from html_tree import ProcessingInstruction, Comment
+import html_entities
+import html_text
+import html_tree
+import markdown_table
+import pagination
+import qute_fifo
+import saved_pages
 
 
 # constants    {{{1
 _KNOWN_ELEMENTS = ('a', 'b', 'strong', 'blockquote', 'br', 'center', 'code',
                    'dl', 'dt', 'dd', 'div', 'em', 'i', 'h1', 'h2', 'h3', 'h4',
                    'h5', 'h6', 'hr', 'img', 'li', 'ol', 'ul', 'p', 'pre',
-                   'tt', 'sup')
+                   'tt', 'sup', 'table')
 
 _PHRASING_ELEMENTS = ('abbr', 'audio', 'b', 'bdo', 'br', 'button', 'canvas',
                       'cite', 'code', 'command', 'datalist', 'dfn', 'em',
@@ -60,6 +112,19 @@ _SKIP_ELEMENTS = ('head', 'nav', 'menu', 'menuitem')
 
 LF = unicode(os.linesep)  # noqa: F821
 
+# default budget for converting a page: seconds, and megabytes of memory
+TIME_BUDGET = 60
+MEMORY_BUDGET = 2048
+
+# command storing a page read from stdin in the archive of saved pages
+ARCHIVE_COMMAND = os.getenv('PAGE_ARCHIVE') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'PageArchive.py')
+
+
+class ConversionError(Exception):    # {{{1
+
+    """ conversion failed in batch mode """
+
 
 # class SaveMarkdown(object)    {{{1
 class SaveMarkdown(object):
@@ -70,7 +135,10 @@ class SaveMarkdown(object):
     # pylint: disable=too-many-instance-attributes,too-many-statements
     # sticking with original design for now
 
-    def __init__(self):    # {{{2
+    def __init__(self, inpath=None, outpath=None,    # {{{2
+                 incremental=False, archive=False,
+                 time_budget=TIME_BUDGET, memory_budget=MEMORY_BUDGET,
+                 pages=False):
 
         # markdown converter variables #
 
@@ -80,9 +148,14 @@ class SaveMarkdown(object):
             'footnotes': True,       # convert footnotes*
             'fenced_code': True,     # fenced code output
             'critic_markup': False,  # support CriticMarkup
-            'def_list': True         # convert definition lists
+            'def_list': True,        # convert definition lists
+            'tables': True,          # convert tables to pipe tables
+            # typographic characters folded to ascii, by group
+            'fold': html_entities.DEFAULT_FOLDING
         }                            # * = custom markdown extension
+        self._fold = html_entities.folder(self._options['fold'])
         self._text_buffer = []  # maintains a buffer, usu. for block elements
+        self._text_parts = []  # reused by _text
         self._attributes_stack = []
         self._indentation_stack = []  # maintains a stack of indentation types
         self._inside_block = False
@@ -93,15 +166,37 @@ class SaveMarkdown(object):
         self._footnote_ref = 0
         self._set_processors()
         self._markdown = u''
+        self._tail = u''  # whitespace stripped from the end of the output
+        # incremental mode: cache of the last conversion, and counts of
+        # top-level chunks converted and in all
+        self._incremental = incremental
+        self._cache = None
+        self._chunks = (0, 0)
+        # archive mode: markdown is stored in the page archive, which
+        # reports where
+        self._archive = archive
+        self._archived = ''
+        # budget for the conversion, and why it was not converted if it
+        # exceeded it
+        self._time_budget = time_budget
+        self._memory_budget = memory_budget
+        self.fallback = None
+        # pages mode: the article's later pages are saved too; counts of
+        # pages saved, and errors fetching pages
+        self._pages = pages
+        self._page_count = 1
+        self._page_errors = []
 
         # qutebrowser interaction variables #
 
+        # batch mode: paths are given and errors are raised
+        self._batch = inpath is not None
         # message pipe
-        self._fifo = os.getenv('QUTE_FIFO')
-        if not self._fifo:
+        self._fifo = qute_fifo.QuteFifo()
+        if not self._fifo.active and not self._batch:
             self._abort('Missing environmental variable QUTE_FIFO')
         # input file path
-        self._inpath = os.getenv('QUTE_HTML')
+        self._inpath = inpath or os.getenv('QUTE_HTML')
         if not self._inpath:
             self._abort('Missing environmental variable QUTE_HTML')
         if not os.path.isfile(self._inpath):
@@ -113,14 +208,18 @@ class SaveMarkdown(object):
         # need to catch all errors because script is hidden
         try:
             with open(self._inpath, 'r') as filehandle:
-                self._html = filehandle.read()
+                html = filehandle.read()
         except IOError as err:
             io_errmsg = "I/O error({0}): {1}".format(err.errno, err.strerror)
             self._abort(io_errmsg)
         except:
             errmsg = "Unexpected error:", sys.exc_info()[0]
             self._abort(errmsg)
-        self._soup = ICantBelieveItsBeautifulSoup(self._html)
+        self._html = html
+        # output markdown file path
+        self._outpath = outpath or u''
+        if self._batch:
+            return
         # default download directory
         self._download_dir = os.getenv('QUTE_DOWNLOAD_DIR')
         if not self._download_dir:
@@ -140,28 +239,56 @@ class SaveMarkdown(object):
         if not download_base:
             download_base = 'output'
         self._download_file = download_base + '.md'
-        # output markdown file path
-        self._outpath = u''
 
     def generate_output(self):    # {{{2
 
-        """ generate markdown output """
+        """ generate markdown output
+
+        if the conversion exceeds its budget, the output is the page's
+        text, and fallback the reason
+        """
 
         if not self._processed:
-            self._process(self._soup)
-            if self._text_buffer:
-                self._flush_buffer()
+            if self._incremental and not self._outpath:
+                # before the conversion, which runs in another process
+                self._set_output_path()
+            if self._pages:
+                self._convert_pages()
+            else:
+                self._convert_page()
             self._processed = True
 
-        self._markdown = self._output.rstrip()
+        output = self._fold(self._output)
+        self._markdown = output.rstrip()
+        self._tail = output[len(self._markdown):]
 
     def success(self):    # {{{2
 
         """ exit script on success """
 
-        msg = 'Saved as ' + self._outpath
-        cmd = 'message-info "' + msg + '"'
-        self._send_command(cmd)
+        msg = self._archived or 'Saved as ' + self._outpath
+        if self._pages:
+            msg += ' ({0} page{1}{2})'.format(
+                self._page_count, '' if self._page_count == 1 else 's',
+                ', {0} not fetched: {1}'.format(
+                    len(self._page_errors), self._page_errors[0])
+                if self._page_errors else '')
+        if self.fallback:
+            msg += ' (plain text: {0})'.format(self.fallback)
+        elif self._cache and self._cache.unchanged:
+            msg += ' (unchanged)'
+        elif self._cache:
+            msg += ' ({0} of {1} blocks converted)'.format(*self._chunks)
+        if self._batch:
+            print(msg)
+            sys.exit()
+        if not self._archived:
+            saved_pages.record(self._outpath, url=os.getenv('QUTE_URL'),
+                               title=os.getenv('QUTE_TITLE'))
+        if self.fallback or self._page_errors:
+            self._fifo.warning(msg)
+        else:
+            self._fifo.info(msg)
         sys.exit()
 
     def write_output(self):    # {{{2
@@ -170,11 +297,18 @@ class SaveMarkdown(object):
 
         # pylint: disable=bare-except
         # need to catch all errors because script is hidden
-        self._set_output_path()
+        if self._archive:
+            self._archive_output()
+            return
+        if not self._outpath:
+            self._set_output_path()
         try:
-            with open(self._outpath, 'w') as filehandle:
-                filehandle.write(self._markdown.encode('utf8'))
-        except IOError as err:
+            if self._cache:
+                self._cache.write(self._markdown, self._tail)
+            else:
+                with open(self._outpath, 'w') as filehandle:
+                    filehandle.write(self._markdown.encode('utf8'))
+        except (IOError, OSError) as err:
             io_errmsg = "I/O error({0}): {1}".format(err.errno, err.strerror)
             self._abort(io_errmsg)
         except:
@@ -187,10 +321,32 @@ class SaveMarkdown(object):
         # in status bar by an exit status message, and the first message
         # remains visible for a fraction longer
 
-        cmd = 'message-error "' + message + '"'
-        self._send_command(cmd)
+        if self._batch:
+            raise ConversionError(message)
+        self._fifo.error(message)
         sys.exit()
 
+    def _archive_output(self):    # {{{2
+        # store markdown in the page archive, under the name it would
+        # have been saved as
+        name = (os.path.basename(self._outpath) if self._outpath
+                else self._download_file)
+        command = [ARCHIVE_COMMAND, 'add', '--name', name,
+                   '--url', os.getenv('QUTE_URL') or '',
+                   '--title', os.getenv('QUTE_TITLE') or '']
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+            output, errors = process.communicate(
+                self._markdown.encode('utf8'))
+        except OSError as err:
+            self._abort('Unable to run {0}: {1}'.format(
+                ARCHIVE_COMMAND, err.strerror))
+        if process.returncode:
+            self._abort(errors.strip() or 'Unable to archive page')
+        self._archived = output.strip()
+
     def _comment(self, tag):    # {{{2
         if not self._options['critic_markup']:
             return
@@ -198,6 +354,113 @@ class SaveMarkdown(object):
         self._text_buffer.append(tag)
         self._text_buffer.append(u"<<}")
 
+    def _convert(self):    # {{{2
+        # convert the page, returning the output and the incremental
+        # state, which the caller may be in another process
+        if self._incremental:
+            self._convert_chunks()
+        else:
+            # the compact tree the converter works on (see html_tree.py)
+            self._process(html_tree.parse(self._html))
+        if self._text_buffer:
+            self._flush_buffer()
+        return self._output, self._cache, self._chunks
+
+    def _convert_page(self):    # {{{2
+        # convert the page within the budget, or else extract its text
+        try:
+            self._output, self._cache, self._chunks = budget.run(
+                self._convert, seconds=self._time_budget,
+                megabytes=self._memory_budget)
+        except budget.BudgetError as err:
+            self.fallback = 'conversion ' + str(err)
+            self._cache = None
+            self._output = html_text.text(self._html)
+
+    def _convert_pages(self):    # {{{2
+        # fetch the article's later pages, convert them and this page in
+        # parallel, as each conversion runs in its own process, and join
+        # them, numbering footnotes on from those of the pages before
+        url = os.getenv('QUTE_URL')
+        if not url:
+            self._abort('Missing environmental variable QUTE_URL')
+        pages, self._page_errors = pagination.fetch_pages(self._html, url)
+        directory = tempfile.mkdtemp(prefix='qutebrowser_pages_')
+        try:
+            converters = [self]
+            for index, page in enumerate(pages):
+                path = os.path.join(directory, '{0}.html'.format(index))
+                with open(path, 'wb') as filehandle:
+                    filehandle.write(page.body)
+                converters.append(SaveMarkdown(
+                    inpath=path, time_budget=self._time_budget,
+                    memory_budget=self._memory_budget))
+            pool = ThreadPool(min(len(converters),
+                                  multiprocessing.cpu_count()))
+            try:
+                pool.map(SaveMarkdown._convert_page, converters)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        outputs, footnotes = [], 0
+        for converter in converters:
+            # pylint: disable=protected-access
+            output, count = _renumber_footnotes(converter._output,
+                                                footnotes)
+            outputs.append(output.strip())
+            footnotes += count
+        self._output = (LF * 2 + u'-----' + LF * 2).join(outputs) + LF
+        self._page_count = len(converters)
+        reasons = [u'page {0}: {1}'.format(number, converter.fallback)
+                   for number, converter in enumerate(converters, 1)
+                   if converter.fallback]
+        self.fallback = u'; '.join(reasons) or None
+
+    def _convert_chunks(self):    # {{{2
+        # convert the body chunk by chunk, copying the markdown of runs of
+        # chunks unchanged since the last save from the output file
+        cache = self._cache = block_cache.BlockCache(
+            self._outpath, self._html, self._options)
+        if cache.unchanged:
+            self._output = cache.markdown
+            return
+        html = html_tree.decode(self._html)
+        chunks = block_cache.split_body(html)
+        body = Node(u'body') if chunks is not None else None
+        if body is None:
+            chunks = [html]
+        digests = [block_cache.digest(chunk) for chunk in chunks]
+        index, run = 0, None
+        while index < len(chunks):
+            if run is None:
+                state = self._state()
+                found = cache.find(state, digests, index)
+                if found:
+                    text, count, end_state = found
+                    cache.record(state, digests[index:index + count], text,
+                                 end_state)
+                    self._output += text
+                    self._set_state(end_state)
+                    index += count
+                    continue
+                run = (index, state, len(self._output))
+            tree = html_tree.parse(chunks[index])
+            if body is None:
+                self._process(tree)
+            else:
+                for idx, child in enumerate(tree.contents):
+                    self._process_child(body, idx, child)
+            index += 1
+            if not (self._text_buffer or self._attributes_stack
+                    or self._indentation_stack):
+                start, state, offset = run
+                cache.record(state, digests[start:index],
+                             self._fold(self._output[offset:]), self._state())
+                run = None
+        self._chunks = (len(chunks) - cache.reused, len(chunks))
+
     def _elem_attrs(self, tag_name, attrs, sep):    # {{{2
         # process element attributes
         # pylint: disable=no-self-use
@@ -229,6 +492,20 @@ class SaveMarkdown(object):
         if self._text_buffer:
             self._write(''.join(self._text_buffer))
 
+    def _inline_text(self, tag):    # {{{2
+        # contents of tag converted on their own, as for a table cell:
+        # blocks inside it are written to the result, not the output
+        saved = (self._output, self._text_buffer, self._attributes_stack,
+                 self._indentation_stack, self._inside_block)
+        self._output, self._text_buffer = u'', []
+        self._attributes_stack, self._indentation_stack = [], []
+        self._inside_block = True
+        self._process(tag)
+        text = self._output + u''.join(self._text_buffer)
+        (self._output, self._text_buffer, self._attributes_stack,
+         self._indentation_stack, self._inside_block) = saved
+        return text
+
     def _is_empty(self, value):    # {{{2
         # pylint: disable=no-self-use
         # too difficult to move from object
@@ -243,17 +520,17 @@ class SaveMarkdown(object):
         # pylint: disable=no-self-use
         # too difficult to move from object
         for child in div_tag.contents:
-            if isinstance(child, (NavigableString, Comment)):
+            if isinstance(child, (String, Comment)):
                 continue
-            if isinstance(child, Tag) and child.name in _KNOWN_ELEMENTS:
+            if isinstance(child, Node) and child.name in _KNOWN_ELEMENTS:
                 continue
             return False
         return True
 
     def _proc(self, tag):    # {{{2
-        if isinstance(tag, Tag):
+        if isinstance(tag, Node):
             self._process_tag(tag)
-        elif isinstance(tag, NavigableString) and not self._is_empty(tag):
+        elif isinstance(tag, String) and not self._is_empty(tag):
             self._text_buffer.append(tag.strip('\n\r'))
 
     def _process(self, element):    # {{{2
@@ -270,16 +547,20 @@ class SaveMarkdown(object):
             self._text_buffer.append(txt)
             return
         for idx, tag in enumerate(element.contents):
-            if isinstance(tag, Tag):
-                self._process_tag(tag)
-            elif isinstance(tag, Comment):
-                self._comment(tag)
-            elif isinstance(tag, NavigableString) and not self._is_empty(tag):
-                txt = tag.strip('\n\r')
-                if idx == 0 and not _is_inline(element):
-                    self._text_buffer.append(txt.lstrip(' \t'))
-                else:
-                    self._text_buffer.append(txt)
+            self._process_child(element, idx, tag)
+
+    def _process_child(self, element, idx, tag):    # {{{2
+        # child number idx of element
+        if isinstance(tag, Node):
+            self._process_tag(tag)
+        elif isinstance(tag, Comment):
+            self._comment(tag)
+        elif isinstance(tag, String) and not self._is_empty(tag):
+            txt = tag.strip('\n\r')
+            if idx == 0 and not _is_inline(element):
+                self._text_buffer.append(txt.lstrip(' \t'))
+            else:
+                self._text_buffer.append(txt)
 
     def _process_footnotes(self, tag):    # {{{2
         # pylint: disable=too-many-branches
@@ -297,26 +578,26 @@ class SaveMarkdown(object):
 
             children = []
             for child in item.contents:
-                if isinstance(child, NavigableString):
+                if isinstance(child, String):
                     if not self._is_empty(child):
                         children.append(child)
-                elif isinstance(child, Tag):
+                elif isinstance(child, Node):
                     children.append(child)
             if (len(children) == 1
-                    and isinstance(children[0], Tag)
+                    and isinstance(children[0], Node)
                     and children[0].name == 'p'):
                 children = children[0].contents
             for child in children:
-                if isinstance(child, NavigableString):
+                if isinstance(child, String):
                     buffer_.append(child)
-                elif isinstance(child, Tag):
+                elif isinstance(child, Node):
                     if (child.name in ('a', 'b', 'strong', 'code', 'del',
                                        'em', 'i', 'img', 'tt')):
                         self._process_tag(child)
                         buffer_.extend(self._text_buffer)
                         self._text_buffer = []
                     else:
-                        buffer_.append(unicode(child))  # noqa: F821
+                        buffer_.append(self._text(child, escape=True))
 
             footnote = u''.join(buffer_).strip(' \n\r')
             if footnote.endswith('()'):
@@ -405,6 +686,8 @@ class SaveMarkdown(object):
             self._elements['ins'] = self._tag_ins
             self._elements['del'] = self._tag_del
             self._elements['u'] = self._tag_u
+        if self._options['tables']:
+            self._elements['table'] = self._tag_table
         if self._options['def_list']:
             self._elements['dl'] = self._tag_dl
             self._elements['dt'] = self._tag_dt
@@ -424,14 +707,10 @@ class SaveMarkdown(object):
                 self._abort('No download file path set')
             self._outpath = file_dialog.GetPath()
 
-    def _send_command(self, command):    # {{{2
-
-        # cannot open pipe in append mode ('a') because it
-        # causes the userscript to exit with status 1
-
-        fifo = open(self._fifo, 'w')
-        fifo.write(command)
-        fifo.close()
+    def _set_state(self, state):    # {{{2
+        # restore converter state saved by _state
+        (self._footnote_ref, self._inside_block, self._inside_footnote,
+         self._list_level) = state[:4]
 
     def _simple_attrs(self, attrs):    # {{{2
         # convert attributes to string
@@ -462,6 +741,12 @@ class SaveMarkdown(object):
                 attr_arr.append("%s=%s" % (key, value))
         return u"{{%s}}" % " ".join(attr_arr)
 
+    def _state(self):    # {{{2
+        # converter state carried from one top-level chunk to the next,
+        # when no text is pending
+        return [self._footnote_ref, self._inside_block, self._inside_footnote,
+                self._list_level, self._output.endswith(LF)]
+
     def _tag_a(self, tag):    # {{{2
         if tag.get('href'):
             self._text_buffer.append(u'[')
@@ -475,7 +760,7 @@ class SaveMarkdown(object):
             if attrs_str or tag.get('title'):
                 self._text_buffer.append(u' "')
                 if tag.get('title'):
-                    self._text_buffer.append(tag['title'])
+                    self._text_buffer.append(self._title(tag))
                     if attrs_str:
                         self._text_buffer.append(u' ')
                 if attrs_str:
@@ -504,7 +789,7 @@ class SaveMarkdown(object):
     def _tag_code(self, tag):    # {{{2
         # process <CODE> and <TT>
         self._text_buffer.append(u"`")
-        self._text_buffer.append(tag.getText())
+        self._text_buffer.append(self._text(tag))
         self._text_buffer.append(u"`")
 
     def _tag_center(self, tag):    # {{{2
@@ -519,15 +804,17 @@ class SaveMarkdown(object):
         self._indentation_stack.append('dd')
         self._process(tag)
         has_multi_dd = False
-        next_tag = tag.nextSibling
-        while next_tag:
-            if isinstance(next_tag, Tag):
-                if next_tag.name == 'dd':
-                    has_multi_dd = True
-                    break
-                else:
-                    break
-            next_tag = next_tag.nextSibling
+        # the next element in the parent, skipping text, which has no
+        # siblings of its own in the compact tree
+        following = iter(tag.parent.contents if tag.parent is not None
+                         else ())
+        for sibling in following:
+            if sibling is tag:
+                break
+        for sibling in following:
+            if isinstance(sibling, Node):
+                has_multi_dd = sibling.name == 'dd'
+                break
         if has_multi_dd:
             self._write_block(sep=LF)
         else:
@@ -543,10 +830,10 @@ class SaveMarkdown(object):
             # this is a very hacky solution
             self._text_buffer.append(u"{--")
             for child in reversed(tag.contents):
-                if isinstance(child, Tag):
+                if isinstance(child, Node):
                     child.append(u"--}")
                     break
-                if (isinstance(child, NavigableString)
+                if (isinstance(child, String)
                         and not self._is_empty(child)):
                     child += u"--}"
                     break
@@ -614,7 +901,7 @@ class SaveMarkdown(object):
         if attrs_str or tag.get('title'):
             self._text_buffer.append(u' "')
             if tag.get('title'):
-                self._text_buffer.append(tag['title'])
+                self._text_buffer.append(self._title(tag))
                 if attrs_str:
                     self._text_buffer.append(u' ')
             if attrs_str:
@@ -632,10 +919,10 @@ class SaveMarkdown(object):
             # this is a very hacky solution
             self._text_buffer.append(u"{++")
             for child in reversed(tag.contents):
-                if isinstance(child, Tag):
+                if isinstance(child, Node):
                     child.append(u"++}")
                     break
-                if (isinstance(child, NavigableString)
+                if (isinstance(child, String)
                         and not self._is_empty(child)):
                     child += u"++}"
                     break
@@ -655,18 +942,18 @@ class SaveMarkdown(object):
         else:
             elements = []
             for child in tag.contents:
-                if isinstance(child, Tag):
+                if isinstance(child, Node):
                     elements.append(child)
-                elif (isinstance(child, NavigableString)
+                elif (isinstance(child, String)
                       and not self._is_empty(child)):
                     elements.append(child)
             prev_was_text = False
             for child in elements:
-                if isinstance(child, NavigableString):
+                if isinstance(child, String):
                     self._text_buffer.append(child.strip())
                     prev_was_text = True
                     continue
-                if isinstance(child, Tag):
+                if isinstance(child, Node):
                     if child.name in ('blockquote', 'dl', 'ol', 'p', 'pre',
                                       'ul', 'h1', 'h2', 'h3', 'h4', 'h5',
                                       'h6'):
@@ -714,39 +1001,27 @@ class SaveMarkdown(object):
         self._push_attributes(tag=tag)
         self._inside_block = True
         self._indentation_stack.append('pre')
+        # code is taken as text, entities decoded, since it is not
+        # markdown; markup inside it, e.g., for syntax highlighting, is lost
+        code = self._text(tag).strip(' \t\n\r')
         _prefix = u''
         _suffix = u''
-        if self._options['fenced_code'] == 'github':
-            _prefix = u"```"
-            attrs = dict(tag.attrs)
-            if 'class' in attrs:
-                _prefix += attrs['class'].strip()
-            _prefix += LF
-            _suffix = LF + u"```"
+        fence = None
+        if self._options['fenced_code'] in (True, 'github'):
+            fence = u'```'
         elif self._options['fenced_code'] == 'php':
-            _prefix = u"~~~"
+            fence = u'~~~'
+        if fence:
+            # a fence must be longer than any run of its character inside
+            while fence in code:
+                fence += fence[0]
+            _prefix = fence
             attrs = dict(tag.attrs)
             if 'class' in attrs:
                 _prefix += attrs['class'].strip()
             _prefix += LF
-            _suffix = LF + u"~~~"
-
-        if tag.string:
-            (self._text_buffer.append(_prefix +
-                                      tag.renderContents().strip(' \t\n\r') +
-                                      _suffix))
-        else:
-            elements = ([child for child in tag.contents
-                         if isinstance(child, Tag)])
-            if len(elements) == 1 and elements[0].name == 'code':
-                (self._text_buffer.append(
-                    _prefix +
-                    elements[0].renderContents().strip(' \t\n\r') +
-                    _suffix))
-            else:
-                (self._text_buffer.append(_prefix +
-                                          tag.renderContents().strip(
-                                              ' \t\n\r') + _suffix))
+            _suffix = LF + fence
+        self._text_buffer.append(_prefix + code + _suffix)
         self._write_block(sep=LF*2)
         self._indentation_stack.pop()
         self._inside_block = False
@@ -759,25 +1034,90 @@ class SaveMarkdown(object):
 
     def _tag_sup(self, tag):    # {{{2
         _id = tag.get('id')
-        if not _id:
-            self._write(unicode(tag))  # noqa: F821
-            return
-        if _FOOTNOTE_REF_RE.match(_id):
+        if _id and _FOOTNOTE_REF_RE.match(_id):
             self._footnote_ref += 1
             self._text_buffer.append(u'[^%s]' % self._footnote_ref)
         else:
-            self._write(unicode(tag))  # noqa: F821
+            # markdown has no superscript, so it stays html, in line
+            self._text_buffer.append(
+                u'<sup>' + self._text(tag, escape=True) + u'</sup>')
+
+    def _table_line(self, line):    # {{{2
+        # a line of a pipe table, added to the block being built, if
+        # inside one, else written out
+        if self._inside_block:
+            self._text_buffer.extend((LF, line))
+        else:
+            self._write(line, sep=LF)
+
+    def _tag_table(self, tag):    # {{{2
+        # rows are converted and written one at a time, so a huge table
+        # is never held whole as cells or as markup, only as the tree
+        rows = []
+        columns = 0
+        for element in tag.recursiveChildGenerator():
+            if not isinstance(element, Node):
+                continue
+            if element.name == 'tr':
+                rows.append(element)
+                columns = max(columns, sum(span for _, span
+                                           in _cells(element)))
+            elif element.name == 'table':
+                # nested tables cannot be represented in a pipe table
+                self._write(unicode(tag), sep=LF * 2)  # noqa: F821
+                return
+        if not rows:
+            return
+        start = len(self._text_buffer)
+        # the first row is the header, which also sets alignment
+        table = markdown_table.MarkdownTable(
+            self._table_line, align=_alignments(rows[0]), columns=columns)
+        for row in rows:
+            cells = []
+            for child, span in _cells(row):
+                cells.append(self._inline_text(child))
+                cells.extend([u''] * (span - 1))
+            table.add_row(cells)
+        table.close()
+        if self._inside_block:
+            del self._text_buffer[start]    # line break before the header
+        else:
+            self._write(u'', sep=LF)
 
     def _tag_u(self, tag):    # {{{2
         self._text_buffer.append(u"{==")
         self._process(tag)
         self._text_buffer.append(u"==}{>><<}")
 
+    def _text(self, tag, escape=False):    # {{{2
+        # text of tag, collected in a single walk of its text nodes, with
+        # entities decoded as it goes and <br> as a line break; if escape
+        # is set, characters markdown would take as html are escaped
+        parts = self._text_parts
+        del parts[:]
+        for element in tag.recursiveChildGenerator():
+            if isinstance(element, String):
+                if isinstance(element, (Comment, Declaration,
+                                        ProcessingInstruction)):
+                    continue
+                parts.append(html_entities.decode(element))
+            elif element.name == 'br':
+                parts.append(LF)
+        text = u''.join(parts)
+        if escape:
+            text = text.replace(u'&', u'&amp;').replace(u'<', u'&lt;')
+        return text
+
+    def _title(self, tag):    # {{{2
+        # title attribute of tag, to go between double quotes; it is folded
+        # first, as folding the output would unescape a curly double quote
+        return self._fold(tag['title']).replace(u'"', u'\\"')
+
     def _write(self, value, sep=u''):    # {{{2
         if (value and value[0] == LF and self._output
                 and self._output[-1] == LF):
             value = value[len(LF):]
-        self._output += _entity2ascii(value) + sep
+        self._output += value + sep
 
     def _write_block(self, sep=u''):    # {{{2
         # pylint: disable=too-many-branches
@@ -836,28 +1176,34 @@ class SaveMarkdown(object):
         self._text_buffer = []
 
 
-def _entity2ascii(val):    # {{{1
-    for ent, asc in _ENTITY_DICT.items():
-        val = val.replace(ent, asc)
-    return val
+def _alignments(row):    # {{{1
+    # alignment of each column, from the attributes of a header row
+    aligns = []
+    for child, span in _cells(row):
+        align = (child.get('align') or u'').lower()
+        style = (child.get('style') or u'').replace(u' ', u'').lower()
+        if u'text-align:' in style:
+            align = style.split(u'text-align:')[1].split(u';')[0]
+        aligns.extend([align if align in ('left', 'right', 'center')
+                       else None] * span)
+    return aligns
 
 
-_ENTITY_DICT = {
-    '&#8212;': '--',
-    '&#8216;': "'",
-    '&#8217;': "'",
-    '&#8220;': '"',
-    '&#8221;': '"',
-    '&#8230;': '...',
-    u'…': '...',
-}
+def _cells(row):    # {{{1
+    # (cell, number of columns it spans) for each cell of a table row
+    for child in row.contents:
+        if not isinstance(child, Node) or child.name not in ('td', 'th'):
+            continue
+        span = child.get('colspan') or u'1'
+        yield child, (int(span) if span.isdigit() and 0 < int(span) < 100
+                      else 1)
 
 
 def _is_inline(element):    # {{{1
-    if (isinstance(element, (NavigableString, Declaration,
+    if (isinstance(element, (String, Declaration,
                              ProcessingInstruction, Comment))):
         return False
-    if (isinstance(element, Tag)
+    if (isinstance(element, Node)
             and (element.name in ('blockquote', 'center', 'dl', 'dt', 'dd',
                                   'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
                                   'li', 'ol', 'ul', 'p'))):
@@ -866,6 +1212,47 @@ def _is_inline(element):    # {{{1
 
 
 _FOOTNOTE_REF_RE = re.compile('fnr(ef)*')
+_FOOTNOTE_RE = re.compile(u'\\[\\^(\\d+)\\]')
+
+
+def _renumber_footnotes(markdown, offset):    # {{{1
+    # markdown with its footnotes (references and notes) numbered from
+    # offset + 1, and the number of footnotes it has
+    numbers = [int(number) for number in _FOOTNOTE_RE.findall(markdown)]
+    if not numbers or not offset:
+        return markdown, max(numbers or [0])
+    return (_FOOTNOTE_RE.sub(lambda match: u'[^{0}]'.format(
+        int(match.group(1)) + offset), markdown), max(numbers))
+
+
+def batch(incremental=False, time_budget=TIME_BUDGET,
+          memory_budget=MEMORY_BUDGET):    # {{{1
+
+    """ convert each 'input<TAB>output' line read from stdin
+
+    a page saved as plain text is answered with
+    'ok<TAB>OUTPUT<TAB>plain text: REASON'
+    """
+
+    # pylint: disable=broad-except
+    # one bad page must not stop the converter
+    for line in iter(sys.stdin.readline, ''):
+        inpath, _, outpath = line.rstrip('\n').partition('\t')
+        try:
+            save_md = SaveMarkdown(inpath=inpath, outpath=outpath,
+                                   incremental=incremental,
+                                   time_budget=time_budget,
+                                   memory_budget=memory_budget)
+            save_md.generate_output()
+            save_md.write_output()
+            if save_md.fallback:
+                print('ok\t{0}\tplain text: {1}'.format(
+                    outpath, save_md.fallback))
+            else:
+                print('ok\t' + outpath)
+        except Exception as err:
+            print('error\t' + ' '.join(str(err).split()))
+        sys.stdout.flush()
 
 
 def usage():    # {{{1
@@ -874,17 +1261,59 @@ def usage():    # {{{1
 
     parser = (argparse.ArgumentParser(
         description='Qutebrowser userscript to save current page as markdown'))
-    parser.parse_args()
+    parser.add_argument('--input', help='convert this html file instead '
+                        'of the current page')
+    parser.add_argument('--output', help='markdown file to write '
+                        '(default: input file with extension .md)')
+    parser.add_argument('--batch', action='store_true',
+                        help="convert 'INPUT<TAB>OUTPUT' lines from stdin")
+    parser.add_argument('--incremental', action='store_true',
+                        help='convert only what has changed since the page '
+                        'was last saved to the same file')
+    parser.add_argument('--archive', action='store_true',
+                        help='store the markdown in the archive of saved '
+                        'pages instead of a file')
+    parser.add_argument('--time-budget', type=float, default=TIME_BUDGET,
+                        metavar='SECONDS',
+                        help='time allowed for converting a page, or 0 '
+                        'for no limit (default: %(default)s)')
+    parser.add_argument('--memory-budget', type=int, default=MEMORY_BUDGET,
+                        metavar='MB',
+                        help='memory allowed for converting a page, or 0 '
+                        'for no limit (default: %(default)s)')
+    parser.add_argument('--pages', action='store_true',
+                        help="also save the article's later pages, found "
+                        'by next page or numbered page links')
+    args = parser.parse_args()
+    for option in ('archive', 'pages'):
+        if getattr(args, option) and (args.batch or args.incremental):
+            parser.error('--{0} cannot be used with --batch or '
+                         '--incremental'.format(option))
+    if args.input and not args.output:
+        args.output = os.path.splitext(args.input)[0] + '.md'
+    return args
 
 
 def main():    # {{{1
 
     """ script execution starts here """
 
-    usage()
-    save_md = SaveMarkdown()
-    save_md.generate_output()
-    save_md.write_output()
+    args = usage()
+    if args.batch:
+        batch(incremental=args.incremental, time_budget=args.time_budget,
+              memory_budget=args.memory_budget)
+        sys.exit()
+    try:
+        save_md = SaveMarkdown(inpath=args.input, outpath=args.output,
+                               incremental=args.incremental,
+                               archive=args.archive,
+                               time_budget=args.time_budget,
+                               memory_budget=args.memory_budget,
+                               pages=args.pages)
+        save_md.generate_output()
+        save_md.write_output()
+    except ConversionError as err:
+        sys.exit(str(err))
     save_md.success()
 
 
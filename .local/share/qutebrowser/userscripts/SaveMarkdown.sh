@@ -2,6 +2,10 @@
 # Qutebrowser userscript that converts the current page to markdown and saves
 # it to a filepath specified by the user.
 #
+# With argument '--archive', the output is stored in the compressed,
+# content-addressed archive of saved pages (see PageArchive.py) instead of a
+# file, and there is no save dialog.
+#
 # Suggested keybinding (for "save markdown"):
 # spawn --userscript SaveMarkdown.sh
 #     sm
@@ -27,6 +31,13 @@ MKTEMP="${MKTEMP:-mktemp}"
 RM="${RM:-rm}"
 # cp command
 CP="${CP:-cp}"
+# record of saved pages, read by SearchPages.py (see saved_pages.py)
+SAVED_PAGES="${XDG_CACHE_HOME:-$HOME/.cache}/qutebrowser/saved_pages.tsv"
+# page archive command
+PAGE_ARCHIVE="${PAGE_ARCHIVE:-$(dirname "$0")/PageArchive.py}"
+# store output in page archive instead of a file
+ARCHIVE=false
+[ "$1" = "--archive" ] && ARCHIVE=true
 # default file path
 FILE_NAME="$(basename "$QUTE_URL")"
 FILE_NAME_MD="${FILE_NAME%.*}.md"
@@ -75,13 +86,28 @@ required() {
         fi
     done
 }
+record() {
+    # record FILE
+    # - add FILE, with the page's url and title, to the record of saved pages;
+    #   tabs and newlines in url and title are replaced with spaces
+    local file="$1" url="${QUTE_URL//[$'\t\n']/ }"
+    local title="${QUTE_TITLE//[$'\t\n']/ }"
+    mkdir -p "$(dirname "$SAVED_PAGES")" 2> /dev/null || return 0
+    printf '%s\t%s\t%s\t%s\n' "$(date +%s)" "$file" "$url" "$title" \
+        >> "$SAVED_PAGES" 2> /dev/null || true
+}
 
 # requirements
 [ -d "$DOWNLOAD_DIR" ] || die "Download directory not found: $DOWNLOAD_DIR"
-required "$ZENITY" "$HTML2TEXT" "$SED" "$MKTEMP" "$RM" "$CP"
+if [ "$ARCHIVE" = true ] ; then
+    required "$PAGE_ARCHIVE" "$HTML2TEXT" "$SED" "$MKTEMP" "$RM" "$CP"
+else
+    required "$ZENITY" "$HTML2TEXT" "$SED" "$MKTEMP" "$RM" "$CP"
+fi
 
 # get download file path
-md_path="$( \
+md_path=''
+[ "$ARCHIVE" = true ] || md_path="$( \
     $ZENITY \
         --title 'Save as...' \
         --file-selection \
@@ -90,7 +116,7 @@ md_path="$( \
             --confirm-overwrite \
             --file-filter="*.md" \
     )" || true
-[ -n "$md_path" ] || die 'No download file path set'
+[ -n "$md_path" ] || [ "$ARCHIVE" = true ] || die 'No download file path set'
 
 # convert html file to temporary markdown file
 temp_file="$($MKTEMP --tmpdir qutebrowser_XXXXXXXX.md)"
@@ -113,6 +139,16 @@ replace "$temp_file" "–" "--" || true
 replace "$temp_file" "—" "--" || true
 replace "$temp_file" "…" "..." || true
 
+# store temp file in page archive, if requested
+if [ "$ARCHIVE" = true ] ; then
+    archived="$("$PAGE_ARCHIVE" add --name "$FILE_NAME_MD" --url "$QUTE_URL" \
+        --title "$QUTE_TITLE" "$temp_file" 2>&1)" \
+        || die "Unable to archive page: $archived"
+    $RM "$temp_file" || true
+    info "$archived"
+    exit 0
+fi
+
 # copy temp file to output file location
 if [ -f "$md_path" ];  then
     $RM "$md_path" || true
@@ -122,4 +158,5 @@ $CP "$temp_file" "$md_path" || true
 [ -f "${md_path}" ] || die "Unable to save $md_path"
 
 # if here then must have succeeded
+record "$md_path"
 info "Saved $md_path"
@@ -10,6 +10,10 @@
 # - replace default list marker, '^  • ', with markdown-style marker, '^* '
 #   (with sed)
 #
+# With argument '--archive', the output is stored in the compressed,
+# content-addressed archive of saved pages (see PageArchive.py) instead of a
+# file, and there is no save dialog.
+#
 # Suggested keybinding (for "save text"):
 # spawn --userscript SaveText.sh
 #     st
@@ -35,6 +39,13 @@ MKTEMP="${MKTEMP:-mktemp}"
 RM="${RM:-rm}"
 # cp command
 CP="${CP:-cp}"
+# record of saved pages, read by SearchPages.py (see saved_pages.py)
+SAVED_PAGES="${XDG_CACHE_HOME:-$HOME/.cache}/qutebrowser/saved_pages.tsv"
+# page archive command
+PAGE_ARCHIVE="${PAGE_ARCHIVE:-$(dirname "$0")/PageArchive.py}"
+# store output in page archive instead of a file
+ARCHIVE=false
+[ "$1" = "--archive" ] && ARCHIVE=true
 # default file path
 FILE_NAME="$(basename "$QUTE_URL")"
 FILE_NAME_TXT="${FILE_NAME%.*}.txt"
@@ -77,13 +88,28 @@ required() {
         fi
     done
 }
+record() {
+    # record FILE
+    # - add FILE, with the page's url and title, to the record of saved pages;
+    #   tabs and newlines in url and title are replaced with spaces
+    local file="$1" url="${QUTE_URL//[$'\t\n']/ }"
+    local title="${QUTE_TITLE//[$'\t\n']/ }"
+    mkdir -p "$(dirname "$SAVED_PAGES")" 2> /dev/null || return 0
+    printf '%s\t%s\t%s\t%s\n' "$(date +%s)" "$file" "$url" "$title" \
+        >> "$SAVED_PAGES" 2> /dev/null || true
+}
 
 # requirements
 [ -d "$DOWNLOAD_DIR" ] || die "Download directory not found: $DOWNLOAD_DIR"
-required "$ZENITY" "$W3M" "$SED" "$MKTEMP" "$RM" "$CP"
+if [ "$ARCHIVE" = true ] ; then
+    required "$PAGE_ARCHIVE" "$W3M" "$SED" "$MKTEMP" "$RM" "$CP"
+else
+    required "$ZENITY" "$W3M" "$SED" "$MKTEMP" "$RM" "$CP"
+fi
 
 # get download file path
-dl_path="$( \
+dl_path=''
+[ "$ARCHIVE" = true ] || dl_path="$( \
     $ZENITY \
         --title 'Save as...' \
         --file-selection \
@@ -92,7 +118,7 @@ dl_path="$( \
             --confirm-overwrite \
             --file-filter="*.txt" \
     )" || true
-[ -n "$dl_path" ] || die 'No download file path set'
+[ -n "$dl_path" ] || [ "$ARCHIVE" = true ] || die 'No download file path set'
 
 # convert html file to temporary text file
 temp_file="$($MKTEMP --tmpdir qutebrowser_XXXXXXXX.txt)"
@@ -105,6 +131,16 @@ $W3M -T "text/html" -o display_link_number=1 -O UTF-8 < "$QUTE_HTML" \
 # replace bullet list marker (U+2022 = "•") with markdown-style asterisk
 replace "$temp_file" '^[[:space:]]*•[[:space:]]*' '* ' || true
 
+# store temp file in page archive, if requested
+if [ "$ARCHIVE" = true ] ; then
+    archived="$("$PAGE_ARCHIVE" add --name "$FILE_NAME_TXT" --url "$QUTE_URL" \
+        --title "$QUTE_TITLE" "$temp_file" 2>&1)" \
+        || die "Unable to archive page: $archived"
+    $RM "$temp_file" || true
+    info "$archived"
+    exit 0
+fi
+
 # copy temp file to output file location
 if [ -f "$dl_path" ];  then
     $RM "$dl_path" || true
@@ -114,4 +150,5 @@ $CP "$temp_file" "$dl_path" || true
 [ -f "${dl_path}" ] || die "Unable to save $dl_path"
 
 # if here then must have succeeded
+record "$dl_path"
 info "Saved $dl_path"
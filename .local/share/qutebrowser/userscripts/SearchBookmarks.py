@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" qutebrowser userscript to fuzzy search bookmarks and quickmarks
+
+This qutebrowser userscript is designed to be called from
+qutebrowser with a command like:
+'spawn --userscript SearchBookmarks.py QUERY'.
+
+The bookmarks file ('bookmarks/urls', lines of 'url title') and the
+quickmarks file ('quickmarks', lines of 'name url') are read from the
+directory in environmental variable 'QUTE_CONFIG_DIR', which defaults
+to '~/.config/qutebrowser'. Their entries are kept in a persistent
+trigram index, $XDG_CACHE_HOME/qutebrowser/bookmarks.sqlite. When
+either file's mtime or size changes, only the added and removed
+entries are updated in the index.
+
+Each trigram of the urls and titles has one row in the index, holding
+the sorted ids of the entries that contain it as a packed array. A
+query is split into trigrams. An entry matches if it shares at least
+60% of the query's trigrams with its url and title, so small typos are
+tolerated. Entries with all of them are taken from the rarest posting
+list first, newest first, and if there are enough of them no partial
+match is looked for. Otherwise candidates are drawn from the posting
+lists of the rarest query trigrams only, and the remaining lists are
+only probed for those candidates, so common trigrams such as 'com'
+cost little. Texts are padded when indexed, so queries of one or two
+characters are looked up as prefixes of trigrams.
+
+If one entry matches, it is opened. If several match, a menu (rofi,
+otherwise zenity) offers the best of them. The url is opened by
+sending an 'open' command through the named pipe in environmental
+variable 'QUTE_FIFO'. When run outside qutebrowser, or with
+'--print', the matches are printed instead.
+"""
+
+# import statements    {{{1
+import argparse
+import array
+import bisect
+import collections
+import math
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+
+import qute_fifo
+
+
+# constants    {{{1
+CONFIG_DIR = (os.getenv('QUTE_CONFIG_DIR')
+              or os.path.join(os.getenv('XDG_CONFIG_HOME')
+                              or os.path.join(os.path.expanduser('~'),
+                                              '.config'),
+                              'qutebrowser'))
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser')
+INDEX_FILE = os.path.join(CACHE_DIR, 'bookmarks.sqlite')
+MATCH_RATIO = 0.6
+SCHEMA_VERSION = 2
+_SCHEME_RE = re.compile(r'^[a-z][a-z0-9+.-]*://(www\.)?')
+
+
+class BookmarkIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ persistent trigram index over bookmarks and quickmarks
+
+    usage:
+
+    index = BookmarkIndex()
+    index.update()
+    for url, title, score in index.search('qute docs'):
+        ...
+    """
+
+    def __init__(self, path=INDEX_FILE, config_dir=CONFIG_DIR):    # {{{2
+
+        """ open (creating if necessary) the index """
+
+        self._sources = {
+            os.path.join(config_dir, 'bookmarks', 'urls'): _parse_bookmark,
+            os.path.join(config_dir, 'quickmarks'): _parse_quickmark,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        if self._db.execute('PRAGMA user_version').fetchone()[0] \
+                != SCHEMA_VERSION:    # rebuild index of an older layout
+            self._db.executescript('''
+                DROP TABLE IF EXISTS sources;
+                DROP TABLE IF EXISTS marks;
+                DROP TABLE IF EXISTS grams;
+                PRAGMA user_version = %d;
+            ''' % SCHEMA_VERSION)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY, mtime REAL, size INTEGER);
+            CREATE TABLE IF NOT EXISTS marks (
+                id INTEGER PRIMARY KEY, source TEXT NOT NULL,
+                url TEXT NOT NULL, title TEXT NOT NULL, text TEXT NOT NULL,
+                UNIQUE (source, url, title));
+            CREATE TABLE IF NOT EXISTS grams (
+                gram TEXT PRIMARY KEY, ids BLOB NOT NULL) WITHOUT ROWID;
+        ''')
+
+    def update(self):    # {{{2
+
+        """ reindex the entries of source files that have changed
+
+        returns the number of entries added and removed
+        """
+
+        changes = 0
+        known = {path: (mtime, size) for path, mtime, size
+                 in self._db.execute('SELECT * FROM sources')}
+        for path, parse in self._sources.items():
+            try:
+                stat = os.stat(path)
+                state = (stat.st_mtime, stat.st_size)
+            except OSError:
+                state = (None, None)
+            if known.get(path) == state:
+                continue
+            entries = set()
+            if state[0] is not None:
+                with open(path, encoding='utf-8', errors='replace') as marks:
+                    for line in marks:
+                        entry = parse(line)
+                        if entry:
+                            entries.add(entry)
+            with self._db:
+                changes += self._sync(path, entries)
+                self._db.execute('INSERT OR REPLACE INTO sources '
+                                 'VALUES (?, ?, ?)', (path,) + state)
+        return changes
+
+    def _sync(self, source, entries):    # {{{2
+
+        """ make the indexed entries of source equal to entries """
+
+        indexed = {(url, title): mark_id for mark_id, url, title
+                   in self._db.execute('SELECT id, url, title FROM marks '
+                                       'WHERE source = ?', (source,))}
+        removed = [indexed[entry] for entry in set(indexed) - entries]
+        added = entries - set(indexed)
+        postings = collections.defaultdict(list)
+        for mark_id in removed:
+            text = ' '.join(self._db.execute(
+                'SELECT url, title FROM marks WHERE id = ?',
+                (mark_id,)).fetchone())
+            for gram in trigrams(text, padded=True):
+                postings[gram]
+        self._db.executemany('DELETE FROM marks WHERE id = ?',
+                             [(mark_id,) for mark_id in removed])
+        for url, title in sorted(added):
+            mark_id = self._db.execute(
+                'INSERT INTO marks (source, url, title, text) '
+                'VALUES (?, ?, ?, ?)',
+                (source, url, title, _normalise(url + ' ' + title))).lastrowid
+            for gram in trigrams(url + ' ' + title, padded=True):
+                postings[gram].append(mark_id)
+        gone = set(removed)
+        rows = []
+        for gram, new_ids in postings.items():
+            ids = self._postings(gram)
+            if gone:
+                ids = array.array('I', (x for x in ids if x not in gone))
+            ids.extend(new_ids)    # new ids are larger than existing ones
+            rows.append((gram, ids.tobytes()))
+        self._db.executemany('INSERT OR REPLACE INTO grams VALUES (?, ?)',
+                             rows)
+        self._db.execute('DELETE FROM grams WHERE ids = ?', (b'',))
+        return len(removed) + len(added)
+
+    def _postings(self, gram):    # {{{2
+
+        """ sorted array of the ids of the entries containing gram """
+
+        ids = array.array('I')
+        row = self._db.execute('SELECT ids FROM grams WHERE gram = ?',
+                               (gram,)).fetchone()
+        if row:
+            ids.frombytes(row[0])
+        return ids
+
+    def search(self, query, limit=20):    # {{{2
+
+        """ best matching entries as (url, title, score) tuples
+
+        score is the fraction of query trigrams found in the entry,
+        plus one if the query occurs in it verbatim
+        """
+
+        needle = _normalise(query)
+        grams = trigrams(query)
+        cap = limit * 10
+        if not grams:
+            return _ranked([(url, title, 1.0) for _, url, title, _
+                            in self._marks(self._prefixed(needle, cap))],
+                           limit)
+        lists = []
+        for _, blob in self._db.execute(
+                'SELECT gram, ids FROM grams WHERE gram IN (%s)'
+                % ','.join('?' * len(grams)), list(grams)):
+            ids = array.array('I')
+            ids.frombytes(blob)
+            lists.append(ids)
+        lists.sort(key=len)
+        best = {}
+        if len(lists) == len(grams):
+            # newest entries with every query trigram; partial matches
+            # score lower, so if there are enough of them, none can rank
+            for mark_id in reversed(lists[0]):
+                if all(_contains(ids, mark_id) for ids in lists[1:]):
+                    best[mark_id] = len(grams)
+                    if len(best) == cap:
+                        break
+        if len(best) < limit:
+            best = self._shared(lists, len(grams), cap)
+        results = []
+        for mark_id, url, title, text in self._marks(best):
+            score = best[mark_id] / len(grams)
+            if needle in text:
+                score += 1
+            results.append((url, title, score))
+        return _ranked(results, limit)
+
+    def _prefixed(self, prefix, cap):    # {{{2
+
+        """ ids of up to cap of the newest entries containing prefix
+
+        entries are padded when indexed, so every occurrence of a one
+        or two character prefix starts one of their trigrams
+        """
+
+        found = {}
+        for (blob,) in self._db.execute(
+                'SELECT ids FROM grams WHERE gram >= ? AND gram < ?',
+                (prefix, prefix + chr(0x10ffff))):
+            ids = array.array('I')
+            ids.frombytes(blob)
+            found.update(dict.fromkeys(ids[-cap:]))
+            if len(found) >= cap:
+                break
+        return sorted(found, reverse=True)[:cap]
+
+    @staticmethod
+    def _shared(lists, total, cap):    # {{{2
+
+        """ {id: shared trigrams} of up to cap of the best entries
+
+        lists are the sorted posting lists of the query trigrams,
+        rarest first, and total is the number of query trigrams
+        """
+
+        # an entry sharing 'need' of the query's trigrams must contain
+        # one of its total - need + 1 rarest trigrams
+        need = max(1, math.ceil(total * MATCH_RATIO))
+        split = total - need + 1
+        shared = collections.Counter()
+        for ids in lists[:split]:
+            shared.update(ids)
+        for ids in lists[split:]:
+            if len(ids) > 16 * len(shared):    # probe only candidates
+                shared.update([mark_id for mark_id in shared
+                               if _contains(ids, mark_id)])
+            else:
+                shared.update(shared.keys() & ids)
+        best = [(count, mark_id) for mark_id, count in shared.items()
+                if count >= need]
+        best.sort(reverse=True)
+        return dict((mark_id, count) for count, mark_id in best[:cap])
+
+    def _marks(self, ids):    # {{{2
+
+        """ (id, url, title, normalised text) of the given entries """
+
+        return self._db.execute(
+            'SELECT id, url, title, text FROM marks WHERE id IN (%s)'
+            % ','.join('?' * len(ids)), list(ids))
+
+
+def _contains(ids, mark_id):    # {{{1
+
+    """ whether the sorted array ids contains mark_id """
+
+    pos = bisect.bisect_left(ids, mark_id)
+    return pos < len(ids) and ids[pos] == mark_id
+
+
+def _ranked(results, limit):    # {{{1
+
+    """ best limit of (url, title, score) results, short urls first """
+
+    results.sort(key=lambda result: (-result[2], len(result[0])))
+    return results[:limit]
+
+
+def _normalise(text):    # {{{1
+
+    """ lowercase text without url scheme and redundant whitespace """
+
+    return ' '.join(_SCHEME_RE.sub('', text.lower()).split())
+
+
+def trigrams(text, padded=False):    # {{{1
+
+    """ set of three-character substrings of normalised text
+
+    if padded, the text is first extended by two characters that never
+    occur in a query, so that its last characters start trigrams too
+    """
+
+    text = _normalise(text) + ('\0\0' if padded else '')
+    return set(text[pos:pos + 3] for pos in range(len(text) - 2))
+
+
+def _parse_bookmark(line):    # {{{1
+
+    """ (url, title) from a bookmarks line of 'url title' """
+
+    parts = line.strip().split(' ', 1)
+    if not parts[0]:
+        return None
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+
+def _parse_quickmark(line):    # {{{1
+
+    """ (url, name) from a quickmarks line of 'name url' """
+
+    parts = line.strip().rsplit(' ', 1)
+    if len(parts) < 2:
+        return None
+    return parts[1], parts[0]
+
+
+class SearchBookmarks(object):    # {{{1
+
+    # class docstring    {{{2
+    """ search bookmarks and open the chosen one in qutebrowser
+
+    usage:
+
+    search = SearchBookmarks(query, target='tab')
+    search.run()
+    """
+
+    def __init__(self, query, target='tab', printing=False):    # {{{2
+
+        """ initialise variables """
+
+        self._query = query
+        self._open = {'tab': 'open -t ', 'window': 'open -w ',
+                      'current': 'open '}[target]
+        self._fifo = qute_fifo.QuteFifo(
+            path='' if printing else None)
+
+    def _abort(self, message):    # {{{2
+
+        """ exit script on failure """
+
+        self._fifo.error(message)
+        sys.exit()
+
+    def _choose(self, results):    # {{{2
+
+        """ let user pick one of results with a menu, returning url
+
+        returns the best result if no menu program is available
+        """
+
+        lines = ['{0}  {1}'.format(url, title) for url, title, _ in results]
+        if shutil.which('rofi'):
+            menu = ['rofi', '-dmenu', '-i', '-p', 'bookmark> ']
+        elif shutil.which('zenity'):
+            menu = ['zenity', '--list', '--title', 'Bookmarks',
+                    '--text', 'Matches for: ' + self._query,
+                    '--column', 'Bookmark', '--width', '900',
+                    '--height', '500']
+        else:
+            return results[0][0]
+        chosen = subprocess.run(menu, input='\n'.join(lines),
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout.strip()
+        return chosen.split('  ', 1)[0] if chosen else None
+
+    def run(self):    # {{{2
+
+        """ search index and open, or print, the matches """
+
+        start = time.perf_counter()
+        index = BookmarkIndex()
+        index.update()
+        indexed = time.perf_counter()
+        results = index.search(self._query)
+        searched = time.perf_counter()
+        if not self._fifo.active:
+            for url, title, score in results:
+                print('{0:5.2f}  {1}  {2}'.format(score, url, title))
+            print('[update {0:.2f} ms, search {1:.2f} ms]'.format(
+                (indexed - start) * 1000, (searched - indexed) * 1000),
+                  file=sys.stderr)
+            return
+        if not results:
+            self._abort('No bookmark matches ' + self._query)
+        url = (results[0][0] if len(results) == 1
+               else self._choose(results))
+        if url:
+            self._fifo.send(self._open + qute_fifo.verbatim(url))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Qutebrowser userscript to fuzzy search bookmarks')
+    parser.add_argument('--target', choices=('tab', 'window', 'current'),
+                        default='tab', help='where to open the bookmark')
+    parser.add_argument('--print', action='store_true', dest='printing',
+                        help='print matches instead of opening one')
+    parser.add_argument('query', nargs='+', help='search terms')
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    search = SearchBookmarks(' '.join(args.query), target=args.target,
+                             printing=args.printing)
+    search.run()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" qutebrowser userscript to search the text of saved pages
+
+This qutebrowser userscript is designed to be called from
+qutebrowser with a command like:
+'spawn --userscript SearchPages.py QUERY'.
+
+Pages saved by SaveMarkdown.py, SaveMarkdown.sh, SaveText.sh and
+ArchivePages.py are recorded, with the url and title of the page
+and the time it was saved, in a manifest (see saved_pages.py).
+Their text is kept in an SQLite FTS5 full-text index,
+$XDG_CACHE_HOME/qutebrowser/saved_pages.sqlite. Before each
+search, the manifest lines added since the last update are read,
+and only the files they name are indexed again, so a search costs
+a read of the new lines and a lookup in the index. A file holds
+the page last saved to it, and is indexed once; a page in the
+compressed archive is stored once however many urls it was saved
+from, and is indexed once for each of them, with that url's title
+and save time.
+
+Files saved in other ways are found by scanning directories for
+markdown and text files: '--scan [DIR ...]', by default the
+download directory in environmental variable 'QUTE_DOWNLOAD_DIR',
+or '$HOME/Downloads'. A scan also drops files that no longer
+exist. '--watch [DIR ...]' keeps the index current in the
+background, following the manifest and scanning again every ten
+minutes.
+
+All words of the query must occur in a page, and a word ending in
+'*' matches any word starting with it. With '--fts' the query is
+passed to FTS5 unchanged, for its phrase, NEAR, OR and column
+syntax. Matches are ranked by bm25, weighting title and url above
+the text.
+
+If one page matches, it is opened. If several match, a menu (rofi,
+otherwise zenity) offers the best of them, with a snippet of text
+around the query words. The saved file is opened, or with '--url'
+the page's original url where known, by sending an 'open' command
+through the named pipe in environmental variable 'QUTE_FIFO'. A
+page in the compressed archive of saved pages (see PageArchive.py)
+is opened through a plain copy of it, in
+$XDG_CACHE_HOME/qutebrowser/archived_pages. When run outside
+qutebrowser, or with '--print', the matches are printed instead.
+"""
+
+# import statements    {{{1
+import argparse
+import os
+import pathlib
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+
+import page_archive
+import qute_fifo
+import saved_pages
+
+
+# constants    {{{1
+CACHE_DIR = saved_pages.CACHE_DIR
+DOWNLOAD_DIR = (os.getenv('QUTE_DOWNLOAD_DIR')
+                or os.path.join(os.path.expanduser('~'), 'Downloads'))
+INDEX_FILE = os.path.join(CACHE_DIR, 'saved_pages.sqlite')
+# plain copies of archived pages, for opening
+VIEW_DIR = os.path.join(CACHE_DIR, 'archived_pages')
+EXTENSIONS = ('.md', '.markdown', '.txt')
+MAX_TEXT = 4 * 1024 * 1024    # characters of a file indexed
+SCHEMA_VERSION = 2
+WATCH_INTERVAL = 2    # seconds between manifest checks
+SCAN_INTERVAL = 600    # seconds between directory scans
+_WORD_RE = re.compile(r'\w+\*?')
+
+
+class SearchError(Exception):    # {{{1
+
+    """ index cannot be opened or queried """
+
+
+class PageIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ persistent full-text index over saved pages
+
+    usage:
+
+    index = PageIndex()
+    index.update()
+    for path, url, title, saved, snippet in index.search('fts5 rank'):
+        ...
+    """
+
+    def __init__(self, path=INDEX_FILE,
+                 manifest=saved_pages.MANIFEST):    # {{{2
+
+        """ open (creating if necessary) the index """
+
+        self._manifest = manifest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the watcher and searches may use the index at the same time
+        self._db = sqlite3.connect(path, timeout=10)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        if self._db.execute('PRAGMA user_version').fetchone()[0] \
+                != SCHEMA_VERSION:    # rebuild index of an older layout
+            self._db.executescript('''
+                DROP TABLE IF EXISTS state;
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS pages;
+                PRAGMA user_version = %d;
+            ''' % SCHEMA_VERSION)
+        try:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY, value);
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY, path TEXT NOT NULL,
+                    mtime REAL, size INTEGER, url TEXT NOT NULL,
+                    title TEXT NOT NULL, saved REAL, UNIQUE (path, url));
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5 (
+                    title, url, body, tokenize = 'porter unicode61');
+            ''')
+        except sqlite3.OperationalError as error:
+            raise SearchError('Cannot create index (SQLite needs FTS5): '
+                              + str(error))
+        if not self._db.execute("SELECT 1 FROM state WHERE key = 'rank'"
+                                ).fetchone():
+            with self._db:
+                self._db.execute("INSERT INTO pages (pages, rank) "
+                                 "VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')")
+                self._db.execute("INSERT INTO state VALUES ('rank', 1)")
+
+    def _state(self, key, default=None):    # {{{2
+
+        """ stored value of key """
+
+        row = self._db.execute('SELECT value FROM state WHERE key = ?',
+                               (key,)).fetchone()
+        return row[0] if row else default
+
+    def update(self):    # {{{2
+
+        """ index the pages added to the manifest since the last update
+
+        returns the number of pages indexed or removed
+        """
+
+        try:
+            stat = os.stat(self._manifest)
+        except OSError:
+            return 0
+        offset = self._state('offset', 0)
+        if stat.st_ino != self._state('inode') or stat.st_size < offset:
+            offset = 0    # a new manifest
+        if stat.st_size == offset:
+            return 0
+        with open(self._manifest, 'rb') as manifest:
+            manifest.seek(offset)
+            data = manifest.read()
+        # a line still being written is left for the next update
+        data = data[:data.rfind(b'\n') + 1]
+        latest = {}
+        for line in data.splitlines():
+            entry = saved_pages.parse(line)
+            if entry:
+                path, url = entry[1:3]
+                latest[(path, url) if page_archive.is_blob(path)
+                       else path] = entry
+        with self._db:
+            changes = sum(self._index(path, url, title, saved)
+                          for saved, path, url, title in latest.values())
+            self._db.executemany('INSERT OR REPLACE INTO state VALUES (?, ?)',
+                                 [('offset', offset + len(data)),
+                                  ('inode', stat.st_ino)])
+        return changes
+
+    def scan(self, directories):    # {{{2
+
+        """ index new and changed markdown and text files in directories
+
+        files indexed before that no longer exist are removed;
+        returns the number of pages indexed or removed
+        """
+
+        known = {path: (mtime, size) for path, mtime, size
+                 in self._db.execute('SELECT path, mtime, size FROM files')}
+        changes = 0
+        with self._db:
+            for directory in directories:
+                for root, dirs, names in os.walk(directory):
+                    dirs[:] = [name for name in dirs
+                               if not name.startswith('.')]
+                    for name in names:
+                        if (name.startswith('.')
+                                or not name.endswith(EXTENSIONS)):
+                            continue
+                        path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(path)
+                        except OSError:
+                            continue
+                        if known.pop(path, None) \
+                                != (stat.st_mtime, stat.st_size):
+                            changes += self._index(path)
+            # the rest are outside the directories, or gone
+            for path in known:
+                if not os.path.exists(path):
+                    changes += self._remove(path)
+        return changes
+
+    def watch(self, directories, interval=WATCH_INTERVAL,
+              scan_interval=SCAN_INTERVAL):    # {{{2
+
+        """ keep the index current until interrupted """
+
+        scanned = None
+        while True:
+            changes = 0
+            if scanned is None or time.monotonic() - scanned >= scan_interval:
+                changes += self.scan(directories)
+                scanned = time.monotonic()
+            changes += self.update()
+            if changes:
+                print('{0}  indexed or removed {1} pages'.format(
+                    time.strftime('%Y-%m-%d %H:%M:%S'), changes), flush=True)
+            time.sleep(interval)
+
+    def _index(self, path, url=None, title=None, saved=None):    # {{{2
+
+        """ add the page saved at path, or update it if it has changed
+
+        url, title and saved (the save time) default to those
+        already indexed, or for a new page to no url, the first line
+        of the text and the file's mtime; an archived page is indexed
+        separately for each url; returns 1 if the index changed, else 0
+        """
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self._remove(path)
+        if page_archive.is_blob(path):    # never changes, shared by urls
+            row = self._db.execute(
+                'SELECT id, mtime, size, url, title, saved FROM files '
+                'WHERE path = ? AND url = ?', (path, url or '')).fetchone()
+        else:
+            row = self._db.execute(
+                'SELECT id, mtime, size, url, title, saved FROM files '
+                'WHERE path = ?', (path,)).fetchone()
+        if row:
+            url, title, saved = url or row[3], title or row[4], saved or row[5]
+            if row[1:] == (stat.st_mtime, stat.st_size, url, title, saved):
+                return 0
+        try:
+            if page_archive.is_blob(path):
+                body = page_archive.read_blob(path)[:MAX_TEXT].decode(
+                    'utf-8', 'replace')
+            else:
+                with open(path, encoding='utf-8', errors='replace') as page:
+                    body = page.read(MAX_TEXT)
+        except (OSError, page_archive.ArchiveError):
+            return self._remove(path)
+        title = title or _first_line(body) or os.path.basename(path)
+        values = (stat.st_mtime, stat.st_size, url or '', title,
+                  saved or stat.st_mtime)
+        if row:
+            page_id = row[0]
+            self._db.execute('UPDATE files SET mtime = ?, size = ?, url = ?, '
+                             'title = ?, saved = ? WHERE id = ?',
+                             values + (page_id,))
+            self._db.execute('DELETE FROM pages WHERE rowid = ?', (page_id,))
+        else:
+            page_id = self._db.execute(
+                'INSERT INTO files (mtime, size, url, title, saved, path) '
+                'VALUES (?, ?, ?, ?, ?, ?)', values + (path,)).lastrowid
+        self._db.execute('INSERT INTO pages (rowid, title, url, body) '
+                         'VALUES (?, ?, ?, ?)', (page_id, title, url or '',
+                                                 body))
+        return 1
+
+    def _remove(self, path):    # {{{2
+
+        """ remove the page saved at path, returning the rows removed """
+
+        rows = self._db.execute('SELECT id FROM files WHERE path = ?',
+                                (path,)).fetchall()
+        self._db.executemany('DELETE FROM pages WHERE rowid = ?', rows)
+        self._db.executemany('DELETE FROM files WHERE id = ?', rows)
+        return len(rows)
+
+    def search(self, query, limit=20, fts=False):    # {{{2
+
+        """ best matching pages as (path, url, title, saved, snippet)
+
+        query is words to match, or with fts set an FTS5 query
+        """
+
+        if not fts:
+            query = fts_query(query)
+            if not query:
+                return []
+        try:
+            return self._db.execute('''
+                SELECT files.path, files.url, files.title, files.saved,
+                       hits.snippet
+                FROM (SELECT rowid, rank,
+                             snippet(pages, 2, '[', ']', '...', 12) AS snippet
+                      FROM pages WHERE pages MATCH ?
+                      ORDER BY rank LIMIT ?) AS hits
+                JOIN files ON files.id = hits.rowid
+                ORDER BY hits.rank''', (query, limit)).fetchall()
+        except sqlite3.OperationalError as error:
+            raise SearchError('Bad query: ' + str(error))
+
+
+def fts_query(text):    # {{{1
+
+    """ FTS5 query matching pages with all the words of text
+
+    each word is quoted, so it is taken literally; a word ending
+    in '*' is a prefix
+    """
+
+    terms = []
+    for word in _WORD_RE.findall(text):
+        prefix = word.endswith('*')
+        terms.append('"{0}"{1}'.format(word.rstrip('*'),
+                                       '*' if prefix else ''))
+    return ' '.join(terms)
+
+
+def _first_line(text):    # {{{1
+
+    """ first non-blank line of text, without heading markers """
+
+    for line in text[:4096].splitlines():
+        line = line.strip().lstrip('#').strip()
+        if line:
+            return line[:200]
+    return ''
+
+
+class SearchPages(object):    # {{{1
+
+    # class docstring    {{{2
+    """ search saved pages and open the chosen one in qutebrowser
+
+    usage:
+
+    search = SearchPages(query, target='tab')
+    search.run()
+    """
+
+    def __init__(self, query, target='tab', printing=False,
+                 url=False, fts=False):    # {{{2
+
+        """ initialise variables """
+
+        self._query = query
+        self._open = {'tab': 'open -t ', 'window': 'open -w ',
+                      'current': 'open '}[target]
+        self._url = url
+        self._fts = fts
+        self._fifo = qute_fifo.QuteFifo(
+            path='' if printing else None)
+
+    def _abort(self, message):    # {{{2
+
+        """ exit script on failure """
+
+        self._fifo.error(message)
+        sys.exit()
+
+    def _choose(self, results):    # {{{2
+
+        """ let user pick one of results with a menu, returning it
+
+        returns the best result if no menu program is available
+        """
+
+        rows = [(title, time.strftime('%Y-%m-%d', time.localtime(saved)),
+                 ' '.join(snippet.split()))
+                for _, _, title, saved, snippet in results]
+        if shutil.which('rofi'):
+            menu = ['rofi', '-dmenu', '-i', '-format', 'i',
+                    '-p', 'saved page> ']
+            lines = ['{0}  ({1})  {2}'.format(*row) for row in rows]
+        elif shutil.which('zenity'):
+            menu = ['zenity', '--list', '--title', 'Saved pages',
+                    '--text', 'Matches for: ' + self._query,
+                    '--column', '#', '--column', 'Page', '--column', 'Saved',
+                    '--column', 'Text', '--hide-column', '1',
+                    '--print-column', '1', '--width', '1000',
+                    '--height', '500']
+            lines = [field for number, row in enumerate(rows)
+                     for field in (str(number),) + row]
+        else:
+            return results[0]
+        chosen = subprocess.run(menu, input='\n'.join(lines),
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout.strip()
+        return results[int(chosen)] if chosen.isdigit() else None
+
+    def run(self):    # {{{2
+
+        """ search index and open, or print, the matches """
+
+        start = time.perf_counter()
+        try:
+            index = PageIndex()
+            index.update()
+            indexed = time.perf_counter()
+            results = index.search(self._query, fts=self._fts)
+        except SearchError as error:
+            self._abort(str(error))
+        searched = time.perf_counter()
+        if not self._fifo.active:
+            for path, url, title, saved, snippet in results:
+                print('{0}  {1}\n    {2}\n    {3}\n    {4}'.format(
+                    time.strftime('%Y-%m-%d', time.localtime(saved)), title,
+                    path, url or '-', ' '.join(snippet.split())))
+            print('[update {0:.2f} ms, search {1:.2f} ms]'.format(
+                (indexed - start) * 1000, (searched - indexed) * 1000),
+                  file=sys.stderr)
+            return
+        if not results:
+            self._abort('No saved page matches ' + self._query)
+        result = (results[0] if len(results) == 1
+                  else self._choose(results))
+        if result:
+            path, url = result[:2]
+            if self._url and url:
+                target = url
+            else:
+                if page_archive.is_blob(path):
+                    try:
+                        path = page_archive.extract(path, VIEW_DIR)
+                    except (OSError, page_archive.ArchiveError) as error:
+                        self._abort(str(error))
+                target = pathlib.Path(path).as_uri()
+            self._fifo.send(self._open + qute_fifo.verbatim(target))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Qutebrowser userscript to search saved pages')
+    parser.add_argument('--target', choices=('tab', 'window', 'current'),
+                        default='tab', help='where to open the page')
+    parser.add_argument('--print', action='store_true', dest='printing',
+                        help='print matches instead of opening one')
+    parser.add_argument('--url', action='store_true',
+                        help="open the page's original url, where known, "
+                        'instead of the saved file')
+    parser.add_argument('--fts', action='store_true',
+                        help='pass the query to FTS5 unchanged')
+    parser.add_argument('--scan', nargs='*', metavar='DIR',
+                        help='index markdown and text files in DIRs '
+                        '(default: download directory) and exit')
+    parser.add_argument('--watch', nargs='*', metavar='DIR',
+                        help='keep the index current, scanning DIRs '
+                        '(default: download directory), until interrupted')
+    parser.add_argument('query', nargs='*', help='search terms')
+    args = parser.parse_args()
+    if args.scan is None and args.watch is None and not args.query:
+        parser.error('search terms are required')
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    if args.scan is not None or args.watch is not None:
+        try:
+            index = PageIndex()
+            if args.watch is not None:
+                index.watch(args.watch or [DOWNLOAD_DIR])
+            changes = index.scan(args.scan or [DOWNLOAD_DIR])
+            changes += index.update()
+        except SearchError as error:
+            sys.exit(str(error))
+        except KeyboardInterrupt:
+            sys.exit()
+        print('Indexed or removed {0} pages'.format(changes))
+        return
+    search = SearchPages(' '.join(args.query), target=args.target,
+                         printing=args.printing, url=args.url, fts=args.fts)
+    search.run()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
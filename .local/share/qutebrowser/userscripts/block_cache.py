@@ -0,0 +1,266 @@
+# -*- coding: utf8 -*-
+
+# module docstring    {{{1
+""" blocks of a previous markdown conversion, for SaveMarkdown.py
+
+Re-saving a page saved before (living documents, changelogs) should
+only convert what has changed. In incremental mode, SaveMarkdown
+splits the body of the page into chunks, each a top-level element
+with any text before it ('split_body'), and converts them in order.
+The markdown of each run of chunks, up to a point where the
+converter holds no pending text, is recorded in a sidecar file next
+to the markdown file ('.NAME.md.blocks'), under a hash of the
+chunks' html and of the converter state the run started in.
+
+On the next save to the same file, a run whose hash is in the
+sidecar is copied from the markdown file, and its html is neither
+parsed nor converted; parsing is most of the cost of a conversion.
+The file is then rewritten from its first changed byte, and not at
+all if nothing changed. If the page itself is unchanged, nothing is
+parsed, converted or written.
+
+The sidecar is ignored, and every chunk converted, if the markdown
+file has changed since it was written (e.g., edited by hand), or the
+conversion options or the sidecar format differ.
+
+Splitting needs well-formed markup, as in the pages qutebrowser
+saves: every element closed, in order. If the body cannot be split
+so, 'split_body' returns None and the page is a single chunk.
+
+    cache = BlockCache(outpath, html, options)
+    if not cache.unchanged:
+        state = converter_state()
+        found = cache.find(state, digests, index)
+        ...
+        cache.record(state, digests[start:index], markdown, end_state)
+    cache.write(markdown, tail)
+"""
+
+# import statements    {{{1
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import re
+
+# constants    {{{1
+VERSION = 1
+# elements that have no end tag
+_VOID = frozenset(('area', 'base', 'basefont', 'bgsound', 'br', 'col',
+                   'embed', 'frame', 'hr', 'img', 'input', 'keygen', 'link',
+                   'meta', 'param', 'source', 'spacer', 'track', 'wbr'))
+_ATTRS = u'(?:"[^"]*"|\'[^\']*\'|[^\'">])*'
+_BODY = re.compile(u'<body\\b' + _ATTRS + u'>', re.I)
+# comments and the like, elements holding raw text, and tags
+_TOKEN = re.compile(
+    u'<!--.*?-->|<![^>]*>|<\\?[^>]*>'
+    u'|<(script|style|textarea)\\b' + _ATTRS + u'>.*?</\\1\\s*>'
+    u'|<(/?)([A-Za-z][^\\s/>]*)(' + _ATTRS + u')>', re.I | re.S)
+_END = re.compile(u'\\s*(</html\\s*>\\s*)?$', re.I)
+
+
+def digest(text):    # {{{1
+
+    """ binary hash of text """
+
+    if not isinstance(text, bytes):
+        text = text.encode('utf8')
+    return hashlib.sha1(text).digest()
+
+
+def sidecar_path(outpath):    # {{{1
+
+    """ path of the sidecar file of markdown file outpath """
+
+    directory, name = os.path.split(outpath)
+    return os.path.join(directory, '.' + name + '.blocks')
+
+
+def split_body(html):    # {{{1
+
+    """ list of the top-level chunks of the body of html, or None
+
+    a chunk is any text followed by an element, or text at the end
+    of the body; the chunks, joined, are the body's content
+    """
+
+    match = _BODY.search(html)
+    if not match:
+        return None
+    chunks = []
+    stack = []
+    start = match.end()
+    for token in _TOKEN.finditer(html, start):
+        closing, name = token.group(2), token.group(3)
+        if name is None:
+            # comment, declaration, processing instruction or raw text
+            pass
+        elif closing:
+            name = name.lower()
+            if not stack:
+                if name != 'body' or not _END.match(html, token.end()):
+                    return None
+                if start < token.start():
+                    chunks.append(html[start:token.start()])
+                return chunks
+            if stack.pop() != name:
+                return None
+        elif name.lower() not in _VOID and not token.group(4).endswith('/'):
+            stack.append(name.lower())
+        if not stack:
+            chunks.append(html[start:token.end()])
+            start = token.end()
+    return None
+
+
+def _common_prefix(old, new):    # {{{1
+    # length of the longest common prefix of strings old and new, found
+    # by bisection so that the comparisons are whole slices
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class BlockCache(object):    # {{{1
+
+    # class docstring    {{{2
+    """ blocks recorded when markdown file outpath was last written
+
+    usage:
+
+    cache = BlockCache(outpath, html, options)
+    found = cache.find(state, digests, index)
+    cache.record(state, digests[start:index], markdown, end_state)
+    cache.write(markdown, tail)
+    """
+
+    def __init__(self, outpath, html, options):    # {{{2
+
+        """ initialise variables, and read the sidecar of outpath
+
+        html is the page, and options the converter's options
+        """
+
+        self.path = outpath
+        self._sidecar = sidecar_path(outpath)
+        self._source = hashlib.sha1(digest(html)).hexdigest()
+        self._options = json.dumps(options, sort_keys=True)
+        # runs of the last save: {key: (markdown, chunks, end state)}
+        self._old = {}
+        self._longest = 0
+        # content of the markdown file, if the sidecar is valid
+        self._content = None
+        # runs of this save: [key, length, chunks, end state]
+        self._runs = []
+        self.unchanged = False
+        self.markdown = u''
+        self.reused = 0
+        self._load()
+
+    def find(self, state, digests, index):    # {{{2
+
+        """ the recorded run of chunks starting at index, or None
+
+        the run's chunks have digests from index on, and it started
+        in converter state; returns the run's markdown, its number
+        of chunks and the state it ended in
+        """
+
+        if not self._longest:
+            return None
+        key = hashlib.sha1(json.dumps(state).encode('ascii'))
+        for count, chunk in enumerate(digests[index:index + self._longest],
+                                      1):
+            key.update(chunk)
+            found = self._old.get(key.hexdigest())
+            if found and found[1] == count:
+                self.reused += count
+                return found
+        return None
+
+    def record(self, state, digests, markdown, end_state):    # {{{2
+
+        """ record a run of chunks, with their digests, and markdown
+
+        the run started in converter state and ended in end_state;
+        runs are recorded in order, and their markdown, joined, is
+        the start of the file's markdown
+        """
+
+        key = hashlib.sha1(json.dumps(state).encode('ascii'))
+        for chunk in digests:
+            key.update(chunk)
+        self._runs.append([key.hexdigest(), len(markdown), len(digests),
+                           end_state])
+
+    def write(self, markdown, tail=u''):    # {{{2
+
+        """ write markdown to the file, and record its runs
+
+        tail is whitespace stripped from the end of the markdown,
+        and the end of the last run; only the part of the file from
+        the first changed byte is written
+        """
+
+        if self.unchanged:
+            return
+        content = markdown.encode('utf8')
+        if self._content is None:
+            with open(self.path, 'wb') as filehandle:
+                filehandle.write(content)
+        elif content != self._content:
+            same = _common_prefix(self._content, content)
+            with open(self.path, 'r+b') as filehandle:
+                filehandle.seek(same)
+                filehandle.write(content[same:])
+                filehandle.truncate()
+        sidecar = {
+            'version': VERSION,
+            'options': self._options,
+            'source': self._source,
+            'markdown': hashlib.sha1(content).hexdigest(),
+            'tail': tail,
+            'runs': self._runs,
+        }
+        with open(self._sidecar + '.tmp', 'w') as filehandle:
+            json.dump(sidecar, filehandle)
+        os.rename(self._sidecar + '.tmp', self._sidecar)
+
+    def _load(self):    # {{{2
+
+        """ read the runs of the last save, if still valid """
+
+        try:
+            with open(self._sidecar) as filehandle:
+                sidecar = json.load(filehandle)
+            with open(self.path, 'rb') as filehandle:
+                content = filehandle.read()
+            if (sidecar['version'] != VERSION
+                    or sidecar['options'] != self._options
+                    or sidecar['markdown']
+                    != hashlib.sha1(content).hexdigest()):
+                return
+            text = content.decode('utf8')
+            if sidecar['source'] == self._source:
+                self.unchanged = True
+                self.markdown = text
+                return
+            text += sidecar['tail']
+            offset = 0
+            for key, length, count, end_state in sidecar['runs']:
+                self._old[key] = (text[offset:offset + length], count,
+                                  end_state)
+                offset += length
+                self._longest = max(self._longest, count)
+        except (EnvironmentError, ValueError, KeyError, TypeError):
+            self._old, self._longest = {}, 0
+            return
+        self._content = content
+
+# vim:fdm=marker:
@@ -0,0 +1,140 @@
+# module docstring    {{{1
+""" run a function within a time and memory budget, for SaveMarkdown.py
+
+A pathological page (a single huge text node, a hundred thousand
+sibling elements, or very deep nesting) can make the converter run
+for minutes or exhaust memory, and as the script runs hidden the
+user sees nothing. 'run' calls the function in a forked child
+process, whose address space is limited to what it has already
+plus the memory budget ('resource.RLIMIT_AS'), and which is killed
+if it has not finished within the time budget, however it is stuck
+(in python code, a regular expression or a C library). The result
+is returned to the parent pickled through a pipe, so it must be
+picklable.
+
+If the budget is exceeded, or the function fails, 'BudgetError' is
+raised with the reason, and the caller can fall back to something
+cheaper. Where there is no 'os.fork' or 'resource' (not Linux or
+another unix), or both budgets are zero, the function is simply
+called.
+
+    try:
+        result = budget.run(convert, seconds=60, megabytes=1024)
+    except budget.BudgetError as error:
+        result = cheap_convert()
+
+This module is shared by python 2 and 3 scripts.
+"""
+
+# import statements    {{{1
+import os
+import select
+import signal
+import time
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# constants    {{{1
+_MEMORY_EXIT = 3    # child exit status when out of memory
+
+
+class BudgetError(Exception):    # {{{1
+
+    """ function exceeded its budget, or failed """
+
+
+def _limit_memory(megabytes):    # {{{1
+    # limit the address space of this process to its current size plus
+    # megabytes, as libraries already mapped count against the limit
+    try:
+        with open('/proc/self/statm') as statm:
+            used = int(statm.read().split()[0]) * resource.getpagesize()
+    except (IOError, OSError, ValueError):
+        used = 0
+    limit = used + megabytes * 1024 * 1024
+    hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _child(function, megabytes, pipe):    # {{{1
+    # run function and write its pickled outcome to pipe; never returns
+    status = 0
+    try:
+        try:
+            if megabytes:
+                _limit_memory(megabytes)
+            outcome = (True, function())
+        except MemoryError:
+            raise
+        except Exception as error:    # pylint: disable=broad-except
+            outcome = (False, '{0}: {1}'.format(type(error).__name__, error))
+        data = pickle.dumps(outcome, 2)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(pipe, view):]
+    except MemoryError:
+        status = _MEMORY_EXIT
+    except BaseException:    # pylint: disable=broad-except
+        status = 1
+    finally:
+        os._exit(status)    # pylint: disable=protected-access
+
+
+def run(function, seconds=0, megabytes=0):    # {{{1
+
+    """ result of calling function, within the budget
+
+    seconds and megabytes are the time and additional memory
+    allowed, or zero for no limit; raises BudgetError if either is
+    exceeded, or function raises an exception
+    """
+
+    if not (seconds or megabytes) or not hasattr(os, 'fork') \
+            or resource is None:
+        return function()
+    reader, writer = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(reader)
+        _child(function, megabytes, writer)
+    os.close(writer)
+    deadline = time.time() + seconds if seconds else None
+    chunks = []
+    try:
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                    raise BudgetError(
+                        'took longer than {0:g} s'.format(seconds))
+            if select.select([reader], [], [], timeout)[0]:
+                chunk = os.read(reader, 1 << 20)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    finally:
+        os.close(reader)
+    status = os.waitpid(pid, 0)[1]
+    if os.WIFEXITED(status) and os.WEXITSTATUS(status) == _MEMORY_EXIT:
+        raise BudgetError('needed more than {0} MB'.format(megabytes))
+    if status or not chunks:
+        raise BudgetError('failed (status {0})'.format(status))
+    succeeded, result = pickle.loads(b''.join(chunks))
+    if not succeeded:
+        raise BudgetError('failed: ' + result)
+    return result
+
+# vim:fdm=marker:
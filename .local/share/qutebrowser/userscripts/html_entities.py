@@ -0,0 +1,275 @@
+# -*- coding: utf8 -*-
+
+# module docstring    {{{1
+""" decode html entities and fold typographic characters
+
+Shared by SaveMarkdown.py and html_tree.py, under python 2 or 3.
+
+'decode' replaces named and numeric character references with the
+characters they stand for, using the full HTML5 set of names and the
+HTML5 rules for numeric references (e.g., '&#151;', a Windows-1252
+code, is an em dash). Python 3 supplies the HTML5 names; python 2
+only knows the HTML 4 names, and imports the HTML5 set from
+html5_entities.py, generated from python 3's by
+
+    python3 html_entities.py --write-table
+
+'folder' returns a function that replaces typographic characters
+(curly quotes, dashes, ellipses, special spaces) with plain ascii,
+in a single pass over the text, however the characters were written
+in the page:
+
+    fold = html_entities.folder()
+    text = fold(html_entities.decode(u'&ldquo;Hi&rdquo; &#8212; bye'))
+    # text == u'"Hi" -- bye'
+
+The pass is a regular expression matching any of the characters,
+with a dictionary lookup per match: 'unicode.translate' with a
+table from 'fold_table' gives the same result, but looks up every
+character of the text in the table, and is slower on both pythons
+unless the text is all ascii.
+
+Run as a script, the module times these against the chain of
+replacements they superseded: 'python html_entities.py
+[--fragments N]'.
+"""
+
+# import statements    {{{1
+from __future__ import print_function
+
+import os
+import re
+
+try:
+    from html.entities import html5
+except ImportError:    # python 2
+    html5 = None
+
+try:
+    unichr
+except NameError:    # python 3
+    unichr = chr    # pylint: disable=redefined-builtin,invalid-name
+
+# constants    {{{1
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'html5_entities.py')
+# typographic characters replaced by each folding group
+FOLDING = {
+    'quotes': {
+        u'‘': u"'", u'’': u"'", u'‚': u"'", u'‛': u"'",
+        u'′': u"'", u'“': u'"', u'”': u'"', u'„': u'"',
+        u'‟': u'"', u'″': u'"',
+    },
+    'dashes': {
+        u'—': u'--', u'―': u'--', u'–': u'-', u'‒': u'-',
+        u'‐': u'-', u'‑': u'-', u'−': u'-',
+    },
+    'ellipsis': {
+        u'…': u'...',
+    },
+    'spaces': {
+        u' ': u' ', u' ': u' ', u' ': u' ', u' ': u' ',
+        u' ': u' ', u' ': u' ', u'​': u'', u'­': u'',
+    },
+}
+DEFAULT_FOLDING = ('quotes', 'dashes', 'ellipsis')
+_REFERENCE = re.compile(
+    u'&(#[xX][0-9a-fA-F]+|#[0-9]+|[A-Za-z][A-Za-z0-9]*);')
+_ESCAPES = {u'&': u'&amp;', u'<': u'&lt;', u'>': u'&gt;'}
+
+
+def _names():    # {{{1
+
+    """ {entity name: characters}, from python or html5_entities.py """
+
+    if html5 is not None:
+        return dict((name[:-1], chars) for name, chars in html5.items()
+                    if name.endswith(';'))
+    # pylint: disable=import-outside-toplevel
+    from html5_entities import NAMES as names
+    return names
+
+
+NAMES = _names()
+
+
+def _character(reference):    # {{{1
+
+    """ characters for reference (the text between '&' and ';') """
+
+    if reference[0] != u'#':
+        return NAMES.get(reference)
+    try:
+        code = (int(reference[2:], 16) if reference[1] in u'xX'
+                else int(reference[1:]))
+    except ValueError:
+        return None
+    if 0x80 <= code <= 0x9f:
+        # references to Windows-1252 codes, as HTML5 reads them
+        return bytearray([code]).decode('cp1252', 'ignore') or unichr(code)
+    if code == 0 or 0xd800 <= code <= 0xdfff or code > 0x10ffff:
+        return u'�'
+    try:
+        return unichr(code)
+    except ValueError:    # narrow python 2 build
+        return (u'\\U%08x' % code).encode('ascii').decode('unicode-escape')
+
+
+def _decoded(match):    # {{{1
+    # characters for a matched reference, or the reference if unknown
+    return _character(match.group(1)) or match.group(0)
+
+
+def _decoded_escaped(match):    # {{{1
+    # as _decoded, with characters markdown would take as html escaped
+    chars = _character(match.group(1))
+    if chars is None:
+        return match.group(0)
+    return _ESCAPES.get(chars, chars)
+
+
+def decode(text, escape=False):    # {{{1
+
+    """ text with entities replaced by the characters they stand for
+
+    with escape set, references to '&', '<' and '>' are left as
+    '&amp;', '&lt;' and '&gt;', so text that is markup-safe stays so
+    """
+
+    if u'&' not in text:
+        return text
+    return _REFERENCE.sub(_decoded_escaped if escape else _decoded, text)
+
+
+def fold_table(groups=DEFAULT_FOLDING):    # {{{1
+
+    """ translate table replacing the characters of folding groups """
+
+    table = {}
+    for group in groups:
+        for char, replacement in FOLDING[group].items():
+            table[ord(char)] = replacement
+    return table
+
+
+def folder(groups=DEFAULT_FOLDING):    # {{{1
+
+    """ function returning text with the characters of groups folded """
+
+    chars = dict((unichr(code), replacement)
+                 for code, replacement in fold_table(groups).items())
+    if not chars:
+        return lambda text: text
+    pattern = re.compile(u'[{0}]'.format(u''.join(sorted(chars))))
+
+    def fold(text):
+        return pattern.sub(lambda match: chars[match.group(0)], text)
+
+    return fold
+
+
+def _literal(text):    # {{{1
+    # ascii unicode literal of text, with \U escapes beyond the BMP, so
+    # narrow python 2 builds read them as surrogate pairs
+    chars = []
+    for char in text:
+        if u' ' <= char <= u'~' and char not in u"\\'":
+            chars.append(char)
+        elif ord(char) > 0xffff:
+            chars.append(u'\\U%08x' % ord(char))
+        else:
+            chars.append(u'\\u%04x' % ord(char))
+    return u"u'" + u''.join(chars) + u"'"
+
+
+def _write_table():    # {{{1
+
+    """ generate html5_entities.py, the HTML5 entity names for python 2 """
+
+    if html5 is None:
+        raise SystemExit('Only python 3 knows the HTML5 entity names')
+    lines = ['# generated from python 3\'s html.entities.html5 by',
+             '# \'python3 html_entities.py --write-table\', do not edit',
+             '',
+             '""" {entity name: characters} of the HTML5 named character '
+             'references """',
+             '',
+             'NAMES = {']
+    lines.extend('    {0}: {1},'.format(_literal(name), _literal(chars))
+                 for name, chars in sorted(NAMES.items()))
+    lines.append('}')
+    with open(TABLE_FILE + '.tmp', 'w') as table:
+        table.write('\n'.join(lines) + '\n')
+    os.rename(TABLE_FILE + '.tmp', TABLE_FILE)
+    print('Wrote {0} entity names to {1}'.format(len(NAMES), TABLE_FILE))
+
+
+def _bench():    # {{{1
+
+    """ time folding by pattern, translate table and replacements """
+
+    # pylint: disable=import-outside-toplevel
+    import argparse
+    import time
+    clock = getattr(time, 'perf_counter', time.time)
+    parser = argparse.ArgumentParser(
+        description='Time typographic folding of markdown output')
+    parser.add_argument('--fragments', type=int, default=100000,
+                        help='output fragments (default: %(default)s)')
+    parser.add_argument('--write-table', action='store_true',
+                        help='generate html5_entities.py for python 2')
+    args = parser.parse_args()
+    if args.write_table:
+        _write_table()
+        return
+    # the chain of replacements SaveMarkdown applied to each fragment
+    chain = {u'&#8212;': u'--', u'&#8216;': u"'", u'&#8217;': u"'",
+             u'&#8220;': u'"', u'&#8221;': u'"', u'&#8230;': u'...',
+             u'…': u'...'}
+    samples = [u'Plain text of a paragraph, with no special characters. ',
+               u'“Quoted” text — with a dash… ',
+               u'**bold**', u' ', u'[a link](http://example.com/page) ',
+               u'It’s 10–12 o’clock. ']
+    fragments = [samples[index % len(samples)]
+                 for index in range(args.fragments)]
+    table = fold_table()
+    fold = folder()
+
+    def replace_chain():
+        output = []
+        for fragment in fragments:
+            for entity, ascii_text in chain.items():
+                fragment = fragment.replace(entity, ascii_text)
+            output.append(fragment)
+        return u''.join(output)
+
+    def translate_each():
+        return u''.join(fragment.translate(table) for fragment in fragments)
+
+    def translate_once():
+        return u''.join(fragments).translate(table)
+
+    def fold_once():
+        return fold(u''.join(fragments))
+
+    for name, function in (('replace chain', replace_chain),
+                           ('translate each', translate_each),
+                           ('translate once', translate_once),
+                           ('fold once', fold_once)):
+        start = clock()
+        function()
+        elapsed = clock() - start
+        print('{0:15} {1} fragments: {2:8.1f} ms'.format(
+            name, args.fragments, elapsed * 1000))
+    text = u''.join(u'&ldquo;{0}&rdquo; &amp; &#8212;&hellip; '.format(index)
+                    for index in range(args.fragments // 10))
+    start = clock()
+    decode(text)
+    print('{0:15} {1} characters: {2:8.1f} ms'.format(
+        'decode', len(text), (clock() - start) * 1000))
+
+
+if __name__ == '__main__':
+    _bench()
+
+# vim:fdm=marker:
@@ -0,0 +1,142 @@
+# -*- coding: utf8 -*-
+
+# module docstring    {{{1
+""" plain text of an html page in linear time, for SaveMarkdown.py
+
+When converting a page to markdown exceeds its budget (see
+budget.py), SaveMarkdown saves the page's text instead. 'text'
+builds no tree and keeps no stack, so it cannot be made slow by
+nesting or by the number of elements: it scans the markup once,
+from one tag to the next, drops tags, comments, declarations and
+the content of script, style and head elements, starts a new
+paragraph at each block element and a new line at each <br>, and
+decodes entities.
+Every regular expression it uses matches in time linear in the
+text it scans, so a single huge text node, or a tag that is never
+closed, is no worse than a normal page of the same size. Text is
+added as it is found, a piece at a time, so the only copies of the
+page's text are the page itself and the result.
+
+    markdown = html_text.text(html)
+
+This module is shared by python 2 and 3 scripts.
+"""
+
+# import statements    {{{1
+import re
+
+import html_entities
+
+# constants    {{{1
+# elements whose content is not text
+_SKIP = frozenset(('head', 'script', 'style', 'template', 'noscript'))
+# elements that start a paragraph
+_BLOCK = frozenset(('address', 'article', 'aside', 'blockquote', 'dd',
+                    'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure',
+                    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+                    'section', 'table', 'tr', 'ul'))
+# the start of a comment, a declaration (e.g., doctype) or processing
+# instruction, or a tag; the lookahead keeps a failed match from
+# backtracking through the name, and attributes end at the next '<' or
+# '>', so a '<' that starts none of them is passed over at once
+_MARKUP = re.compile(u'<!--|<[!?][^<>]*>'
+                     u'|<(/?)([A-Za-z][\\w:.-]*)(?![\\w:.-])[^<>]*>')
+_PIECE = 1 << 16    # characters of text collapsed at once
+_ENTITY = 40    # longest character reference
+_SPACE = re.compile(u'\\s+', re.U)
+_TITLE = re.compile(u'<title\\b[^<>]*>([^<]*)<', re.I)
+
+
+def _decoded(markup):    # {{{1
+    # markup as unicode, if it is not already
+    if isinstance(markup, type(u'')):
+        return markup
+    try:
+        return markup.decode('utf-8')
+    except UnicodeDecodeError:
+        return markup.decode('windows-1252', 'replace')
+
+
+def _add_piece(parts, piece, breaks, space):    # {{{1
+    # add a piece of text to parts, with its entities decoded and its
+    # spaces collapsed, after the breaks (newlines) or space before it;
+    # returns the breaks and space before the next piece
+    piece = _SPACE.sub(u' ', html_entities.decode(piece))
+    words = piece.strip(u' ')
+    if not words:
+        return breaks, space or bool(piece)
+    if parts:
+        parts.append(u'\n' * min(breaks, 2) if breaks else
+                     u' ' if space or piece[0] == u' ' else u'')
+    parts.append(words)
+    return 0, piece[-1] == u' '
+
+
+def _add(parts, markup, start, stop, breaks, space):    # {{{1
+    # add the text markup[start:stop] to parts; collapsing spaces makes
+    # an object of each word, so a long text is added a piece at a time,
+    # cut after a space, or else before any entity near the cut
+    while start < stop:
+        end = stop
+        if stop - start > _PIECE:
+            end = max(markup.rfind(u' ', start, start + _PIECE),
+                      markup.rfind(u'\n', start, start + _PIECE)) + 1
+            if end <= start:
+                end = start + _PIECE
+                amp = markup.rfind(u'&', end - _ENTITY, end)
+                end = amp if amp > start else end
+        breaks, space = _add_piece(parts, markup[start:end], breaks, space)
+        start = end
+    return breaks, space
+
+
+def text(markup):    # {{{1
+
+    """ text of html markup, with a title heading if it has a title """
+
+    markup = _decoded(markup)
+    parts = []
+    title = _TITLE.search(markup)
+    if title and title.group(1).strip():
+        parts.append(u'# ' + u' '.join(
+            html_entities.decode(title.group(1)).split()))
+    # text is added as it is found, so no copy of the whole text is
+    # made but the result; breaks wait for the next text, as a run of
+    # them is one
+    breaks, space = 2, False
+    skip = None    # element whose content is being skipped
+    position = 0
+    for tag in _MARKUP.finditer(markup):
+        if tag.start() < position:
+            continue    # in a comment
+        if skip is None and tag.start() > position:
+            breaks, space = _add(parts, markup, position, tag.start(),
+                                 breaks, space)
+        if tag.group(0) == u'<!--':
+            position = markup.find(u'-->', tag.end())
+            position = len(markup) if position < 0 else position + 3
+            continue
+        position = tag.end()
+        closing, name = tag.group(1, 2)
+        if name is None:
+            continue    # a declaration or processing instruction
+        name = name.lower()
+        if skip is not None:
+            # the end tag of head may be left out
+            if (closing and name == skip) or (skip == 'head'
+                                              and name == 'body'):
+                skip = None
+        elif name in _SKIP:
+            if not closing and not tag.group(0).endswith(u'/>'):
+                skip = name
+        elif name in _BLOCK:
+            breaks = 2
+        elif name == 'br':
+            breaks += 1
+    if skip is None:
+        _add(parts, markup, position, len(markup), breaks, space)
+    parts.append(u'\n')
+    return u''.join(parts)
+
+# vim:fdm=marker:
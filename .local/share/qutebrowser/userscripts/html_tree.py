@@ -0,0 +1,340 @@
+# -*- coding: utf8 -*-
+
+# module docstring    {{{1
+""" compact html document tree for SaveMarkdown.py
+
+BeautifulSoup keeps a graph of large objects: each tag and each
+piece of text has a per-instance '__dict__' holding its parent,
+its siblings, the previous and next elements in the document, a
+copy of the parser's settings and, once looked up, an attribute
+map. The markdown converter only needs each element's name,
+attributes, contents and text.
+
+'parse' runs BeautifulSoup's own parser, with its rules for
+repairing bad html ('ICantBelieveItsBeautifulSoup'), but builds
+this module's tree instead of BeautifulSoup's, so the larger tree
+never exists:
+
+* an element is a 'Node', a '__slots__' class holding name,
+  attributes (a tuple of (name, value) pairs), contents and parent
+* text is a plain unicode string ('String'), and comments,
+  declarations, processing instructions and CDATA sections are
+  subclasses of it with no instance dictionary
+
+Nodes provide the parts of BeautifulSoup's 'Tag' interface the
+converter uses, under the same names: 'get', 'node[key]', 'string',
+'findAll', 'nextSibling', 'recursiveChildGenerator', 'append',
+'extract', and 'unicode(node)' for the node as html.
+
+    root = html_tree.parse(html)
+    for node in root.findAll('a'):
+        print(node.get('href'))
+"""
+
+# import statements    {{{1
+import re
+
+import BeautifulSoup
+
+import html_entities
+
+# constants    {{{1
+_NO_ATTRS = ()
+_BARE_AMPERSAND_OR_BRACKET = re.compile(
+    u'([<>]|&(?!#\\d+;|#x[0-9a-fA-F]+;|\\w+;))')
+_ESCAPES = {u'<': u'&lt;', u'>': u'&gt;', u'&': u'&amp;'}
+
+
+def _escape(text):    # {{{1
+    # text with bare ampersands and angle brackets escaped
+    return _BARE_AMPERSAND_OR_BRACKET.sub(
+        lambda match: _ESCAPES[match.group(0)[0]], text)
+
+
+# text in the tree: plain text is a unicode string, and other text
+# one of the subclasses of _Special below
+String = unicode  # noqa: F821
+
+
+class _Special(String):    # {{{1
+
+    """ text that is not plain text """
+
+    __slots__ = ()
+    _html = u'{0}'
+
+    def html(self):    # {{{2
+
+        """ text as html """
+
+        return self._html.format(self)
+
+
+class Comment(_Special):    # {{{1
+
+    """ html comment """
+
+    __slots__ = ()
+    _html = u'<!--{0}-->'
+
+
+class Declaration(_Special):    # {{{1
+
+    """ declaration, e.g., a doctype """
+
+    __slots__ = ()
+    _html = u'<!{0}>'
+
+
+class ProcessingInstruction(_Special):    # {{{1
+
+    """ processing instruction """
+
+    __slots__ = ()
+    _html = u'<?{0}?>'
+
+
+class CData(_Special):    # {{{1
+
+    """ CDATA section """
+
+    __slots__ = ()
+    _html = u'<![CDATA[{0}]]>'
+
+
+class Node(object):    # {{{1
+
+    # class docstring    {{{2
+    """ html element
+
+    usage:
+
+    node = Node(u'a', ((u'href', u'/'),), parent)
+    node.append(u'home')
+    """
+
+    __slots__ = ('name', 'attrs', 'contents', 'parent')
+
+    def __init__(self, name, attrs=_NO_ATTRS, parent=None):    # {{{2
+
+        """ initialise variables """
+
+        self.name = name
+        self.attrs = attrs
+        self.contents = []
+        self.parent = parent
+
+    def __unicode__(self):    # {{{2
+
+        """ node as html, as BeautifulSoup would write it """
+
+        attrs = []
+        for key, value in self.attrs:
+            if u'"' in value:
+                attrs.append(u" {0}='{1}'".format(
+                    key, _escape(value.replace(u"'", u'&squot;'))))
+            else:
+                attrs.append(u' {0}="{1}"'.format(key, _escape(value)))
+        if self.name in _Builder.SELF_CLOSING_TAGS:
+            return u'<{0}{1} />'.format(self.name, u''.join(attrs))
+        contents = []
+        for child in self.contents:
+            if isinstance(child, Node):
+                contents.append(unicode(child))  # noqa: F821
+            elif isinstance(child, _Special):
+                contents.append(child.html())
+            else:
+                contents.append(_escape(child))
+        return u'<{0}{1}>{2}</{0}>'.format(self.name, u''.join(attrs),
+                                           u''.join(contents))
+
+    @property
+    def string(self):    # {{{2
+
+        """ the only child, if it is text, else None """
+
+        contents = self.contents
+        if len(contents) == 1 and not isinstance(contents[0], Node):
+            return contents[0]
+        return None
+
+    @property
+    def nextSibling(self):    # {{{2
+
+        """ the element after this one in its parent, or None """
+
+        # pylint: disable=invalid-name
+        if self.parent is None:
+            return None
+        siblings = self.parent.contents
+        for index, sibling in enumerate(siblings):
+            if sibling is self:
+                return siblings[index + 1] if index + 1 < len(siblings) \
+                    else None
+        return None
+
+    def get(self, key, default=None):    # {{{2
+
+        """ value of attribute key """
+
+        for name, value in self.attrs:
+            if name == key:
+                return value
+        return default
+
+    def __getitem__(self, key):    # {{{2
+
+        """ value of attribute key, which must be present """
+
+        for name, value in self.attrs:
+            if name == key:
+                return value
+        raise KeyError(key)
+
+    def append(self, child):    # {{{2
+
+        """ add child at the end of the contents """
+
+        if isinstance(child, Node):
+            child.parent = self
+        self.contents.append(child)
+
+    def extract(self):    # {{{2
+
+        """ remove this node from its parent """
+
+        if self.parent is not None:
+            siblings = self.parent.contents
+            for index, sibling in enumerate(siblings):
+                if sibling is self:
+                    del siblings[index]
+                    break
+            self.parent = None
+        return self
+
+    def recursiveChildGenerator(self):    # {{{2
+
+        """ descendants, nodes and text, in document order """
+
+        # pylint: disable=invalid-name
+        stack = [iter(self.contents)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if isinstance(child, Node) and child.contents:
+                    stack.append(iter(child.contents))
+                    break
+            else:
+                stack.pop()
+
+    def findAll(self, name):    # {{{2
+
+        """ descendant nodes called name, in document order """
+
+        # pylint: disable=invalid-name
+        return [child for child in self.recursiveChildGenerator()
+                if isinstance(child, Node) and child.name == name]
+
+
+class _Builder(BeautifulSoup.ICantBelieveItsBeautifulSoup):    # {{{1
+
+    # class docstring    {{{2
+    """ BeautifulSoup's parser, building Nodes instead of Tags
+
+    the methods overridden are those that create tree objects;
+    the rules for nesting, quoting and encoding are BeautifulSoup's
+    """
+
+    # pylint: disable=too-many-ancestors
+    _TEXT_CLASSES = {
+        BeautifulSoup.Comment: Comment,
+        BeautifulSoup.Declaration: Declaration,
+        BeautifulSoup.ProcessingInstruction: ProcessingInstruction,
+        BeautifulSoup.CData: CData,
+    }
+    # set when BeautifulSoup decodes the markup itself, and read by
+    # a <meta> charset, so needed when the markup is given as unicode
+    declaredHTMLEncoding = None
+    originalEncoding = None
+
+    def endData(self, containerClass=None):    # {{{2
+
+        """ add text collected so far to the current node """
+
+        # pylint: disable=invalid-name
+        if not self.currentData:
+            return
+        data = u''.join(self.currentData)
+        self.currentData = []
+        if (not data.translate(self.STRIP_ASCII_SPACES)
+                and not any(tag.name in self.PRESERVE_WHITESPACE_TAGS
+                            for tag in self.tagStack)):
+            data = u'\n' if u'\n' in data else u' '
+        text_class = self._TEXT_CLASSES.get(containerClass)
+        if text_class:
+            data = text_class(data)
+        elif self.currentTag.name not in self.QUOTE_TAGS:
+            # entities are decoded, except those for markup characters
+            data = html_entities.decode(data, escape=True)
+        self.currentTag.contents.append(data)
+
+    def unknown_starttag(self, name, attrs, selfClosing=0):    # {{{2
+
+        """ start a node
+
+        returns None, rather than the new node as BeautifulSoup
+        does, as nodes cannot be marked for encoding substitution
+        """
+
+        # pylint: disable=invalid-name
+        if self.quoteStack:
+            # not a real tag
+            self.handle_data(u'<{0}{1}>'.format(name, u''.join(
+                u' {0}="{1}"'.format(key, value) for key, value in attrs)))
+            return
+        self.endData()
+        self_closing = selfClosing or self.isSelfClosingTag(name)
+        if not self_closing:
+            self._smartPop(name)
+        if attrs:
+            # entities in attribute values are decoded
+            attrs = tuple((key, html_entities.decode(value))
+                          for key, value in attrs)
+        node = Node(name, attrs or _NO_ATTRS, self.currentTag)
+        self.pushTag(node)
+        if self_closing:
+            self.popTag()
+        if name in self.QUOTE_TAGS:
+            self.quoteStack.append(name)
+            self.literal = 1
+
+
+def decode(markup):    # {{{1
+
+    """ markup as unicode, decoded as 'parse' decodes it
+
+    parsing the parts of a page separately (see block_cache.py)
+    needs the page decoded as a whole first, since only the whole
+    declares its encoding
+    """
+
+    if isinstance(markup, String):
+        return markup
+    return BeautifulSoup.UnicodeDammit(
+        markup, [None, None], smartQuotesTo=_Builder.HTML_ENTITIES,
+        isHTML=True).unicode
+
+
+def parse(markup):    # {{{1
+
+    """ root Node of the tree of html string markup """
+
+    builder = _Builder(markup)
+    root = Node(u'[document]')
+    root.contents = builder.contents
+    for child in root.contents:
+        if isinstance(child, Node):
+            child.parent = root
+    return root
+
+# vim:fdm=marker:
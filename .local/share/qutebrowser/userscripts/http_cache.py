@@ -0,0 +1,211 @@
+# module docstring    {{{1
+""" fetch pages over http through an on-disk cache, for SaveMarkdown.py
+
+The other pages of a multi-page article (see pagination.py) are
+fetched through a cache in $XDG_CACHE_HOME/qutebrowser/http, so that
+saving the article again fetches only what has changed. Each
+response is kept as two files, named by the sha1 hash of its url:
+
+    HASH.body    the response body
+    HASH.json    the final url (after redirects), when it was
+                 fetched, until when it is fresh, and its validators
+
+A cached response is used without asking the server while it is
+fresh: for its 'Cache-Control: max-age' or 'Expires' lifetime, or,
+if it has neither, a tenth of the time since it was last modified,
+up to a day, as browsers do. A stale response with an 'ETag' or
+'Last-Modified' header is revalidated with a conditional request,
+and reused if the server answers '304 Not Modified'. Responses
+marked 'no-store' are not kept. Files are written to a temporary
+file and renamed into place, so threads and scripts can share the
+cache.
+
+Pages are fetched without qutebrowser's cookies, so the other pages
+of an article behind a login cannot be fetched.
+
+    cache = http_cache.HttpCache()
+    response = cache.fetch(url)    # response.url, response.body
+
+This module is shared by python 2 and 3 scripts.
+"""
+
+# import statements    {{{1
+import collections
+import email.utils
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+try:
+    from http.client import HTTPException
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request, urlopen
+except ImportError:
+    from httplib import HTTPException
+    from urllib2 import HTTPError, Request, URLError, urlopen
+
+# constants    {{{1
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser', 'http')
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) qutebrowser-save-markdown/1.0'
+MAX_SIZE = 20 * 1024 * 1024
+TIMEOUT = 20
+MAX_HEURISTIC = 24 * 60 * 60    # longest freshness guessed from age
+_MAX_AGE = re.compile(r'max-age\s*=\s*"?(\d+)', re.I)
+
+Response = collections.namedtuple('Response', 'url body')
+
+
+class FetchError(Exception):    # {{{1
+
+    """ page could not be fetched """
+
+
+def _date(value):    # {{{1
+    # seconds since the epoch of an http date, or None
+    parsed = email.utils.parsedate_tz(value) if value else None
+    return email.utils.mktime_tz(parsed) if parsed else None
+
+
+def _fresh_until(headers, now):    # {{{1
+    # time until which a response with headers may be used unchecked
+    control = (headers.get('Cache-Control') or '').lower()
+    if 'no-cache' in control:
+        return now
+    max_age = _MAX_AGE.search(control)
+    if max_age:
+        return now + int(max_age.group(1))
+    date = _date(headers.get('Date')) or now
+    expires = _date(headers.get('Expires'))
+    if expires is not None or headers.get('Expires'):
+        # an invalid Expires, e.g., '0', means already expired
+        return now + max(0, (expires or date) - date)
+    modified = _date(headers.get('Last-Modified'))
+    if modified is not None:
+        return now + min(MAX_HEURISTIC, max(0, date - modified) / 10)
+    return now
+
+
+def _write_new(path, data):    # {{{1
+    # write data to path through a temporary file renamed into place
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.rename(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+class HttpCache(object):    # {{{1
+
+    # class docstring    {{{2
+    """ fetch urls, reusing fresh or unchanged cached responses
+
+    usage:
+
+    cache = HttpCache()
+    response = cache.fetch(url)
+
+    fetch() may be called from several threads at once
+    """
+
+    def __init__(self, directory=CACHE_DIR, timeout=TIMEOUT):    # {{{2
+
+        """ initialise variables """
+
+        self.directory = directory
+        self._timeout = timeout
+
+    def _paths(self, url):    # {{{2
+
+        """ (metadata, body) file paths of url's cached response """
+
+        base = os.path.join(self.directory, hashlib.sha1(
+            url.encode('utf-8')).hexdigest())
+        return base + '.json', base + '.body'
+
+    def _load(self, url):    # {{{2
+
+        """ (metadata, body) of url's cached response, or (None, None) """
+
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as handle:
+                meta = json.load(handle)
+            with open(body_path, 'rb') as handle:
+                body = handle.read()
+        except (IOError, OSError, ValueError):
+            return None, None
+        if meta.get('url') is None or len(body) != meta.get('size'):
+            return None, None    # damaged, or from another version
+        return meta, body
+
+    def _store(self, url, meta, body):    # {{{2
+
+        """ keep a response; failure to is ignored, as it was fetched """
+
+        meta_path, body_path = self._paths(url)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # body first, so the metadata never describes a missing body
+            _write_new(body_path, body)
+            _write_new(meta_path, json.dumps(meta).encode('utf-8'))
+        except (IOError, OSError):
+            pass
+
+    def fetch(self, url):    # {{{2
+
+        """ Response (final url and body) of url
+
+        raises FetchError if it cannot be fetched
+        """
+
+        meta, body = self._load(url)
+        now = time.time()
+        if meta and now < meta['fresh_until']:
+            return Response(meta['url'], body)
+        headers = {'User-Agent': USER_AGENT,
+                   'Accept': 'text/html,application/xhtml+xml,*/*;q=0.5'}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            response = urlopen(Request(url, headers=headers),
+                               timeout=self._timeout)
+            try:
+                info, final_url = response.info(), response.geturl()
+                body = response.read(MAX_SIZE + 1)
+            finally:
+                response.close()
+        except HTTPError as error:
+            if error.code != 304 or not meta:
+                raise FetchError('{0}: HTTP error {1}'.format(url,
+                                                              error.code))
+            info, final_url = error.info(), meta['url']
+        except (HTTPException, URLError, IOError, OSError,
+                ValueError) as error:
+            raise FetchError('{0}: {1}'.format(
+                url, getattr(error, 'reason', None) or error))
+        if len(body) > MAX_SIZE:
+            raise FetchError('{0}: larger than {1} MB'.format(
+                url, MAX_SIZE // (1024 * 1024)))
+        if 'no-store' not in (info.get('Cache-Control') or '').lower():
+            old = meta or {}
+            self._store(url, {
+                'url': final_url, 'fetched': now, 'size': len(body),
+                'fresh_until': _fresh_until(info, now),
+                'etag': info.get('ETag') or old.get('etag'),
+                'last_modified': (info.get('Last-Modified')
+                                  or old.get('last_modified'))}, body)
+        return Response(final_url, body)
+
+# vim:fdm=marker:
@@ -0,0 +1,222 @@
+# -*- coding: utf8 -*-
+
+# module docstring    {{{1
+""" write GitHub Flavored Markdown pipe tables
+
+Shared by SaveMarkdown.py, under python 2 or 3. Rows are added one
+at a time, as lists of cell text already converted to inline
+markdown; the first row added is the header row:
+
+    lines = []
+    table = MarkdownTable(lines.append, align=['left', None, 'right'])
+    table.add_row([u'Name', u'Count', u'Cost'])
+    for row in rows:
+        table.add_row(row)
+    table.close()
+
+Columns are padded to a common width, so the table reads well as
+plain text too. That takes two passes: rows are held in a compact
+buffer, a tuple of escaped cell strings per row, while the column
+widths are accumulated, and are formatted once the widths are
+known.
+
+Huge tables are not held whole: once 'limit' rows are buffered, the
+widths found so far are fixed, the buffer is written, and each later
+row is formatted and written as it is added. A later cell wider
+than its column pushes the closing pipes of its row out of line,
+which is still valid markdown. The header has as many columns as the
+longest buffered row, or as 'columns', if given; since markdown
+drops cells beyond the header's, those of a later, longer row are
+joined to its last cell with '<br>' rather than lost.
+
+Run as a script, the module times both modes on a generated table:
+'python markdown_table.py [--rows N] [--columns N]'.
+"""
+
+# import statements    {{{1
+from __future__ import print_function
+
+import unicodedata
+
+# constants    {{{1
+LIMIT = 1000
+_DELIMITER = {None: u'-{0}-', 'left': u':{0}-', 'right': u'-{0}:',
+              'center': u':{0}:'}
+
+
+def cell(text):    # {{{1
+
+    """ text as the content of a single table cell
+
+    a row must be a single line, so lines are joined with '<br>',
+    runs of whitespace become single spaces, and pipes, which
+    would end the cell, are escaped
+    """
+
+    lines = [u' '.join(line.split()) for line in text.splitlines()]
+    text = u'<br>'.join(line for line in lines if line)
+    return text.replace(u'|', u'\\|')
+
+
+def width(text):    # {{{1
+
+    """ number of columns text takes up in a fixed-width font """
+
+    try:
+        text.encode('ascii')
+    except UnicodeError:
+        return sum(0 if unicodedata.combining(char)
+                   else 2 if unicodedata.east_asian_width(char) in 'WF'
+                   else 1 for char in text)
+    return len(text)
+
+
+class MarkdownTable(object):    # {{{1
+
+    # class docstring    {{{2
+    """ pipe table written row by row to a callable
+
+    usage:
+
+    table = MarkdownTable(lines.append)
+    table.add_row([u'Header 1', u'Header 2'])
+    table.add_row([u'cell', u'cell'])
+    table.close()
+    """
+
+    def __init__(self, write, align=None, limit=LIMIT,
+                 columns=None):    # {{{2
+
+        """ initialise variables
+
+        align is a list, by column, of 'left', 'right', 'center'
+        or None (no alignment); limit is the number of rows
+        buffered to find column widths, or None for all rows;
+        columns is the number of columns of the longest row, if
+        known beforehand
+        """
+
+        self._write = write
+        self._align = list(align or [])
+        self._limit = limit
+        self._rows = []
+        self._widths = [0] * (columns or 0)
+        self._streaming = False
+
+    def add_row(self, cells):    # {{{2
+
+        """ add a row of cell text """
+
+        row = tuple(cell(text) for text in cells)
+        if self._streaming:
+            columns = len(self._widths)
+            if 0 < columns < len(row):
+                # markdown drops cells beyond the header's
+                row = row[:columns - 1] + (u'<br>'.join(
+                    text for text in row[columns - 1:] if text),)
+            self._write(self._format(row))
+            return
+        widths = self._widths
+        for index, text in enumerate(row):
+            size = width(text)
+            if index == len(widths):
+                widths.append(size)
+            elif size > widths[index]:
+                widths[index] = size
+        self._rows.append(row)
+        if self._limit is not None and len(self._rows) > self._limit:
+            self._flush()
+            self._streaming = True
+
+    def close(self):    # {{{2
+
+        """ write any rows still buffered """
+
+        if not self._streaming:
+            self._flush()
+
+    def _flush(self):    # {{{2
+
+        """ write header, delimiter row and buffered rows """
+
+        if not self._rows:
+            return
+        # delimiter cells need at least three characters
+        self._widths = [max(size, 3) for size in self._widths]
+        self._align.extend([None] * (len(self._widths) - len(self._align)))
+        write, format_row = self._write, self._format
+        write(format_row(self._rows[0]))
+        write(u'| ' + u' | '.join(
+            _DELIMITER[self._align[index]].format(u'-' * (size - 2))
+            for index, size in enumerate(self._widths)) + u' |')
+        for row in self._rows[1:]:
+            write(format_row(row))
+        self._rows = []
+
+    def _format(self, row):    # {{{2
+
+        """ row as a line of padded cells """
+
+        widths, align = self._widths, self._align
+        parts = []
+        for index, size in enumerate(widths):
+            text = row[index] if index < len(row) else u''
+            pad = size - width(text)
+            if pad <= 0:
+                parts.append(text)
+            elif align[index] == 'right':
+                parts.append(u' ' * pad + text)
+            elif align[index] == 'center':
+                parts.append(u' ' * (pad // 2) + text
+                             + u' ' * (pad - pad // 2))
+            else:
+                parts.append(text + u' ' * pad)
+        return u'| ' + u' | '.join(parts) + u' |'
+
+
+def render(rows, align=None, limit=None):    # {{{1
+
+    """ list of lines of a table of rows, the first of them the header """
+
+    lines = []
+    table = MarkdownTable(lines.append, align=align, limit=limit)
+    for row in rows:
+        table.add_row(row)
+    table.close()
+    return lines
+
+
+def _bench():    # {{{1
+
+    """ time buffered and streaming tables on a generated table """
+
+    # pylint: disable=import-outside-toplevel
+    import argparse
+    import time
+    clock = getattr(time, 'perf_counter', time.time)
+    parser = argparse.ArgumentParser(
+        description='Time conversion of a generated table')
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='table rows (default: %(default)s)')
+    parser.add_argument('--columns', type=int, default=6,
+                        help='table columns (default: %(default)s)')
+    args = parser.parse_args()
+    rows = [[u'Column {0}'.format(column) for column in range(args.columns)]]
+    rows.extend([u'row {0} | {1}'.format(row, column * row) if column % 3
+                 else u'x' * (row % 17) for column in range(args.columns)]
+                for row in range(args.rows))
+    for name, limit in (('buffered', None), ('streaming', LIMIT)):
+        start = clock()
+        lines = render(rows, limit=limit)
+        elapsed = clock() - start
+        print('{0:10} {1} rows x {2} columns: {3:.1f} ms, '
+              '{4:.2f} us/cell, {5} characters'.format(
+                  name, args.rows, args.columns, elapsed * 1000,
+                  elapsed * 1e6 / (args.rows * args.columns),
+                  sum(len(line) + 1 for line in lines)))
+
+
+if __name__ == '__main__':
+    _bench()
+
+# vim:fdm=marker:
@@ -0,0 +1,293 @@
+# module docstring    {{{1
+""" compressed, content-addressed store of saved pages
+
+The same article saved from several urls, or saved again unchanged,
+is stored once. Each distinct page is a compressed blob named by
+the sha256 hash of its text, and every save adds a line to a
+manifest, so the archive holds:
+
+    objects/AB/CDEF...EXT    page whose hash is ABCDEF..., compressed
+    manifest.tsv             SAVED<TAB>HASH<TAB>SIZE<TAB>NAME<TAB>URL<TAB>TITLE
+
+where SAVED is the save time in seconds since the epoch, SIZE the
+uncompressed size in bytes, and NAME the file name the page would
+have been saved as. The archive is in environmental variable
+'PAGE_ARCHIVE_DIR', defaulting to
+$XDG_DATA_HOME/qutebrowser/page_archive.
+
+Blobs are compressed with zstd (EXT 'zst') if the python
+'zstandard' module is installed, or else with xz (EXT 'xz'), or
+with the codec in environmental variable 'PAGE_ARCHIVE_CODEC'. A
+blob is read with the codec its extension names, so an archive may
+mix them. Blobs are written to a temporary file and renamed, and
+never change afterwards, and the manifest is only appended to, so
+several scripts can save at once and a backup only copies what is
+new.
+
+PageArchive.py is the command line interface (add, list, cat,
+export, stats, verify); this module is shared by the python 3
+userscripts.
+
+    archive = page_archive.Archive()
+    entry, new = archive.store(markdown, name='page.md', url=url)
+    text = archive.read(entry.digest)
+"""
+
+# import statements    {{{1
+import collections
+import hashlib
+import lzma
+import os
+import re
+import tempfile
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# constants    {{{1
+ARCHIVE_DIR = (os.getenv('PAGE_ARCHIVE_DIR')
+               or os.path.join(os.getenv('XDG_DATA_HOME')
+                               or os.path.join(os.path.expanduser('~'),
+                                               '.local', 'share'),
+                               'qutebrowser', 'page_archive'))
+ZSTD_LEVEL = 19
+XZ_PRESET = 6
+_BLOB_RE = re.compile(r'[/\\]objects[/\\]([0-9a-f]{2})[/\\]([0-9a-f]{62})'
+                      r'\.(zst|xz)$')
+_HEX_RE = re.compile(r'[0-9a-f]{4,64}$')
+
+Entry = collections.namedtuple('Entry',
+                               'saved digest size name url title')
+
+
+class ArchiveError(Exception):    # {{{1
+
+    """ archive cannot be read or written """
+
+
+def _zstd_compress(data):    # {{{1
+    # data compressed as a zstd frame
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _zstd_decompress(data):    # {{{1
+    # max_output_size is needed if the frame does not record the size
+    return zstandard.ZstdDecompressor().decompress(
+        data, max_output_size=1 << 30)
+
+
+def _codecs():    # {{{1
+    # available codecs: {extension: (compress, decompress)}, preferred first
+    codecs = collections.OrderedDict()
+    if zstandard:
+        codecs['zst'] = (_zstd_compress, _zstd_decompress)
+    codecs['xz'] = (lambda data: lzma.compress(data, preset=XZ_PRESET),
+                    lzma.decompress)
+    return codecs
+
+
+CODECS = _codecs()
+_CODEC_ERRORS = (lzma.LZMAError,) + ((zstandard.ZstdError,) if zstandard
+                                     else ())
+# all codecs an archive may contain, available or not
+EXTENSIONS = ('zst', 'xz')
+
+
+def _field(text):    # {{{1
+    # text as a manifest field: on one line, without tabs
+    return ' '.join((text or '').split())
+
+
+def is_blob(path):    # {{{1
+
+    """ whether path is a blob in an archive """
+
+    return bool(_BLOB_RE.search(path))
+
+
+def read_blob(path):    # {{{1
+
+    """ uncompressed content of the blob at path """
+
+    extension = path.rpartition('.')[2]
+    if extension not in CODECS:
+        raise ArchiveError('Cannot read {0}: {1} needs python module '
+                           'zstandard'.format(path, extension))
+    try:
+        with open(path, 'rb') as blob:
+            return CODECS[extension][1](blob.read())
+    except _CODEC_ERRORS as error:
+        raise ArchiveError('Cannot read {0}: {1}'.format(path, error))
+
+
+def extract(path, directory):    # {{{1
+
+    """ path of a plain copy of the blob at path, in directory
+
+    the copy is written only once, as blobs never change
+    """
+
+    match = _BLOB_RE.search(path)
+    target = os.path.join(directory, match.group(1) + match.group(2)[:14]
+                          + '.txt')
+    if not os.path.exists(target):
+        os.makedirs(directory, exist_ok=True)
+        _write_new(target, read_blob(path))
+    return target
+
+
+def _write_new(path, data):    # {{{1
+    # write data to path through a temporary file renamed into place
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+class Archive(object):    # {{{1
+
+    # class docstring    {{{2
+    """ content-addressed archive of saved pages
+
+    usage:
+
+    archive = Archive()
+    entry, new = archive.store(text, name='page.md', url=url, title=title)
+    for entry in archive.entries():
+        print(entry.name, archive.read(entry.digest))
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR, codec=None):    # {{{2
+
+        """ initialise variables
+
+        codec is the extension of the codec new blobs are compressed
+        with, by default the preferred available one
+        """
+
+        self.directory = directory
+        self.manifest = os.path.join(directory, 'manifest.tsv')
+        codec = codec or os.getenv('PAGE_ARCHIVE_CODEC') or next(iter(CODECS))
+        if codec not in CODECS:
+            raise ArchiveError('Unavailable codec: {0} (available: {1})'
+                               .format(codec, ', '.join(CODECS)))
+        self._codec = codec
+
+    def blob_path(self, digest):    # {{{2
+
+        """ path of the blob of digest, or None if not stored """
+
+        base = os.path.join(self.directory, 'objects', digest[:2],
+                            digest[2:])
+        for extension in EXTENSIONS:
+            if os.path.exists(base + '.' + extension):
+                return base + '.' + extension
+        return None
+
+    def store(self, data, name='', url='', title='', saved=None):    # {{{2
+
+        """ add page data (text or bytes) to the archive
+
+        a blob is written only if no page with the same content is
+        stored; returns the manifest entry and whether a blob was
+        written
+        """
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        new = self.blob_path(digest) is None
+        if new:
+            path = os.path.join(self.directory, 'objects', digest[:2],
+                                digest[2:] + '.' + self._codec)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _write_new(path, CODECS[self._codec][0](data))
+            except OSError as error:
+                raise ArchiveError('Cannot write blob: ' + str(error))
+        entry = Entry(time.time() if saved is None else saved, digest,
+                      len(data), _field(name), _field(url), _field(title))
+        line = '\t'.join(['{0:.0f}'.format(entry.saved), digest,
+                          str(entry.size)] + list(entry[3:])) + '\n'
+        try:
+            # a single append, so lines written at once do not interleave
+            handle = os.open(self.manifest,
+                             os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(handle, line.encode('utf-8'))
+            finally:
+                os.close(handle)
+        except OSError as error:
+            raise ArchiveError('Cannot write manifest: ' + str(error))
+        return entry, new
+
+    def read(self, digest):    # {{{2
+
+        """ content of the page with digest, as bytes """
+
+        path = self.blob_path(digest)
+        if not path:
+            raise ArchiveError('No page stored with hash ' + digest)
+        return read_blob(path)
+
+    def entries(self):    # {{{2
+
+        """ manifest entries, oldest first """
+
+        entries = []
+        try:
+            with open(self.manifest, encoding='utf-8',
+                      errors='replace') as manifest:
+                for line in manifest:
+                    fields = line.rstrip('\n').split('\t')
+                    if len(fields) != 6 or not _HEX_RE.match(fields[1]):
+                        continue    # damaged, or still being written
+                    try:
+                        entries.append(Entry(float(fields[0]), fields[1],
+                                             int(fields[2]), *fields[3:]))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as error:
+            raise ArchiveError('Cannot read manifest: ' + str(error))
+        return entries
+
+    def resolve(self, ref):    # {{{2
+
+        """ latest entry for ref: a hash, or its start, a url or a name """
+
+        entries = self.entries()
+        matches = [entry for entry in entries
+                   if ref in (entry.url, entry.name)]
+        if not matches and _HEX_RE.match(ref):
+            matches = [entry for entry in entries
+                       if entry.digest.startswith(ref)]
+            if len({entry.digest for entry in matches}) > 1:
+                raise ArchiveError('Ambiguous hash: ' + ref)
+        if not matches:
+            raise ArchiveError('No archived page matches ' + ref)
+        return matches[-1]
+
+    def blobs(self):    # {{{2
+
+        """ (digest, path) of every stored blob """
+
+        objects = os.path.join(self.directory, 'objects')
+        for prefix in sorted(os.listdir(objects)
+                             if os.path.isdir(objects) else []):
+            directory = os.path.join(objects, prefix)
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if is_blob(path):
+                    yield prefix + name.partition('.')[0], path
+
+# vim:fdm=marker:
@@ -0,0 +1,196 @@
+# module docstring    {{{1
+""" find and fetch the other pages of an article, for SaveMarkdown.py
+
+An article or forum thread split across pages names its next page
+with '<link rel="next">' or '<a rel="next">', and usually links to
+its pages by number as well ('1 2 3 ... 9 Next'). 'links' finds
+both in a page's html, and 'fetch_pages' fetches the pages they
+lead to, several at once (JOBS, by default 4) and through an
+on-disk cache (see http_cache.py), looking for links in each page
+fetched until no new pages are found, or there are MAX_PAGES.
+
+Numbered links are links on the same host whose text is a number.
+Of those, only the links whose url has the same shape as the next
+page's (the url with its numbers left out), or, if there is no next
+page, the shape most of them share (the one most like the page's
+url, if several are as common), are taken to be the article's, so
+that, e.g., a calendar's numbered days are not. Only pages after
+the current one are fetched: numbered links to earlier pages are
+ignored, and the next page chain only goes forward.
+
+Pages are returned in order of page number: the number of their
+link's text, or one more than that of the page naming them as its
+next page, where the current page is number 1 unless a numbered
+link with its shape says otherwise.
+
+    pages, failed = pagination.fetch_pages(html, url)
+    for page in pages: convert(page.body)    # also page.url
+
+This module is shared by python 2 and 3 scripts.
+"""
+
+# import statements    {{{1
+import collections
+import os
+import re
+from multiprocessing.pool import ThreadPool
+
+import html_entities
+import http_cache
+
+try:
+    from urllib.parse import urldefrag, urljoin, urlsplit
+except ImportError:
+    from urlparse import urldefrag, urljoin, urlsplit
+
+# constants    {{{1
+JOBS = 4
+MAX_PAGES = 50
+# start or end tag of a link; attributes end at the next '<' or '>'
+_LINK_TAG = re.compile(u'<(/?)(a|link)(?![\\w:.-])([^<>]*)>', re.I)
+_ATTRIBUTE = re.compile(u'([\\w:.-]+)\\s*=\\s*'
+                        u'(?:"([^"]*)"|\'([^\']*)\'|([^\\s"\'>]+))')
+_TAG = re.compile(u'<[^<>]*>')
+_NUMBER = re.compile(u'\\d+')
+
+
+def _attributes(text):    # {{{1
+    # {name: value} of the attributes in a tag's text, names lowercase
+    return dict((match.group(1).lower(), html_entities.decode(
+        match.group(2) or match.group(3) or match.group(4) or u''))
+        for match in _ATTRIBUTE.finditer(text))
+
+
+def _shape(url):    # {{{1
+    # url with its numbers left out, which pages of a series share
+    return _NUMBER.sub(u'#', url)
+
+
+def _resolve(href, base, host):    # {{{1
+    # absolute url of href, without fragment, or None if not a page on
+    # host
+    url = urldefrag(urljoin(base, href.strip()))[0]
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or parts.hostname != host:
+        return None
+    return url
+
+
+def links(markup, url):    # {{{1
+
+    """ (next page url or None, {url: number} of numbered page links)
+
+    found in a page's markup, where url is the page's own url; links
+    to the page itself are left out
+    """
+
+    if not isinstance(markup, type(u'')):
+        markup = markup.decode('utf-8', 'replace')
+    host = urlsplit(url).hostname
+    following = None
+    numbered = {}
+    anchor = None    # (url, end of start tag) of the open <a>
+    for tag in _LINK_TAG.finditer(markup):
+        closing, name = tag.group(1), tag.group(2).lower()
+        if closing:
+            if name == 'a' and anchor:
+                text = _TAG.sub(u'', markup[anchor[1]:tag.start()]).strip()
+                if text.isdigit() and len(text) < 5:
+                    numbered.setdefault(anchor[0], int(text))
+            anchor = None
+            continue
+        attributes = _attributes(tag.group(3))
+        href = attributes.get('href')
+        target = _resolve(href, url, host) if href else None
+        if name == 'a':
+            anchor = (target, tag.end()) if target else None
+        if target and following is None \
+                and 'next' in attributes.get('rel', u'').lower().split():
+            following = target
+    numbered.pop(url, None)
+    if following == url:
+        following = None
+    # the numbered links of the article's pages, by their shape; of
+    # shapes as common, the one most like the page's url
+    shapes = collections.Counter(_shape(link) for link in numbered)
+    shape = _shape(following) if following else None
+    if shapes and not shape:
+        shape = max(shapes, key=lambda shape: (shapes[shape], len(
+            os.path.commonprefix([shape, _shape(url)]))))
+    return following, dict((link, number)
+                           for link, number in numbered.items()
+                           if _shape(link) == shape)
+
+
+def _page_number(url, numbered):    # {{{1
+    # number of the page at url: the number in its url where the
+    # numbered links of its shape have their page numbers, else 1
+    digits = _NUMBER.findall(url)
+    for link, number in numbered.items():
+        if _shape(link) == _shape(url):
+            for mine, theirs in zip(digits, _NUMBER.findall(link)):
+                if mine != theirs and theirs == str(number):
+                    return int(mine)
+    return 1
+
+
+def fetch_pages(markup, url, cache=None, jobs=JOBS,
+                limit=MAX_PAGES):    # {{{1
+
+    """ (pages, failed) of the article whose current page is markup
+
+    pages are the http_cache.Response of each later page, in order,
+    and failed the error messages of those that could not be
+    fetched; url is the current page's url
+    """
+
+    cache = cache or http_cache.HttpCache()
+    numbers = {}    # {page url: page number}
+    found = [url]    # page urls, in the order found
+    responses = {}
+
+    def visit(page, markup, base):
+        # record the links in a page, whose links are relative to base,
+        # returning the later pages not found before
+        following, numbered = links(markup, base)
+        if page == url:
+            numbers[url] = _page_number(url, numbered)
+        for link, number in numbered.items():
+            numbers.setdefault(link, number)
+        if following:
+            numbers.setdefault(following, numbers[page] + 1)
+        new = []
+        for link in [following] + sorted(numbered, key=numbered.get):
+            if link and link not in found and numbers[link] > numbers[url]:
+                found.append(link)
+                new.append(link)
+        return new
+
+    def fetch(page):
+        try:
+            return cache.fetch(page)
+        except http_cache.FetchError as error:
+            return error
+
+    frontier = visit(url, markup, url)
+    failed = []
+    pool = ThreadPool(max(1, jobs))
+    try:
+        while frontier:
+            frontier = frontier[:max(0, limit - 1 - len(responses))]
+            new = []
+            for page, response in zip(frontier, pool.map(fetch, frontier)):
+                if isinstance(response, http_cache.FetchError):
+                    failed.append(str(response))
+                else:
+                    responses[page] = response
+                    new.extend(visit(page, response.body, response.url))
+            frontier = new
+    finally:
+        pool.close()
+        pool.join()
+    pages = sorted(responses, key=lambda page: (numbers[page],
+                                                found.index(page)))
+    return [responses[page] for page in pages], failed
+
+# vim:fdm=marker:
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" persistent index of password store entries for password_fill
+
+This helper is called by the password_fill userscript instead of
+running 'find' over the whole password store on every lookup.
+
+The paths of all '*.gpg' entries in the password store are kept in a
+sqlite database under $XDG_CACHE_HOME/qutebrowser/password_fill/. Every
+path component that looks like a domain name is stored with its labels
+reversed, e.g., 'gist.github.com' becomes 'com.github.gist.', so that
+the sorted key index acts as a domain-suffix trie: the entries for a
+domain and all its subdomains form one contiguous key range. For
+entries whose path merely contains the domain, the trigrams of every
+lowercased path are indexed too, so that those entries are found
+from the trigrams of the domain, without reading every path.
+
+The index is invalidated by directory modification times. Each call
+stats the known directories of the store (not the entries) and rescans
+only the directories that changed.
+
+For matching entries by a url line inside the entry (password_fill's
+match_line option), the url lines of all entries are cached in a second
+index. It is stored encrypted, with gpg, for the recipients in the
+store's .gpg-id file. An entry is decrypted only when its file mtime
+has changed since it was last indexed; when many entries need
+decrypting, they are decrypted in parallel by a bounded pool of gpg
+processes. Matching url lines then costs a single decryption of the
+index.
+
+Usage:
+
+    password_fill_index.py [--store DIR] [--gpg GPG] [--jobs N]
+        query [--fallback] [--lines PATTERN [--no-paths]] DOMAIN
+    password_fill_index.py [--store DIR] list
+    password_fill_index.py [--store DIR] rebuild
+
+'query' prints the entries matching DOMAIN or any of its subdomains,
+one per line: entries with a path component that is DOMAIN or one of
+its subdomains (ignoring case and 'www.'), and, as password_fill's
+'find | grep' matched before, entries whose path contains DOMAIN,
+also ignoring case (e.g., 'GitHub.com-work' for 'github.com'). With
+'--lines', entries containing a line that matches the regular
+expression PATTERN followed by DOMAIN also match (and with
+'--no-paths', only those). With
+'--fallback', subdomains are dropped from DOMAIN until some entry
+matches (an empty DOMAIN matches every entry); the first line printed
+is the domain level that matched.
+'list' prints every entry.
+"""
+
+# import statements    {{{1
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+
+
+# constants    {{{1
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser', 'password_fill')
+GPG_OPTS = ['--quiet', '--yes', '--batch', '--compress-algo=none',
+            '--no-encrypt-to']
+SCHEMA = 2    # bumped when the tables change, to rebuild older indexes
+GRAM = 3    # length of the substrings of paths indexed
+GRAM_PAD = '\n' * (GRAM - 1)    # so each substring starts a gram
+GRAM_PROBE = 256    # entries counted per gram when choosing the rarest
+
+
+class PassIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ mtime-invalidated index of password store entries
+
+    usage:
+
+    index = PassIndex(store_dir)
+    index.refresh()
+    level, entries = index.query('gist.github.com', fallback=True)
+    """
+
+    def __init__(self, store, cache_dir=CACHE_DIR):    # {{{2
+
+        """ open (creating if necessary) the index for store """
+
+        self._store = os.path.realpath(store)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        self.path = os.path.join(cache_dir, store_digest(store) + '.sqlite')
+        umask = os.umask(0o077)
+        try:
+            self._db = sqlite3.connect(self.path)
+        finally:
+            os.umask(umask)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS dirs (
+                dir TEXT PRIMARY KEY, mtime REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS entries (
+                entry TEXT PRIMARY KEY, dir TEXT NOT NULL,
+                mtime REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir);
+            CREATE TABLE IF NOT EXISTS domains (
+                rkey TEXT NOT NULL, entry TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS domains_rkey ON domains (rkey);
+            CREATE INDEX IF NOT EXISTS domains_entry ON domains (entry);
+            CREATE TABLE IF NOT EXISTS grams (
+                gram TEXT NOT NULL, entry TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS grams_gram ON grams (gram, entry);
+            CREATE INDEX IF NOT EXISTS grams_entry ON grams (entry);
+        ''')
+        if self._db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA:
+            self.clear()
+            self._db.execute('PRAGMA user_version = {0}'.format(SCHEMA))
+
+    def refresh(self):    # {{{2
+
+        """ rescan directories whose mtime changed since last call
+
+        returns the number of directories rescanned
+        """
+
+        known = dict(self._db.execute('SELECT dir, mtime FROM dirs'))
+        stale = []
+        for rel in known:
+            try:
+                mtime = os.stat(os.path.join(self._store, rel)).st_mtime
+            except OSError:
+                mtime = None
+            if mtime != known[rel]:
+                stale.append(rel)
+        if not known:
+            stale.append('')
+        if not stale:
+            return 0
+        rescanned = 0
+        with self._db:
+            pending = stale
+            seen = set()
+            while pending:
+                rel = pending.pop()
+                if rel in seen:
+                    continue
+                seen.add(rel)
+                rescanned += 1
+                for sub in self._scan_dir(rel, known):
+                    if sub not in known:
+                        pending.append(sub)
+        return rescanned
+
+    def _scan_dir(self, rel, known):    # {{{2
+
+        """ replace the indexed content of one directory
+
+        returns the subdirectories found in it
+        """
+
+        self._forget_dir(rel)
+        path = os.path.join(self._store, rel)
+        try:
+            mtime = os.stat(path).st_mtime
+            with os.scandir(path) as items:
+                items = list(items)
+        except OSError:
+            # directory has gone, and with it any known subdirectories
+            prefix = rel + os.sep if rel else ''
+            for sub in [sub for sub in known if prefix and
+                        sub.startswith(prefix)]:
+                self._forget_dir(sub)
+            return []
+        self._db.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?)',
+                         (rel, mtime))
+        subdirs = []
+        for item in items:
+            if item.name.startswith('.'):
+                continue    # .git, .gpg-id, .extensions, ...
+            item_rel = os.path.join(rel, item.name) if rel else item.name
+            try:
+                if item.is_dir():    # follows symlinks, like 'find -L'
+                    if not self._is_loop(item.path):
+                        subdirs.append(item_rel)
+                elif item.name.lower().endswith('.gpg'):
+                    self._add_entry(item_rel[:-4], rel,
+                                    item.stat().st_mtime)
+            except OSError:
+                continue
+        return subdirs
+
+    def _is_loop(self, path):    # {{{2
+
+        """ whether a symlinked directory points back into itself """
+
+        real = os.path.realpath(path)
+        parent = os.path.realpath(os.path.dirname(path))
+        return parent == real or parent.startswith(real + os.sep)
+
+    def _add_entry(self, entry, rel, mtime):    # {{{2
+
+        """ index an entry and the domain-like parts of its path """
+
+        self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)',
+                         (entry, rel, mtime))
+        rkeys = set(reversed_key(part) for part in entry.split(os.sep))
+        self._db.executemany('INSERT INTO domains VALUES (?, ?)',
+                             [(rkey, entry) for rkey in rkeys if rkey])
+        self._db.executemany('INSERT INTO grams VALUES (?, ?)',
+                             [(gram, entry) for gram in grams(entry)])
+
+    def _forget_dir(self, rel):    # {{{2
+
+        """ drop a directory and the entries directly inside it """
+
+        for table in ('domains', 'grams'):
+            self._db.execute('DELETE FROM ' + table + ' WHERE entry IN '
+                             '(SELECT entry FROM entries WHERE dir = ?)',
+                             (rel,))
+        self._db.execute('DELETE FROM entries WHERE dir = ?', (rel,))
+        self._db.execute('DELETE FROM dirs WHERE dir = ?', (rel,))
+
+    def clear(self):    # {{{2
+
+        """ empty the index, so the next refresh rescans everything """
+
+        with self._db:
+            for table in ('dirs', 'entries', 'domains', 'grams'):
+                self._db.execute('DELETE FROM ' + table)
+
+    def entries(self):    # {{{2
+
+        """ all entries, sorted """
+
+        return [row[0] for row in
+                self._db.execute('SELECT entry FROM entries ORDER BY entry')]
+
+    def mtimes(self):    # {{{2
+
+        """ map of entry to file mtime at the time it was indexed """
+
+        return dict(self._db.execute('SELECT entry, mtime FROM entries'))
+
+    def match(self, domain):    # {{{2
+
+        """ entries for domain and its subdomains
+
+        entries with a path component that is domain or a subdomain,
+        and entries whose path contains domain, ignoring case; an
+        empty domain matches every entry
+        """
+
+        rkey = reversed_key(domain)
+        if not rkey:
+            return self.entries()
+        # every key in the subtree starts with rkey, which ends in '.';
+        # '/' is the character after '.', so bounds the range
+        found = set(row[0] for row in self._db.execute(
+            'SELECT entry FROM domains WHERE rkey >= ? AND rkey < ?',
+            (rkey, rkey[:-1] + '/')))
+        found.update(self._containing(domain.lower()))
+        return sorted(found)
+
+    def _containing(self, text):    # {{{2
+
+        """ entries whose lowercased path contains text
+
+        candidates are the entries with the rarest gram of text, or,
+        for text shorter than a gram, a gram starting with it; each
+        is then checked; grams are only counted up to GRAM_PROBE, so
+        choosing one costs a few index lookups however common it is
+        """
+
+        if len(text) < GRAM:
+            rows = self._db.execute(
+                'SELECT DISTINCT entry FROM grams WHERE gram >= ? '
+                'AND gram < ?', (text, text + chr(0x10ffff)))
+        else:
+            rarest = min(
+                set(text[start:start + GRAM]
+                    for start in range(len(text) - GRAM + 1)),
+                key=lambda gram: self._db.execute(
+                    'SELECT COUNT(*) FROM (SELECT 1 FROM grams '
+                    'WHERE gram = ? LIMIT ?)',
+                    (gram, GRAM_PROBE)).fetchone()[0])
+            rows = self._db.execute(
+                'SELECT entry FROM grams WHERE gram = ?', (rarest,))
+        return [entry for entry, in rows if text in entry.lower()]
+
+    def query(self, domain, fallback=False, paths=True,
+              lines=None):    # {{{2
+
+        """ entries for domain, dropping subdomains if asked to
+
+        paths: match domain against entry paths
+        lines: a refreshed UrlIndex to match url lines against,
+               or None
+
+        returns (domain level that matched, entries)
+        """
+
+        labels = domain.lower().split('.') if domain else []
+        while True:
+            level = '.'.join(labels)
+            found = set(self.match(level)) if paths else set()
+            if lines:
+                found.update(lines.match(level))
+            if found or not fallback or not labels:
+                return level, sorted(found)
+            labels = labels[1:]
+
+
+class UrlIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ encrypted cache of the url lines inside password store entries
+
+    for every entry, the file mtime and the lines matching
+    'pattern' are kept; the cache is a gpg-encrypted json
+    document encrypted for the recipients of the store
+
+    usage:
+
+    urls = UrlIndex(store_dir, '^url: .*')
+    urls.refresh(pass_index.mtimes())
+    entries = urls.match('github.com')
+    """
+
+    def __init__(self, store, pattern, gpg='gpg', jobs=None,
+                 cache_dir=CACHE_DIR):    # {{{2
+
+        """ load the cached url lines for store, if any """
+
+        self._store = os.path.realpath(store)
+        self._pattern = pattern
+        self._gpg = gpg
+        self._jobs = jobs or min(8, os.cpu_count() or 1)
+        self.path = os.path.join(cache_dir,
+                                 store_digest(store) + '.urls.json.gpg')
+        self._entries = {}
+        if os.path.isfile(self.path):
+            cached = self._decrypt(self.path)
+            try:
+                cached = json.loads(cached) if cached else {}
+            except ValueError:
+                cached = {}
+            if cached.get('pattern') == pattern:
+                self._entries = cached.get('entries', {})
+
+    def _decrypt(self, path):    # {{{2
+
+        """ decrypted content of path, or None on failure """
+
+        try:
+            result = subprocess.run([self._gpg] + GPG_OPTS + ['-d', path],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.decode('utf-8', 'replace')
+
+    def _url_lines(self, entry):    # {{{2
+
+        """ lines of an entry that match the url line pattern """
+
+        text = self._decrypt(os.path.join(self._store, entry + '.gpg'))
+        if text is None:
+            return None
+        regex = re.compile(self._pattern, re.IGNORECASE)
+        return [line for line in text.splitlines() if regex.search(line)]
+
+    def refresh(self, entries):    # {{{2
+
+        """ bring the cache up to date with entries
+
+        entries maps each entry to its indexed mtime; entries are
+        stat'ed again because an entry rewritten in place does not
+        change the mtime of its directory; returns the number of
+        entries decrypted
+        """
+
+        stale = {}
+        for entry in entries:
+            try:
+                mtime = os.stat(os.path.join(self._store,
+                                             entry + '.gpg')).st_mtime
+            except OSError:
+                continue
+            cached = self._entries.get(entry)
+            if not cached or cached[0] != mtime:
+                stale[entry] = mtime
+        removed = set(self._entries) - set(entries)
+        for entry in removed:
+            del self._entries[entry]
+        if not stale:
+            if removed:
+                self._save()
+            return 0
+        # decrypt one entry first so any passphrase prompt happens
+        # once, before the pool of gpg processes starts
+        pending = sorted(stale)
+        self._store_lines(pending[0], stale[pending[0]],
+                          self._url_lines(pending[0]))
+        with concurrent.futures.ThreadPoolExecutor(self._jobs) as pool:
+            for entry, lines in zip(pending[1:],
+                                    pool.map(self._url_lines, pending[1:])):
+                self._store_lines(entry, stale[entry], lines)
+        self._save()
+        return len(stale)
+
+    def _store_lines(self, entry, mtime, lines):    # {{{2
+
+        """ cache the url lines of an entry that decrypted correctly """
+
+        if lines is not None:
+            self._entries[entry] = [mtime, lines]
+
+    def _recipients(self):    # {{{2
+
+        """ gpg arguments selecting the recipients of the store """
+
+        args = []
+        try:
+            with open(os.path.join(self._store, '.gpg-id')) as gpg_ids:
+                for line in gpg_ids:
+                    gpg_id = line.split('#', 1)[0].strip()
+                    if gpg_id:
+                        args += ['-r', gpg_id]
+        except OSError:
+            pass
+        return args or ['--default-recipient-self']
+
+    def _save(self):    # {{{2
+
+        """ encrypt the cache to disk, replacing the previous copy """
+
+        data = json.dumps({'pattern': self._pattern,
+                           'entries': self._entries}).encode('utf-8')
+        temp = self.path + '.tmp'
+        try:
+            subprocess.run([self._gpg] + GPG_OPTS + self._recipients()
+                           + ['-o', temp, '-e'], input=data,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=True)
+            os.replace(temp, self.path)
+        except (OSError, subprocess.CalledProcessError):
+            pass    # the cache is rebuilt next time
+
+    def match(self, domain):    # {{{2
+
+        """ entries with a line matching pattern followed by domain
+
+        domain is used as a regular expression, as password_fill
+        does with grep
+        """
+
+        regex = re.compile(self._pattern + domain, re.IGNORECASE)
+        return [entry for entry, (_, lines) in self._entries.items()
+                if any(regex.search(line) for line in lines)]
+
+
+def store_digest(store):    # {{{1
+
+    """ short digest identifying a password store in file names """
+
+    store = os.path.realpath(store)
+    return hashlib.sha1(store.encode('utf-8')).hexdigest()[:12]
+
+
+def grams(entry):    # {{{1
+
+    """ set of the substrings of GRAM characters of a lowercased path
+
+    the path is padded at the end, so every shorter substring also
+    starts a gram
+    """
+
+    text = entry.lower() + GRAM_PAD
+    return set(text[start:start + GRAM]
+               for start in range(len(text) - GRAM + 1))
+
+
+def reversed_key(name):    # {{{1
+
+    """ domain name with labels reversed, e.g., 'com.github.'
+
+    an optional 'user@' prefix, port suffix and 'www.' subdomain
+    are ignored; returns '' if name has no labels
+    """
+
+    host = name.lower().rsplit('@', 1)[-1].split(':', 1)[0].strip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    labels = [label for label in host.split('.') if label]
+    if not labels:
+        return ''
+    return '.'.join(reversed(labels)) + '.'
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Index of password store entries for password_fill')
+    parser.add_argument('--store', default=os.getenv(
+        'PASSWORD_STORE_DIR',
+        os.path.join(os.path.expanduser('~'), '.password-store')),
+                        help='password store directory')
+    parser.add_argument('--gpg', default='gpg',
+                        help='gpg command used for url lines')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='number of gpg processes decrypting entries '
+                        'in parallel')
+    commands = parser.add_subparsers(dest='command', required=True)
+    query = commands.add_parser('query', help='print entries for a domain')
+    query.add_argument('--fallback', action='store_true',
+                       help='drop subdomains until an entry matches, and '
+                       'print the matching level first')
+    query.add_argument('--lines', metavar='PATTERN',
+                       help='also match entries with a line matching '
+                       'PATTERN followed by the domain')
+    query.add_argument('--no-paths', action='store_true',
+                       help='do not match the domain against entry paths')
+    query.add_argument('domain', help='domain to look up')
+    commands.add_parser('list', help='print all entries')
+    commands.add_parser('rebuild', help='rebuild the index from scratch')
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    if not os.path.isdir(args.store):
+        sys.exit("Cannot open password store dir '" + args.store + "'")
+    index = PassIndex(args.store)
+    if args.command == 'rebuild':
+        index.clear()
+        urls = os.path.join(CACHE_DIR,
+                            store_digest(args.store) + '.urls.json.gpg')
+        if os.path.isfile(urls):
+            os.remove(urls)
+    index.refresh()
+    found = []
+    if args.command == 'query':
+        lines = None
+        if args.lines:
+            lines = UrlIndex(args.store, args.lines, gpg=args.gpg,
+                             jobs=args.jobs)
+            lines.refresh(index.mtimes())
+        level, found = index.query(args.domain, fallback=args.fallback,
+                                   paths=not args.no_paths, lines=lines)
+        if args.fallback:
+            print(level)
+    elif args.command == 'list':
+        found = index.entries()
+    for entry in found:
+        print(entry)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
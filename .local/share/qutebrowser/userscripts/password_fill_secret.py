@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" cached secret service lookups for password_fill
+
+This helper is called by the secret backend of the password_fill
+userscript instead of running 'secret-tool search' once per domain
+level.
+
+The keyring items are enumerated with one secret-tool call per schema,
+matching on the 'xdg:schema' attribute that libsecret gives every item,
+starting with the schema 'secret-tool store' uses. The 'domain' and
+'username' attributes of the items (never the secrets) are cached for
+the session in $XDG_RUNTIME_DIR, and the cache expires after a short
+time to live. Domain lookups, including dropping subdomains until a
+match is found, are then resolved in memory.
+
+Items stored by other tools may have another schema. Only when no
+level of a domain has a cached item are the levels looked up with
+'secret-tool search domain LEVEL', as password_fill did before, which
+matches items of any schema; the schemas of the items found are
+remembered, and their items enumerated with the rest from then on.
+The levels found to have no item are cached too, for the same time
+to live, so that an unknown domain costs no secret-tool call until
+the cache expires. A secret-tool call that fails, or finds nothing
+(e.g., when unlocking the keyring was cancelled), is not cached.
+
+Usage:
+
+    password_fill_secret.py [--ttl SECONDS] query [--fallback] DOMAIN
+    password_fill_secret.py refresh
+
+'query' prints the items whose domain attribute is DOMAIN as
+'domain username' lines. With '--fallback', subdomains are dropped from
+DOMAIN until some item matches; the first line printed is the domain
+level that matched. 'refresh' discards the cache.
+
+The secret-tool command can be replaced by setting the environmental
+variable SECRET_TOOL, e.g., to point at a stand-in for the secret
+service when testing, such as ../tools/fake_secret_tool.py.
+"""
+
+# import statements    {{{1
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+# constants    {{{1
+SCHEMA = 'org.freedesktop.Secret.Generic'
+CACHE_FILE = os.path.join(
+    os.getenv('XDG_RUNTIME_DIR')
+    or os.getenv('XDG_CACHE_HOME')
+    or os.path.join(os.path.expanduser('~'), '.cache'),
+    'qutebrowser', 'password_fill_secret.json')
+# attribute lines of secret-tool's output; the schema may be given as an
+# attribute or on a line of its own
+_ATTRIBUTE_RE = re.compile(
+    r'^(?:attribute\.)?(domain|username|xdg:schema|schema) += +(.*)$')
+
+
+class SecretIndex(object):    # {{{1
+
+    # class docstring    {{{2
+    """ session cache of the domain/username attributes of keyring items
+
+    usage:
+
+    index = SecretIndex()
+    level, items = index.query('gist.github.com', fallback=True)
+    """
+
+    def __init__(self, ttl=60, cache_file=CACHE_FILE,
+                 secret_tool=None, schema=SCHEMA):    # {{{2
+
+        """ initialise variables """
+
+        self._ttl = ttl
+        self._cache_file = cache_file
+        self._secret_tool = secret_tool or os.getenv('SECRET_TOOL',
+                                                     'secret-tool')
+        self._schemas = [schema]
+        self._items = None    # [domain, username] pairs
+        self._complete = False    # whether _items holds every schema's
+        self._enumerated = None    # time _items were enumerated
+        self._misses = {}    # domain level: time it was found to be empty
+        self._domains = None
+
+    def _load(self):    # {{{2
+
+        """ (cached items, or None if missing or expired, known schemas)
+
+        the schemas are kept when the items expire; the levels found
+        empty are kept, in _misses, until they expire in turn
+        """
+
+        try:
+            with open(self._cache_file) as cache:
+                cached = json.load(cache)
+            mtime = os.stat(self._cache_file).st_mtime
+        except (OSError, ValueError):
+            return None, []
+        if not isinstance(cached, dict):
+            return None, []    # written by an earlier version
+        now = time.time()
+        misses = cached.get('misses')
+        if isinstance(misses, dict):
+            self._misses = {level: found for level, found in misses.items()
+                            if now - found <= self._ttl}
+        enumerated = cached.get('enumerated', mtime)
+        if now - enumerated > self._ttl:
+            return None, cached.get('schemas', [])
+        self._enumerated = enumerated
+        return cached.get('items'), cached.get('schemas', [])
+
+    def _search(self, *attributes):    # {{{2
+
+        """ (domain, username, schema) of the items with attributes
+
+        returns None if secret-tool fails; secret-tool prints the
+        secrets on stdout, which is discarded, and the attributes
+        on stderr; an attribute seen twice before its item is
+        complete starts the next item
+        """
+
+        try:
+            result = subprocess.run(
+                [self._secret_tool, 'search', '--all', '--unlock']
+                + list(attributes),
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                check=False)
+        except OSError:
+            return None
+        if result.returncode:
+            return None
+        items = []
+        item = {}
+        for line in result.stderr.decode('utf-8', 'replace').splitlines():
+            if line.startswith('['):    # start of next item
+                items.append(item)
+                item = {}
+                continue
+            match = _ATTRIBUTE_RE.match(line)
+            if not match:
+                continue
+            name = 'schema' if 'schema' in match.group(1) else match.group(1)
+            if item.get(name, match.group(2)) != match.group(2) or (
+                    name != 'schema' and name in item):
+                items.append(item)
+                item = {}
+            item[name] = match.group(2)
+        items.append(item)
+        return [(item['domain'], item['username'], item.get('schema'))
+                for item in items if 'domain' in item and 'username' in item]
+
+    def _enumerate(self):    # {{{2
+
+        """ [domain, username] pairs of the items of every known schema
+
+        returns None if a search fails
+        """
+
+        items = []
+        for schema in self._schemas:
+            found = self._search('xdg:schema', schema)
+            if found is None:
+                return None
+            items.extend([domain, username] for domain, username, _ in found)
+        return items
+
+    def _save(self):    # {{{2
+
+        """ cache items and schemas, readable only by the user """
+
+        try:
+            os.makedirs(os.path.dirname(self._cache_file), mode=0o700,
+                        exist_ok=True)
+            umask = os.umask(0o077)
+            try:
+                with open(self._cache_file, 'w') as cache:
+                    json.dump({'items': self._items,
+                               'schemas': self._schemas,
+                               'enumerated': self._enumerated,
+                               'misses': self._misses}, cache)
+            finally:
+                os.umask(umask)
+        except OSError:
+            pass    # enumerate again next time
+
+    def clear(self):    # {{{2
+
+        """ discard the cache """
+
+        try:
+            os.remove(self._cache_file)
+        except OSError:
+            pass
+        self._domains = None
+        self._misses = {}
+
+    def domains(self):    # {{{2
+
+        """ map of domain to sorted usernames """
+
+        if self._domains is None:
+            items, schemas = self._load()
+            self._schemas.extend(schema for schema in schemas
+                                 if schema not in self._schemas)
+            if items is None:
+                items = self._enumerate()
+                # a failed search, or a keyring left locked, is not cached
+                if items:
+                    self._items = items
+                    self._complete = True
+                    self._enumerated = time.time()
+                    self._misses = {}
+                    self._save()
+            else:
+                self._items = items
+                self._complete = True
+            self._domains = {}
+            for domain, username in items or []:
+                self._domains.setdefault(domain, set()).add(username)
+            for domain in self._domains:
+                self._domains[domain] = sorted(self._domains[domain])
+        return self._domains
+
+    def _lookup(self, domain):    # {{{2
+
+        """ usernames of the items of any schema for domain
+
+        found by a search of their own, as for an item with a schema
+        not enumerated yet; their schemas are added to those
+        enumerated, and the items to the cache; a domain with no
+        item is remembered as such, unless the enumeration failed
+        """
+
+        if domain in self._misses:
+            return []
+        found = self._search('domain', domain)
+        if not found:
+            if found is not None and self._complete:
+                self._misses[domain] = time.time()
+            return []
+        usernames = set(self._domains.get(domain, []))
+        for _, username, schema in found:
+            usernames.add(username)
+            if schema and schema not in self._schemas:
+                self._schemas.append(schema)
+            if self._complete and [domain, username] not in self._items:
+                self._items.append([domain, username])
+        self._domains[domain] = sorted(usernames)
+        if self._complete:
+            self._save()
+        return self._domains[domain]
+
+    def query(self, domain, fallback=False):    # {{{2
+
+        """ items for domain, dropping subdomains if asked to
+
+        like 'secret-tool search domain DOMAIN', the domain must
+        match exactly; the levels are first resolved from the cached
+        items, and only if none has an item are they searched for;
+        returns (domain level that matched, list of 'domain username'
+        strings)
+        """
+
+        domains = self.domains()
+        labels = domain.split('.') if domain else []
+        levels = ['.'.join(labels[start:])
+                  for start in range(len(labels) if fallback
+                                     else min(len(labels), 1))]
+        for level in levels:
+            if domains.get(level):
+                return level, self._found(level, domains[level])
+        misses = len(self._misses)
+        try:
+            for level in levels:
+                usernames = self._lookup(level)
+                if usernames:
+                    return level, self._found(level, usernames)
+        finally:
+            if len(self._misses) != misses:
+                self._save()
+        return ('' if fallback else domain), []
+
+    @staticmethod
+    def _found(level, usernames):    # {{{2
+
+        """ 'domain username' strings for the usernames at level """
+
+        return [level + ' ' + username for username in usernames]
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Cached secret service lookups for password_fill')
+    parser.add_argument('--ttl', type=float, default=60,
+                        help='seconds the cached items stay valid '
+                        '(default: 60)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    query = commands.add_parser('query', help='print items for a domain')
+    query.add_argument('--fallback', action='store_true',
+                       help='drop subdomains until an item matches, and '
+                       'print the matching level first')
+    query.add_argument('domain', help='domain to look up')
+    commands.add_parser('refresh', help='discard the cached items')
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    index = SecretIndex(ttl=args.ttl)
+    if args.command == 'refresh':
+        index.clear()
+        sys.exit()
+    level, found = index.query(args.domain, fallback=args.fallback)
+    if args.fallback:
+        print(level)
+    for item in found:
+        print(item)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
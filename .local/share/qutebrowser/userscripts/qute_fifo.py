@@ -0,0 +1,212 @@
+# module docstring    {{{1
+""" send commands to qutebrowser from userscripts
+
+Userscripts control qutebrowser by writing commands, one per line,
+to the pipe named in environmental variable 'QUTE_FIFO'. This
+module is shared by the python userscripts, under python 2 or 3:
+
+    fifo = qute_fifo.QuteFifo()
+    fifo.send('bookmark-del ' + qute_fifo.verbatim(url))
+    fifo.info('Deleted bookmark')
+    fifo.progress('Checked {0}/{1} bookmarks'.format(done, total))
+
+The pipe is opened once and held open for the life of the script.
+Commands given to 'send' are queued and written together, in a
+single write, by 'flush'; messages ('info', 'warning', 'error')
+flush at once, so the user sees them before the script carries on.
+The queue is flushed when the script exits.
+
+Progress messages of long jobs are throttled: one is shown at most
+every few seconds, and those in between are dropped, so a batch job
+does not keep qutebrowser's command parser busy with messages that
+are replaced before they can be read.
+
+Arguments are escaped in one of two places. Most commands split
+their arguments as a shell does, and take each one quoted with
+'quote'. Commands whose last argument is taken verbatim, quotes and
+all ('open', 'bookmark-del', 'bookmark-add', ...; those registered
+with maxsplit=0), take it made safe with 'verbatim' instead. Outside
+qutebrowser, with no pipe, messages are printed on stderr and other
+commands are ignored.
+"""
+
+# import statements    {{{1
+from __future__ import print_function
+
+import atexit
+import os
+import sys
+import threading
+import time
+
+# constants    {{{1
+PROGRESS_INTERVAL = 5
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def quote(text):    # {{{1
+
+    """ text as a single double-quoted qutebrowser command argument
+
+    for commands that split their arguments, such as 'message-info';
+    not for the last argument of 'open' and the like: see 'verbatim'.
+    A command is a single line, so runs of whitespace, including
+    newlines, become single spaces; backslashes and double quotes
+    are escaped; and since qutebrowser splits command lines at ';;'
+    before it looks at quotes, any ';;' is broken up
+    """
+
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'replace')
+    text = u' '.join(u'{0}'.format(text).split())
+    text = text.replace(u'\\', u'\\\\').replace(u'"', u'\\"')
+    while u';;' in text:
+        text = text.replace(u';;', u'; ;')
+    return u'"' + text + u'"'
+
+
+def verbatim(text):    # {{{1
+
+    """ text as the last argument of a command that takes it verbatim
+
+    commands such as 'open' and 'bookmark-del' keep quotes in their
+    last argument, so it is not quoted; a command is a single line,
+    so newlines are dropped; and since qutebrowser splits command
+    lines at ';;' first, any ';;' is broken up as ';%3B', which
+    means the same in a url
+    """
+
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'replace')
+    text = u'{0}'.format(text).replace(u'\r', u'').replace(u'\n', u'')
+    while u';;' in text:
+        text = text.replace(u';;', u';%3B')
+    return text
+
+
+class QuteFifo(object):    # {{{1
+
+    # class docstring    {{{2
+    """ batched writer of commands to qutebrowser's userscript pipe
+
+    usage:
+
+    fifo = QuteFifo()
+    if fifo.active:
+        fifo.send('open -t ' + verbatim(url))
+    fifo.info('Opened url')
+    """
+
+    def __init__(self, path=None,
+                 interval=PROGRESS_INTERVAL):    # {{{2
+
+        """ initialise variables
+
+        path defaults to environmental variable 'QUTE_FIFO'; an
+        empty path sends nothing, as outside qutebrowser
+        """
+
+        self._path = os.getenv('QUTE_FIFO') if path is None else path
+        self._interval = interval
+        self._handle = None
+        self._queue = []
+        self._last_progress = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def active(self):    # {{{2
+
+        """ whether there is a pipe to qutebrowser """
+
+        return bool(self._path)
+
+    def send(self, command):    # {{{2
+
+        """ queue command, to be written at the next flush """
+
+        if not self._path:
+            return
+        if not isinstance(command, bytes):
+            command = command.encode('utf-8')
+        with self._lock:
+            self._queue.append(command)
+
+    def flush(self):    # {{{2
+
+        """ write all queued commands to the pipe in one write
+
+        the pipe cannot be opened in append mode ('a') because it
+        causes the userscript to exit with status 1; failure to
+        write, as when qutebrowser has closed, is ignored
+        """
+
+        with self._lock:
+            if not self._queue:
+                return
+            data = b'\n'.join(self._queue) + b'\n'
+            self._queue = []
+            try:
+                if self._handle is None:
+                    self._handle = os.open(self._path, os.O_WRONLY)
+                while data:
+                    data = data[os.write(self._handle, data):]
+            except EnvironmentError:
+                self._path = None
+
+    def close(self):    # {{{2
+
+        """ flush queued commands and close the pipe """
+
+        self.flush()
+        with self._lock:
+            if self._handle is not None:
+                os.close(self._handle)
+                self._handle = None
+
+    def message(self, text, level='info'):    # {{{2
+
+        """ show text in qutebrowser's status line, or on stderr
+
+        level is 'info', 'warning' or 'error'
+        """
+
+        if not self._path:
+            print(text, file=sys.stderr)
+            return
+        self.send(u'message-' + level + u' ' + quote(text))
+        self.flush()
+
+    def info(self, text):    # {{{2
+
+        """ show informational message """
+
+        self.message(text, 'info')
+
+    def warning(self, text):    # {{{2
+
+        """ show warning message """
+
+        self.message(text, 'warning')
+
+    def error(self, text):    # {{{2
+
+        """ show error message """
+
+        self.message(text, 'error')
+
+    def progress(self, text, final=False):    # {{{2
+
+        """ show progress message, unless one was shown too recently
+
+        the first and final messages of a job are always shown
+        """
+
+        now = _clock()
+        if (not final and self._last_progress is not None
+                and now - self._last_progress < self._interval):
+            return
+        self._last_progress = now
+        self.info(text)
+
+# vim:fdm=marker:
@@ -0,0 +1,87 @@
+# module docstring    {{{1
+""" record the pages the userscripts save, for SearchPages.py
+
+Every page saved as markdown or text is recorded by a line in a
+manifest, $XDG_CACHE_HOME/qutebrowser/saved_pages.tsv, of:
+
+    SAVED<TAB>PATH<TAB>URL<TAB>TITLE
+
+where SAVED is the save time in seconds since the epoch, and URL
+and TITLE are those of the page (environmental variables 'QUTE_URL'
+and 'QUTE_TITLE' in a userscript), or empty if not known. A page
+saved again to the same path adds another line, which replaces the
+first; for a page in the compressed archive, which is stored once
+whatever url it was saved from, only a line with the same url is
+replaced. The file is only ever appended to, so an indexer can
+follow it by remembering how far it has read.
+
+This module is shared by the python userscripts, under python 2 or
+3; shell scripts append the same lines directly:
+
+    saved_pages.record(path, url=os.getenv('QUTE_URL'),
+                       title=os.getenv('QUTE_TITLE'))
+"""
+
+# import statements    {{{1
+import os
+import time
+
+# constants    {{{1
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME')
+                         or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'qutebrowser')
+MANIFEST = os.path.join(CACHE_DIR, 'saved_pages.tsv')
+
+
+def _field(text):    # {{{1
+    # text as a manifest field: unicode, on one line, without tabs
+    if text is None:
+        return u''
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'replace')
+    return u' '.join(text.split())
+
+
+def record(path, url=None, title=None, saved=None,
+           manifest=MANIFEST):    # {{{1
+
+    """ add a manifest line for the page saved at path
+
+    the line is written with a single append, so lines written at
+    the same time by several scripts do not interleave; failure to
+    write is ignored, as the page itself was saved
+    """
+
+    line = u'\t'.join((u'{0:.0f}'.format(time.time() if saved is None
+                                         else saved),
+                       _field(os.path.abspath(path)), _field(url),
+                       _field(title))) + u'\n'
+    try:
+        if not os.path.isdir(os.path.dirname(manifest)):
+            os.makedirs(os.path.dirname(manifest))
+        handle = os.open(manifest, os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                         0o600)
+        try:
+            os.write(handle, line.encode('utf-8'))
+        finally:
+            os.close(handle)
+    except EnvironmentError:
+        pass
+
+
+def parse(line):    # {{{1
+
+    """ (saved, path, url, title) of a manifest line, or None """
+
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', 'replace')
+    fields = line.rstrip(u'\n').split(u'\t')
+    if len(fields) != 4 or not fields[1]:
+        return None
+    try:
+        saved = float(fields[0])
+    except ValueError:
+        return None
+    return saved, fields[1], fields[2], fields[3]
+
+# vim:fdm=marker:
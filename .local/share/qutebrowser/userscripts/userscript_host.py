@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" persistent host process for python 3 userscripts
+
+Most of the time taken by a python 3 userscript run from a
+qutebrowser key binding is spent starting the interpreter and
+importing modules (AddToPocket alone spends seconds importing
+'inflect'). This host imports every python 3 userscript in its
+directory once, with all their dependencies, and then waits on a
+unix socket, $XDG_RUNTIME_DIR/qutebrowser/userscript_host.sock.
+
+Userscripts are run through the launcher 'userscript_run', e.g.,
+'spawn --userscript userscript_run AddToPocket.py'. The launcher
+passes its arguments, environment (including the QUTE_* variables
+set by qutebrowser), working directory and standard streams over
+the socket. For each request the host forks a child, which takes
+on the launcher's environment and streams and runs the userscript
+as '__main__' with the already imported modules, and reports the
+exit status back to the launcher. The launcher waits for it, since
+qutebrowser removes the QUTE_FIFO pipe when the launcher exits.
+
+The userscript itself is read afresh for every run, so edits to it
+take effect at once. If any python file in the directory changes,
+the host declines the request and restarts itself, so helper
+modules are reloaded. Requests for scripts that are not python 3
+(shell scripts and the python 2 SaveMarkdown.py) are declined too.
+The launcher runs a declined script, or any script when no host is
+running, as an ordinary process, and starts the host for next time.
+
+Usage:
+
+    userscript_host.py [--idle SECONDS]
+
+Only one host runs at a time. The host exits after an hour without
+requests (option '--idle'), and only serves processes of the same
+user.
+"""
+
+# import statements    {{{1
+import argparse
+import atexit
+import fcntl
+import importlib.machinery
+import importlib.util
+import os
+import runpy
+import selectors
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+
+# constants    {{{1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_DIR = os.path.join(
+    os.getenv('XDG_RUNTIME_DIR')
+    or os.path.join('/tmp', 'qutebrowser-{0}'.format(os.getuid())),
+    'qutebrowser')
+SOCKET_FILE = os.path.join(RUNTIME_DIR, 'userscript_host.sock')
+LAUNCHER = 'userscript_run'
+IDLE_TIMEOUT = 3600
+_PEERCRED = struct.Struct('3i')
+
+
+def is_python3(path):    # {{{1
+
+    """ whether path is a python 3 script, judged by its shebang """
+
+    try:
+        with open(path, 'rb') as script:
+            first = script.readline(200)
+    except OSError:
+        return False
+    return first.startswith(b'#!') and b'python3' in first
+
+
+def _sources():    # {{{1
+
+    """ map of the python files in the script directory to mtimes """
+
+    sources = {}
+    for entry in os.scandir(SCRIPT_DIR):
+        if entry.is_file() and (entry.name.endswith('.py')
+                                or is_python3(entry.path)):
+            sources[entry.name] = entry.stat().st_mtime
+    return sources
+
+
+class UserscriptHost(object):    # {{{1
+
+    # class docstring    {{{2
+    """ serve userscript runs from forked children of a warm process
+
+    usage:
+
+    host = UserscriptHost()
+    host.preload()
+    host.serve()
+    """
+
+    def __init__(self, idle=IDLE_TIMEOUT, listen_fd=None,
+                 lock_fd=None):    # {{{2
+
+        """ take the host lock and open the socket
+
+        exits quietly if another host holds the lock; listen_fd and
+        lock_fd are passed on when the host restarts itself
+        """
+
+        self._idle = idle
+        if lock_fd is None:
+            os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+            lock_fd = os.open(SOCKET_FILE + '.lock',
+                              os.O_WRONLY | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                sys.exit()    # another host is running
+        self._lock_fd = lock_fd
+        if listen_fd is None:
+            try:
+                os.remove(SOCKET_FILE)    # left by a host that died
+            except OSError:
+                pass
+            self._listener = socket.socket(socket.AF_UNIX,
+                                           socket.SOCK_STREAM)
+            self._listener.bind(SOCKET_FILE)
+            os.chmod(SOCKET_FILE, 0o600)
+            self._listener.listen(64)
+        else:
+            self._listener = socket.socket(fileno=listen_fd)
+        self._sources = _sources()
+
+    def preload(self):    # {{{2
+
+        """ import the python 3 userscripts and their dependencies
+
+        the userscripts are then forgotten, so each run executes
+        the script afresh, but their imports stay loaded
+        """
+
+        for name in sorted(self._sources):
+            path = os.path.join(SCRIPT_DIR, name)
+            if (name in (os.path.basename(__file__), LAUNCHER)
+                    or not is_python3(path)):
+                continue
+            module_name = '_preload_' + name.replace('.', '_')
+            loader = importlib.machinery.SourceFileLoader(module_name, path)
+            spec = importlib.util.spec_from_loader(module_name, loader)
+            module = importlib.util.module_from_spec(spec)
+            try:
+                loader.exec_module(module)
+            except Exception:    # pylint: disable=broad-except
+                pass    # the script will report it when it runs
+            sys.modules.pop(module_name, None)
+
+    def _restart(self):    # {{{2
+
+        """ replace this process with a fresh host on the same socket """
+
+        for handle in (self._listener.fileno(), self._lock_fd):
+            os.set_inheritable(handle, True)
+        os.execv(sys.executable, [
+            sys.executable, os.path.abspath(__file__), '--idle',
+            str(self._idle), '--listen-fd', str(self._listener.fileno()),
+            '--lock-fd', str(self._lock_fd)])
+
+    def _receive(self, conn):    # {{{2
+
+        """ (streams, cwd, argv, environment) of a request """
+
+        data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+        while len(data) < 4:
+            more = conn.recv(65536)
+            if not more:
+                raise OSError('incomplete request')
+            data += more
+        size = struct.unpack('!I', data[:4])[0] + 4
+        while len(data) < size:
+            more = conn.recv(65536)
+            if not more:
+                raise OSError('incomplete request')
+            data += more
+        fields = data[4:size].split(b'\0')
+        argc = int(fields[1])
+        argv = [os.fsdecode(arg) for arg in fields[2:2 + argc]]
+        environment = dict(os.fsdecode(item).split('=', 1)
+                           for item in fields[2 + argc:] if b'=' in item)
+        return fds, os.fsdecode(fields[0]), argv, environment
+
+    def _handle(self, conn):    # {{{2
+
+        """ run a request in a forked child, or decline it """
+
+        uid = _PEERCRED.unpack(conn.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size))[1]
+        if uid != os.getuid():
+            return
+        fds, cwd, argv, environment = self._receive(conn)
+        stale = _sources() != self._sources
+        try:
+            if stale or not argv or not is_python3(argv[0]):
+                conn.sendall(b'D')
+            elif os.fork() == 0:
+                self._listener.close()
+                os.close(self._lock_fd)
+                run_child(conn, fds, cwd, argv, environment)
+        finally:
+            for handle in fds:
+                os.close(handle)
+        if stale:
+            conn.close()
+            self._restart()
+
+    def serve(self):    # {{{2
+
+        """ handle requests until idle for too long """
+
+        # children are reaped automatically
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ)
+        while selector.select(timeout=self._idle or None):
+            conn, _ = self._listener.accept()
+            with conn:
+                try:
+                    self._handle(conn)
+                except (OSError, ValueError, IndexError):
+                    pass    # the launcher gets no reply and runs the script
+        os.remove(SOCKET_FILE)
+
+
+def run_child(conn, fds, cwd, argv, environment):    # {{{1
+
+    """ run userscript argv[0] in this forked child, then exit
+
+    the child takes on the launcher's streams, environment and
+    working directory, and sends its exit status to the launcher
+    """
+
+    # pylint: disable=broad-except
+    # any failure must still be reported to the launcher
+    for signum in (signal.SIGCHLD, signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+    for target, handle in enumerate(fds):
+        os.dup2(handle, target)
+    os.environ.clear()
+    os.environ.update(environment)
+    status = 0
+    try:
+        os.chdir(cwd)
+        sys.argv = argv
+        sys.path[0] = os.path.dirname(argv[0])
+        conn.sendall(b'R')
+        runpy.run_path(argv[0], run_name='__main__')
+    except SystemExit as exit_:
+        if isinstance(exit_.code, int):
+            status = exit_.code
+        elif exit_.code is not None:
+            print(exit_.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    try:
+        # os._exit skips exit handlers, such as the one that writes
+        # queued qute_fifo commands, so run them as an exit would
+        atexit._run_exitfuncs()    # pylint: disable=protected-access
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.sendall(struct.pack('!i', status))
+    except Exception:
+        pass
+    os._exit(status)
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Persistent host process for python 3 userscripts')
+    parser.add_argument('--idle', type=float, default=IDLE_TIMEOUT,
+                        help='seconds without requests before exiting, '
+                        '0 for never (default: %(default)s)')
+    parser.add_argument('--listen-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--lock-fd', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    host = UserscriptHost(idle=args.idle, listen_fd=args.listen_fd,
+                          lock_fd=args.lock_fd)
+    host.preload()
+    host.serve()
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker:
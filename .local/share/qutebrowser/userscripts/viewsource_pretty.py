@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+
+# module docstring    {{{1
+""" streaming html pretty-printer for qutebrowser_viewsource
+
+This helper is used by the qutebrowser_viewsource userscript to
+make minified pages readable before they are shown, and can be
+run on its own.
+
+The html is read in chunks and fed to a streaming parser, and the
+reformatted source is written as it is parsed, so memory use is
+bounded by the largest single tag or inline script rather than by
+the page. Every tag, comment and run of text is put on its own
+line, indented by element depth. The contents of 'pre' and
+'textarea' elements are kept verbatim. The contents of 'script'
+and 'style' elements are indented as a block, or, with '--split',
+written to side files ('NAME.1.js', 'NAME.2.css', etc., next to
+the output) and replaced by a comment naming the side file.
+
+Usage:
+
+    viewsource_pretty.py [--split] [--output FILE] INPUT
+    viewsource_pretty.py --highlight FILE
+    viewsource_pretty.py --benchmark [--size MB]
+
+'--highlight' prints a formatted file with terminal colours, one
+line at a time, so it can be used as a 'less' input preprocessor
+(LESSOPEN='|viewsource_pretty.py --highlight %s'): the first
+screen shows at once, and less's 'v' command still edits the
+plain file. It needs the python module 'pygments'; without it the
+file is printed as it is.
+
+'--benchmark' times formatting of a generated single-line page of
+the given size (default: 10 MB), with and without '--split'.
+"""
+
+# import statements    {{{1
+import argparse
+import codecs
+import io
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+try:
+    import pygments
+    import pygments.formatters
+    import pygments.lexers
+except ImportError:
+    pygments = None
+
+
+# constants    {{{1
+CHUNK_SIZE = 64 * 1024
+INDENT = '  '
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'))
+VERBATIM_ELEMENTS = frozenset(('pre',))
+BLOCK_EXTENSIONS = {'script': '.js', 'style': '.css'}
+# elements whose contents are text up to their end tag
+RAW_ELEMENTS = {tag: re.compile(r'</' + tag + r'\s*>', re.I)
+                for tag in ('script', 'style', 'textarea')}
+# open elements that a start tag implicitly closes
+IMPLIED_ENDS = {'li': ('li',), 'dt': ('dt', 'dd'), 'dd': ('dt', 'dd'),
+                'tr': ('tr', 'td', 'th'), 'td': ('td', 'th'),
+                'th': ('td', 'th'), 'option': ('option',)}
+CLOSES_P = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'div', 'dl', 'fieldset',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul'))
+_CHARSET_RE = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?([\w-]+)''', re.I)
+_TAG_RE = re.compile(r'''
+    <!--.*?-->
+  | <!\[CDATA\[.*?\]\]>
+  | <!(?!--|\[CDATA\[)[^>]*>
+  | <\?[^>]*>
+  | </(?P<end>[A-Za-z][^\s/>]*)[^>]*>
+  | <(?P<start>[A-Za-z][^\s/>]*)(?:"[^"]*"|'[^']*'|[^'">])*>
+''', re.S | re.X)
+_PARTIAL_TAG_RE = re.compile(r'''
+    <[!?][^>]*\Z
+  | </?[A-Za-z](?:"[^"]*"|'[^']*'|[^'">])*(?:"[^"]*|'[^']*)?\Z
+''', re.X)
+_BLOCK_START_RE = re.compile(r'^\s*<(script|style)\b', re.I)
+_BLOCK_END_RE = re.compile(r'^\s*</(script|style)\s*>', re.I)
+
+
+class PrettyPrinter(object):    # {{{1
+
+    # class docstring    {{{2
+    """ write html to a stream reformatted, one node per line
+
+    usage:
+
+    printer = PrettyPrinter(output, split_base='/tmp/page')
+    for chunk in chunks:
+        printer.feed(chunk)
+    printer.close()
+    side_files = printer.side_files
+
+    Only tag boundaries and names are parsed; attributes, text and
+    entities are copied as they are, which keeps the tokenizer
+    down to one regular expression match per tag.
+    """
+
+    def __init__(self, output, split_base=None):    # {{{2
+
+        """ initialise variables
+
+        output is a writable text stream; if split_base is given,
+        script and style contents go to files named after it
+        """
+
+        self._output = output
+        self._pending = []
+        self._write_out = self._pending.append    # joined after each feed
+        self._split_base = split_base
+        self._buffer = ''
+        self._stack = []
+        self._text = []
+        self._verbatim = None    # pre being copied
+        self._raw = None         # script, style or textarea being copied
+        self._raw_end = None     # pattern of the end tag of self._raw
+        self._block_file = None
+        self._partial = ''       # incomplete last line of a block
+        self.side_files = []
+
+    def _write(self, text):    # {{{2
+
+        """ write the non-blank lines of text, indented """
+
+        prefix = INDENT * len(self._stack)
+        if '\n' not in text:    # the usual case: one tag
+            text = text.strip()
+            if text:
+                self._write_out(prefix + text + '\n')
+            return
+        for line in text.splitlines():
+            if line.strip():
+                self._write_out(prefix + line.strip() + '\n')
+
+    def _flush_text(self):    # {{{2
+
+        """ write text collected since the last tag """
+
+        if self._text:
+            self._write(''.join(self._text))
+            self._text = []
+
+    def _raw_data(self, data):    # {{{2
+
+        """ copy contents of a script, style or textarea element """
+
+        if self._raw == 'textarea':
+            self._write_out(data)
+        elif self._split_base:
+            if self._block_file is None:
+                if not data.strip():
+                    return
+                path = '{0}.{1}{2}'.format(self._split_base,
+                                           len(self.side_files) + 1,
+                                           BLOCK_EXTENSIONS[self._raw])
+                self._block_file = open(path, 'w', encoding='utf-8')
+                self.side_files.append(path)
+                self._write('/* contents in {0} */'.format(
+                    os.path.basename(path)))
+            self._block_file.write(data)
+        else:
+            # keep the relative indentation of the lines
+            lines = (self._partial + data).split('\n')
+            self._partial = lines.pop()
+            prefix = INDENT * len(self._stack)
+            for line in lines:
+                if line.strip():
+                    self._write_out(prefix + line.rstrip() + '\n')
+
+    def _end_raw(self):    # {{{2
+
+        """ finish the script, style or textarea being copied """
+
+        if self._block_file:
+            self._block_file.close()
+            self._block_file = None
+        elif self._partial.strip():
+            self._write_out(INDENT * len(self._stack)
+                            + self._partial.rstrip() + '\n')
+        self._partial = ''
+        self._raw = None
+
+    def _start(self, tag_text, tag):    # {{{2
+
+        """ handle a start tag """
+
+        if self._verbatim:
+            self._text.append(tag_text)
+            return
+        self._flush_text()
+        closes = IMPLIED_ENDS.get(tag, ('p',) if tag in CLOSES_P else ())
+        while self._stack and self._stack[-1] in closes:
+            self._stack.pop()
+        self._write(tag_text)
+        if tag in VOID_ELEMENTS or tag_text.endswith('/>'):
+            return
+        self._stack.append(tag)
+        if tag in VERBATIM_ELEMENTS:
+            self._verbatim = tag
+        elif tag in RAW_ELEMENTS:
+            self._raw = tag
+            self._raw_end = RAW_ELEMENTS[tag]
+
+    def _end(self, tag_text, tag):    # {{{2
+
+        """ handle an end tag """
+
+        if self._verbatim:
+            if tag != self._verbatim:
+                self._text.append(tag_text)
+                return
+            # contents exactly as they were, without indentation
+            self._write_out(''.join(self._text) + tag_text + '\n')
+            self._text = []
+            self._verbatim = None
+            self._stack.pop()
+            return
+        if self._raw:
+            raw = self._raw
+            self._end_raw()
+            if raw == 'textarea':
+                self._write_out(tag_text + '\n')
+                self._stack.pop()
+                return
+        self._flush_text()
+        if tag in self._stack:
+            while self._stack.pop() != tag:
+                pass    # close elements left open, e.g., 'li'
+        self._write(tag_text)
+
+    def _markup(self, text):    # {{{2
+
+        """ handle a comment, declaration or processing instruction """
+
+        if self._verbatim:
+            self._text.append(text)
+            return
+        self._flush_text()
+        self._write(text)
+
+    def feed(self, data, final=False):    # {{{2
+
+        """ format data, keeping back an incomplete last tag """
+
+        buffer = self._buffer + data
+        pos = 0
+        end = len(buffer)
+        while pos < end:
+            if self._raw:
+                match = self._raw_end.search(buffer, pos)
+                if not match:
+                    # keep back what could be the start of the end tag
+                    stop = end if final else max(pos, end - 16)
+                    self._raw_data(buffer[pos:stop])
+                    pos = stop
+                    break
+                self._raw_data(buffer[pos:match.start()])
+                self._end(match.group(), self._raw)
+                pos = match.end()
+                continue
+            start = buffer.find('<', pos)
+            if start < 0:
+                self._text.append(buffer[pos:])
+                pos = end
+                break
+            if start > pos:
+                self._text.append(buffer[pos:start])
+            match = _TAG_RE.match(buffer, start)
+            if match:
+                kind = match.lastgroup
+                if kind == 'start':
+                    self._start(match.group(), match.group(kind).lower())
+                elif kind == 'end':
+                    self._end(match.group(), match.group(kind).lower())
+                else:
+                    self._markup(match.group())
+                pos = match.end()
+            elif not final and _incomplete(buffer, start):
+                pos = start
+                break
+            else:    # a '<' that starts no tag
+                self._text.append('<')
+                pos = start + 1
+        self._buffer = buffer[pos:]
+        self._output.write(''.join(self._pending))
+        self._pending.clear()
+
+    def close(self):    # {{{2
+
+        """ format anything held back and finish the output """
+
+        self.feed('', final=True)
+        if self._raw:
+            self._end_raw()
+        if self._verbatim:
+            self._write_out(''.join(self._text))
+            self._text = []
+        self._flush_text()
+        self._output.write(''.join(self._pending))
+        self._pending.clear()
+
+
+def _incomplete(buffer, pos):    # {{{1
+
+    """ whether the '<' at pos may start a tag cut off by the buffer end """
+
+    if buffer.startswith('<!--', pos):
+        return buffer.find('-->', pos + 4) < 0
+    if buffer.startswith('<![CDATA[', pos):
+        return buffer.find(']]>', pos + 9) < 0
+    if len(buffer) - pos < 9:    # too short to tell
+        return True
+    return bool(_PARTIAL_TAG_RE.match(buffer, pos))
+
+
+def sniff_encoding(head):    # {{{1
+
+    """ encoding named in a meta tag of the first bytes of a page """
+
+    match = _CHARSET_RE.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def format_file(inpath, outpath, split=False):    # {{{1
+
+    """ write a reformatted copy of html file inpath to outpath
+
+    returns the paths of the side files written
+    """
+
+    with open(inpath, 'rb') as source, \
+            open(outpath, 'w', encoding='utf-8') as output:
+        chunk = source.read(CHUNK_SIZE)
+        decoder = codecs.getincrementaldecoder(sniff_encoding(chunk[:4096]))(
+            errors='replace')
+        printer = PrettyPrinter(
+            output, split_base=os.path.splitext(outpath)[0] if split else None)
+        while chunk:
+            printer.feed(decoder.decode(chunk))
+            chunk = source.read(CHUNK_SIZE)
+        printer.feed(decoder.decode(b'', final=True))
+        printer.close()
+    return printer.side_files
+
+
+def highlight(path, output=sys.stdout):    # {{{1
+
+    """ write formatted file path with terminal colours, line by line
+
+    each line is coloured as html, javascript or css, depending on
+    the block it is in
+    """
+
+    with open(path, encoding='utf-8', errors='replace') as source:
+        if pygments is None:
+            for line in source:
+                output.write(line)
+            return
+        lexers = {'html': pygments.lexers.HtmlLexer(),
+                  'script': pygments.lexers.JavascriptLexer(),
+                  'style': pygments.lexers.CssLexer()}
+        formatter = pygments.formatters.TerminalFormatter()
+        kind = 'html'
+        for line in source:
+            if kind != 'html' and _BLOCK_END_RE.match(line):
+                kind = 'html'
+            output.write(pygments.highlight(line, lexers[kind], formatter))
+            start = _BLOCK_START_RE.match(line)
+            if start and not line.rstrip().endswith('/>'):
+                kind = start.group(1).lower()
+
+
+def benchmark(size_mb=10):    # {{{1
+
+    """ print formatting throughput for a generated minified page """
+
+    # markup, with a bundled script and stylesheet every 100 rows
+    unit = ('<div class="row"><a href="/item?id=1&amp;x=2">Item &#8212; one'
+            '</a><span>text</span><img src="a.png"><br/><ul><li>one<li>two'
+            '</ul><!-- note --><pre>  keep\n  this</pre></div>')
+    bundle = ('<script>' + 'var a={b:1,c:[1,2,3]};function f(x){return x*2}'
+              * 400 + '</script><style>' + '.row{margin:0;padding:1px}'
+              * 200 + '</style>')
+    group = unit * 100 + bundle
+    count = size_mb * 1024 * 1024 // len(group)
+    page = ('<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>'
+            + group * count + '</body></html>')
+    print('input: {0:.1f} MB, one line'.format(len(page) / 1048576))
+    for split in (False, True):
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as side_dir:
+            start = time.perf_counter()
+            printer = PrettyPrinter(output, split_base=os.path.join(
+                side_dir, 'page') if split else None)
+            for pos in range(0, len(page), CHUNK_SIZE):
+                printer.feed(page[pos:pos + CHUNK_SIZE])
+            printer.close()
+            elapsed = time.perf_counter() - start
+        print('{0:8}: {1:.2f} s, {2:.1f} MB/s, output {3:.1f} MB, '
+              '{4} side files'.format(
+                  'split' if split else 'inline', elapsed,
+                  len(page) / 1048576 / elapsed, output.tell() / 1048576,
+                  len(printer.side_files)))
+    print('peak memory: {0:.0f} MB'.format(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def usage():    # {{{1
+
+    """ process arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Streaming html pretty-printer for viewing source')
+    parser.add_argument('--split', action='store_true',
+                        help='write script and style contents to side files')
+    parser.add_argument('--output', help='formatted file '
+                        '(default: INPUT with extension .pretty.html)')
+    parser.add_argument('--highlight', action='store_true',
+                        help='print formatted INPUT with terminal colours')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='time formatting of a generated page')
+    parser.add_argument('--size', type=int, default=10,
+                        help='benchmark page size in MB (default: 10)')
+    parser.add_argument('input', nargs='?', help='html file')
+    args = parser.parse_args()
+    if not args.benchmark and not args.input:
+        parser.error('an input file is needed')
+    return args
+
+
+def main():    # {{{1
+
+    """ script execution starts here """
+
+    args = usage()
+    if args.benchmark:
+        benchmark(args.size)
+    elif args.highlight:
+        try:
+            highlight(args.input)
+        except BrokenPipeError:    # less quit before the end
+            sys.stderr.close()
+    else:
+        output = args.output or (os.path.splitext(args.input)[0]
+                                 + '.pretty.html')
+        for path in format_file(args.input, output, split=args.split):
+            print(path)
+
+
+if __name__ == '__main__':
+    main()
+
+# vim:fdm=marker: